@@ -1,21 +1,31 @@
 import streamlit as st
 import random
+import numpy as np
 import pandas as pd
 
 # 解析手牌 → core.parser；LLM 教練與 call_llm_api → core.coach
 from core import (
-    load_content,
     cards_to_emoji,
-    parse_hands,
+    load_hand_table,
     render_hand_history_timeline,
     generate_match_summary,
-    analyze_specific_hand,
-    chat_with_coach,
+    analyze_hands_concurrently,
+    stream_hand_analysis,
+    stream_chat_with_coach,
     get_api_key,
     set_api_key,
     get_use_demo,
     set_use_demo,
     ensure_session_defaults,
+    get_prefetch_queue,
+    get_chat_memory,
+    get_metrics,
+    start_metrics_server,
+    allin_results,
+    allin_summary,
+    bad_beat_mask,
+    pushfold_review,
+    pushfold_summary,
 )
 
 # Demo 資料：真實比賽紀錄 (36 手牌，內嵌於 app.py)
@@ -2285,10 +2295,6 @@ Seat 8: cb195c66 collected (700)
 # --- 1. 頁面設定 ---
 st.set_page_config(page_title="Poker Copilot War Room", page_icon="♠️", layout="wide")
 
-# v2.1：聊天紀錄（右欄 AI 教練）
-if "messages" not in st.session_state:
-    st.session_state.messages = []
-
 # --- CSS: Apple HIG macOS Dark Mode ---
 st.markdown("""
 <style>
@@ -2579,6 +2585,28 @@ LOADING_TEXTS = [
 ]
 
 
+def write_analysis_stream(split, waiting_text):
+    """
+    邊收邊顯示單手分析（split 為 stream_hand_analysis 回傳的 SplitStream）：
+    一句話狠評先出現在 info 框，===SPLIT=== 之後的分析再逐段串流；沒有分隔標記時改以 Markdown 顯示全文。
+    """
+    summary_box = st.empty()
+    summary_box.caption(waiting_text)
+    shown = ""
+    for piece in split.summary():
+        shown += piece
+        summary_box.info(shown, icon="🦁")
+    detail_box = st.empty()
+    if split.found_marker:
+        detail_box.write_stream(split.detail())
+    if not (split.summary_text and split.detail_text):
+        detail_box.empty()
+        summary_box.markdown(split.full_text)
+
+
+# 設了 POKER_METRICS_PORT 才會啟動（每個程序一次），供 Prometheus 抓取 /metrics
+start_metrics_server()
+
 # --- 2. 側邊欄：僅在已登入時顯示設定 ---
 with st.sidebar:
     if api_key:
@@ -2586,6 +2614,21 @@ with st.sidebar:
         selected_model = st.selectbox("AI 引擎", ["gemini-2.5-flash"])
     st.markdown("---")
     st.link_button("💬 許願 / 回報 Bug", "https://docs.google.com/forms/d/e/1FAIpQLSeiQT3WgoxLXqfn6eMrvQkS5lBTewgl9iS9AkxQuMyGTySESA/viewform", use_container_width=True)
+    # 隱藏的除錯面板：網址加上 ?debug=1 才顯示 LLM 呼叫的延遲與 token 紀錄
+    if api_key and st.query_params.get("debug") == "1":
+        with st.expander("🛠 LLM 呼叫紀錄", expanded=False):
+            metrics = get_metrics()
+            summary_rows = metrics.summary()
+            if summary_rows:
+                st.dataframe(pd.DataFrame(summary_rows), hide_index=True, use_container_width=True)
+                st.caption("最近呼叫")
+                st.dataframe(pd.DataFrame(metrics.recent(20)), hide_index=True, use_container_width=True)
+            else:
+                st.caption("尚無 LLM 呼叫。")
+            st.download_button("下載 Prometheus 格式", metrics.prometheus_text(), file_name="metrics.txt", mime="text/plain")
+            if st.button("清除紀錄", key="metrics_reset"):
+                metrics.reset()
+                st.rerun()
 
 # --- 3. 核心邏輯已移至 core/ (parser, coach, history, profiler) ---
 
@@ -2621,7 +2664,8 @@ else:
     uploaded_file = st.file_uploader("📂 上傳比賽紀錄 (.txt)", type=["txt"])
 
     if uploaded_file:
-        content = load_content(uploaded_file)
+        # 上傳檔直接交給 parse_hands 串流解析，不先整份 decode 成字串
+        content = uploaded_file
         set_use_demo(False)
     elif get_use_demo():
         content = DEMO_HANDS_TEXT
@@ -2641,29 +2685,28 @@ else:
                 st.rerun()
 
     if content:
-        # 呼叫解析函數
-        hands, hero_name = parse_hands(content)
-
-        # 反轉為時間正序（最舊→最新），並為每手牌加上 display_index（與 UI 一致）
-        hands.reverse()
-        for idx, h in enumerate(hands, start=1):
-            h["display_index"] = idx
+        # 解析並轉成欄式表（依內容雜湊快取，rerun 不會重新解析；Demo 牌譜常駐）
+        # 之後的統計、篩選都是陣列遮罩，需要單手資料時才用 table.row(i) 重建
+        table, hero_name = load_hand_table(content, pin=content is DEMO_HANDS_TEXT)
         
-        if not hands:
+        if not len(table):
             st.error("❌ 無法解析手牌，請確認格式。")
         else:
-            total_hands = len(hands)
-            vpip_count = sum(1 for h in hands if h['vpip'])
-            pfr_count = sum(1 for h in hands if h['pfr'])
+            total_hands = len(table)
+            vpip_count = int(table.vpip.sum())
+            pfr_count = int(table.pfr.sum())
             
             vpip = round((vpip_count / total_hands) * 100, 1) if total_hands > 0 else 0
             pfr = round((pfr_count / total_hands) * 100, 1) if total_hands > 0 else 0
 
+            # 背景預先分析最可能被點開的手牌（換檔案時自動取消舊工作）
+            prefetch_queue = get_prefetch_queue()
+            prefetch_queue.start(table, api_key, selected_model)
+
             # --- 智慧抓漏邏輯 ---
             # 篩選條件：Hero 參與 (vpip) 且輸掉 (not is_winner)，依底池大小排序取前 3 手
-            leak_hands = [h for h in hands if h.get("vpip") and not h.get("is_winner", False)]
-            leak_hands.sort(key=lambda h: h.get("total_pot", 0) or h.get("pot_size", 0), reverse=True)
-            leak_hands = leak_hands[:3]
+            # 全下時勝率領先卻被逆轉的手牌是運氣，不算失誤
+            leak_hands = table.rows(table.top_by_pot(table.vpip & ~table.is_winner & ~bad_beat_mask(table), 3))
 
             # --- v2.0 雙欄佈局：左欄 Dashboard/手牌/分析，右欄 AI 教練 ---
             col1, col2 = st.columns([2, 1])
@@ -2674,10 +2717,12 @@ else:
                 with tab1:
                     # --- 關鍵失誤偵測 (置頂) ---
                     st.markdown("### ⚠️ 關鍵失誤偵測 (Smart Leak Detector)")
-                    st.caption("系統自動標記了 3 手你輸掉的最大底池，建議優先檢討這些「傷口」。")
+                    st.caption("系統自動標記了 3 手你輸掉的最大底池（已排除全下領先卻被逆轉的手牌），建議優先檢討這些「傷口」。")
 
                     if leak_hands:
+                        analyze_all = st.button("⚡️ 一次解析全部漏洞", key="leak_analyze_all", use_container_width=True)
                         cols = st.columns(3)
+                        leak_slots = []
                         for i, hand in enumerate(leak_hands):
                             with cols[i]:
                                 with st.container(border=True, key=f"leak_card_{i}"):
@@ -2689,19 +2734,27 @@ else:
 
                                     btn_key = f"leak_analyze_{hand.get('display_index')}_{hand.get('id', i)}"
                                     if st.button("⚡️ 深度戰術解析", key=btn_key, type="primary", use_container_width=True):
-                                        with st.spinner("AI 教練正在重看這手牌..."):
-                                            analysis = analyze_specific_hand(hand, api_key, selected_model)
-                                            st.success("分析完成！")
-                                            parts = analysis.split("===SPLIT===")
-                                            summary_text = parts[0].strip() if parts else ""
-                                            detail_text = parts[1].strip() if len(parts) > 1 else ""
-                                            with st.expander("查看教練狠評", expanded=True):
-                                                if summary_text:
-                                                    st.info(summary_text, icon="🦁")
-                                                if detail_text:
-                                                    st.markdown(detail_text)
-                                                elif not summary_text:
-                                                    st.markdown(analysis)
+                                        split = stream_hand_analysis(hand, api_key, selected_model)
+                                        with st.expander("查看教練狠評", expanded=True):
+                                            write_analysis_stream(split, "AI 教練正在重看這手牌...")
+                                        st.success("分析完成！")
+                                    leak_slots.append(st.empty())
+                        if analyze_all:
+                            # 全部漏洞同時送出，哪一手先完成就先填進該卡片
+                            for slot in leak_slots:
+                                slot.caption("AI 教練正在重看這手牌...")
+                            for i, analysis in analyze_hands_concurrently(leak_hands, api_key, selected_model):
+                                parts = analysis.split("===SPLIT===")
+                                summary_text = parts[0].strip() if parts else ""
+                                detail_text = parts[1].strip() if len(parts) > 1 else ""
+                                with leak_slots[i].container():
+                                    with st.expander("查看教練狠評", expanded=True):
+                                        if summary_text:
+                                            st.info(summary_text, icon="🦁")
+                                        if detail_text:
+                                            st.markdown(detail_text)
+                                        elif not summary_text:
+                                            st.markdown(analysis)
                     else:
                         st.info("恭喜！這場比賽你似乎沒有輸掉什麼大底池 (或者資料不足)。")
 
@@ -2723,6 +2776,64 @@ else:
                         with st.container(border=True, key="key_stat_3"):
                             st.metric("Hero ID", hero_name if hero_name else "Unknown")
                     
+                    # 全下 EV：以全下當下的精確勝率區分「打錯」與「運氣」
+                    allin_rows = allin_results(table)
+                    if allin_rows:
+                        allin_total = allin_summary(allin_rows)
+                        st.markdown("### 🎲 全下 EV（運氣調整）")
+                        e1, e2, e3 = st.columns(3)
+                        with e1:
+                            with st.container(border=True, key="allin_stat_0"):
+                                st.metric("全下手數", allin_total["hands"])
+                        with e2:
+                            with st.container(border=True, key="allin_stat_1"):
+                                st.metric("期望盈虧 (BB)", f"{allin_total['ev_net_bb']:+.1f}")
+                        with e3:
+                            with st.container(border=True, key="allin_stat_2"):
+                                st.metric("實際盈虧 (BB)", f"{allin_total['actual_net_bb']:+.1f}",
+                                          delta=f"運氣 {allin_total['luck_bb']:+.1f} BB")
+                        with st.expander("逐手明細與累計曲線"):
+                            st.line_chart(pd.DataFrame({
+                                "期望 (BB)": allin_total["cumulative_ev_bb"],
+                                "實際 (BB)": allin_total["cumulative_actual_bb"],
+                            }))
+                            st.dataframe(pd.DataFrame([{
+                                "#": r.get("display_index", r["row"] + 1),
+                                "街": r["street"],
+                                "Hero": r["hero_cards"],
+                                "對手": r["villains"],
+                                "公牌": r["board"],
+                                "勝率": f"{r['equity']:.1%}",
+                                "期望 (BB)": round(r["ev_net_bb"], 1),
+                                "實際 (BB)": round(r["actual_net_bb"], 1),
+                                "運氣 (BB)": round(r["luck_bb"], 1),
+                            } for r in allin_rows]), hide_index=True, use_container_width=True)
+
+                    # 短籌碼推或棄：翻前全下 / 跟注 / 棄牌是否符合 Nash 均衡表
+                    pushfold_rows = pushfold_review(table)
+                    if pushfold_rows:
+                        pushfold_total = pushfold_summary(pushfold_rows)
+                        st.markdown("### ♠️ 短籌碼推或棄 (Nash)")
+                        n1, n2 = st.columns(2)
+                        with n1:
+                            with st.container(border=True, key="pushfold_stat_0"):
+                                st.metric("可判定手數", pushfold_total["judged"])
+                        with n2:
+                            with st.container(border=True, key="pushfold_stat_1"):
+                                rate = pushfold_total["rate"]
+                                st.metric("吻合率", f"{rate}%" if rate != "N/A" else rate)
+                        if pushfold_total["deviations"]:
+                            with st.expander(f"偏離均衡的手牌（{len(pushfold_total['deviations'])} 手）"):
+                                st.dataframe(pd.DataFrame([{
+                                    "#": r.get("display_index", r["row"] + 1),
+                                    "情境": "無人入池" if r["spot"] == "push" else f"面對全下（第 {r['slot'] + 1} 位）",
+                                    "手牌": r["hand"],
+                                    "有效籌碼 (BB)": r["stack_bb"],
+                                    "身後人數": r["behind"],
+                                    "實際": r["action"],
+                                    "均衡": r["nash"],
+                                } for r in pushfold_total["deviations"]]), hide_index=True, use_container_width=True)
+
                     # 分隔線
                     st.divider()
                     
@@ -2730,7 +2841,7 @@ else:
                     st.markdown("### 🧠 AI 賽事總結")
                     if st.button("生成 AI 賽事總結", key="summary_btn"):
                         with st.spinner("AI 思考中..."):
-                            advice = generate_match_summary(hands, vpip, pfr, api_key, selected_model)
+                            advice = generate_match_summary(table, vpip, pfr, api_key, selected_model)
                             st.markdown(advice)
 
                 with tab2:
@@ -2748,51 +2859,46 @@ else:
                                 key="hand_filter"
                             )
                             if filter_option == "全部":
-                                base_hands = hands
+                                filter_mask = np.ones(len(table), dtype=bool)
                             elif filter_option == "💥 VPIP":
-                                base_hands = [h for h in hands if h.get("vpip")]
+                                filter_mask = table.vpip.copy()
                             elif filter_option == "🏆 獲勝":
-                                base_hands = [h for h in hands if h.get("result") == "win"]
+                                filter_mask = table.result_is("win")
                             elif filter_option == "💸 落敗":
-                                base_hands = [h for h in hands if h.get("result") == "loss"]
+                                filter_mask = table.result_is("loss")
                             else:
-                                bb_size_default = 1
-                                base_hands = [h for h in hands if (h.get("bb_size") or bb_size_default) and (h.get("pot_size", 0) > 20 * (h.get("bb_size") or bb_size_default))]
+                                filter_mask = table.big_pot_mask(20)
                             
                             card_type_options = ["對子 (Pair)", "Ax 牌型", "人頭大牌 (Broadway)"]
                             selected_card_types = st.multiselect("牌型篩選", card_type_options, default=[], key="card_type_filter")
                             position_options = ["BTN", "SB", "BB", "UTG", "MP", "CO"]
                             selected_positions = st.multiselect("位置篩選", position_options, default=[], key="position_filter")
                             
-                            filtered_hands = base_hands
                             if selected_card_types:
-                                def match_card_type(h):
-                                    if "對子 (Pair)" in selected_card_types and h.get("is_pair"):
-                                        return True
-                                    if "Ax 牌型" in selected_card_types and h.get("is_ax"):
-                                        return True
-                                    if "人頭大牌 (Broadway)" in selected_card_types and h.get("is_broadway"):
-                                        return True
-                                    return False
-                                filtered_hands = [h for h in filtered_hands if match_card_type(h)]
+                                card_type_mask = np.zeros(len(table), dtype=bool)
+                                if "對子 (Pair)" in selected_card_types:
+                                    card_type_mask |= table.is_pair
+                                if "Ax 牌型" in selected_card_types:
+                                    card_type_mask |= table.is_ax
+                                if "人頭大牌 (Broadway)" in selected_card_types:
+                                    card_type_mask |= table.is_broadway
+                                filter_mask &= card_type_mask
                             if selected_positions:
-                                filtered_hands = [h for h in filtered_hands if h.get("position_name") in selected_positions]
+                                filter_mask &= table.isin("position_name", selected_positions)
+                            filtered_idx = np.flatnonzero(filter_mask)
                     
-                    if not filtered_hands:
+                    if not filtered_idx.size:
                         st.info("此分類無手牌")
-                        hand_data = hands[0] if hands else {}
+                        hand_data = table.row(0)
                     else:
                         # Build dataframe: Hand #, Position, Hole Cards, Result (no Pot column)
                         result_label = {"win": "Win", "loss": "Loss", "fold": "Fold"}
-                        rows = []
-                        for h in filtered_hands:
-                            rows.append({
-                                "Hand #": h.get("display_index", 0),
-                                "Position": h.get("position", "—"),
-                                "Hole Cards": h.get("hero_cards_emoji") or cards_to_emoji(h.get("hero_cards")),
-                                "Result": result_label.get(h.get("result"), "—"),
-                            })
-                        hand_df = pd.DataFrame(rows)
+                        hand_df = pd.DataFrame({
+                            "Hand #": table.display_index[filtered_idx],
+                            "Position": table.labels("position", filtered_idx),
+                            "Hole Cards": table.hero_cards_emoji(filtered_idx),
+                            "Result": [result_label.get(r, "—") for r in table.labels("result", filtered_idx)],
+                        })
                         def highlight_loss(row):
                             if row.get("Result") == "Loss":
                                 return ["background-color: rgba(255, 75, 75, 0.25)"] * len(row)
@@ -2807,10 +2913,12 @@ else:
                             key="hand_selection_df",
                         )
                         selected_rows = getattr(event.selection, "rows", []) or []
-                        if selected_rows:
-                            hand_data = filtered_hands[selected_rows[0]]
-                        else:
-                            hand_data = filtered_hands[0]
+                        selected_row = int(filtered_idx[selected_rows[0]] if selected_rows else filtered_idx[0])
+                        hand_data = table.row(selected_row)
+                        # 只在選取換手時插隊預先分析；其他元件互動造成的 rerun 不重複排入
+                        if selected_rows and st.session_state.get("prefetch_selected_id") != hand_data.get("id"):
+                            st.session_state["prefetch_selected_id"] = hand_data.get("id")
+                            prefetch_queue.bump(selected_row)
                     
                     with col_detail:
                         # --- 手牌紀錄時間軸 (取代原始文字) ---
@@ -2839,26 +2947,22 @@ else:
                         )
 
                         if analyze_clicked:
-                            with st.spinner(random.choice(LOADING_TEXTS)):
-                                analysis = analyze_specific_hand(hand_data, api_key, selected_model)
-                                parts = analysis.split("===SPLIT===")
-                                summary_text = parts[0].strip() if parts else ""
-                                detail_text = parts[1].strip() if len(parts) > 1 else ""
-                                # 存進 session，方便追問後 rerun 仍可顯示
-                                st.session_state["last_analysis_display_index"] = hand_data.get("display_index")
-                                st.session_state["last_analysis_hand_id"] = hand_data.get("id", "")
-                                st.session_state["last_analysis_summary"] = summary_text
-                                st.session_state["last_analysis_detail"] = detail_text
-                                st.session_state["last_analysis_full"] = analysis
-                            st.markdown("### 💡 AI 分析結果")
-                            _summary = st.session_state.get("last_analysis_summary", "")
-                            _detail = st.session_state.get("last_analysis_detail", "")
-                            _full = st.session_state.get("last_analysis_full", "")
-                            if _summary and _detail:
-                                st.info(_summary, icon="🦁")
-                                st.markdown(_detail)
+                            # 這手若正在背景預先分析，等它完成後直接命中回應快取，不再重複送出
+                            if prefetch_queue.in_flight(selected_row):
+                                with st.spinner("背景分析進行中，稍候…"):
+                                    prefetch_queue.claim(selected_row)
                             else:
-                                st.markdown(_full or analysis)
+                                prefetch_queue.claim(selected_row)
+                            # 串流顯示：一句話狠評先出現，詳細分析邊生成邊顯示
+                            st.markdown("### 💡 AI 分析結果")
+                            split = stream_hand_analysis(hand_data, api_key, selected_model)
+                            write_analysis_stream(split, random.choice(LOADING_TEXTS))
+                            # 存進 session，方便追問後 rerun 仍可顯示
+                            st.session_state["last_analysis_display_index"] = hand_data.get("display_index")
+                            st.session_state["last_analysis_hand_id"] = hand_data.get("id", "")
+                            st.session_state["last_analysis_summary"] = split.summary_text
+                            st.session_state["last_analysis_detail"] = split.detail_text
+                            st.session_state["last_analysis_full"] = split.full_text
                             # v2.1：追問時寫入手牌脈絡並加入一則 context 訊息
                             if st.button("💬 針對此分析追問", key="followup_btn", use_container_width=True):
                                 st.session_state["discussion_display_index"] = hand_data.get("display_index")
@@ -2870,10 +2974,13 @@ else:
                                     (_sum + "\n\n" + _det) if (_sum and _det) else (_ful or "")
                                 )
                                 st.session_state["coach_hand_context"] = ctx_text
-                                st.session_state.messages.append({
-                                    "role": "assistant",
-                                    "content": f"我已鎖定 **Hand #{hand_data.get('display_index')}** (ID: `{hand_data.get('id', '')}`)。請在下方輸入你的追問。",
-                                })
+                                # 每手牌各自一份對話；重新鎖定同一手牌時接續原本的對話
+                                chat_memory = get_chat_memory(hand_data.get("id", ""))
+                                if not chat_memory:
+                                    chat_memory.append(
+                                        "assistant",
+                                        f"我已鎖定 **Hand #{hand_data.get('display_index')}** (ID: `{hand_data.get('id', '')}`)。請在下方輸入你的追問。",
+                                    )
                                 st.rerun()
                         elif has_saved_analysis:
                             # 已點過「追問」，左欄仍顯示該手牌的分析，不消失
@@ -2897,10 +3004,13 @@ else:
                                     (_sum + "\n\n" + _det) if (_sum and _det) else (_ful or "")
                                 )
                                 st.session_state["coach_hand_context"] = ctx_text
-                                st.session_state.messages.append({
-                                    "role": "assistant",
-                                    "content": f"我已鎖定 **Hand #{hand_data.get('display_index')}** (ID: `{hand_data.get('id', '')}`)。請在下方輸入你的追問。",
-                                })
+                                # 每手牌各自一份對話；重新鎖定同一手牌時接續原本的對話
+                                chat_memory = get_chat_memory(hand_data.get("id", ""))
+                                if not chat_memory:
+                                    chat_memory.append(
+                                        "assistant",
+                                        f"我已鎖定 **Hand #{hand_data.get('display_index')}** (ID: `{hand_data.get('id', '')}`)。請在下方輸入你的追問。",
+                                    )
                                 st.rerun()
                         else:
                             st.info("👆 點擊上方按鈕，查看教練建議")
@@ -2912,8 +3022,11 @@ else:
                     disp_idx = st.session_state.get("discussion_display_index")
                     hand_id = st.session_state.get("discussion_hand_id", "?")
                     st.info(f"**正在討論 Hand #{disp_idx}** (ID: `{hand_id}`)", icon="💬")
-                # 顯示對話歷史
-                for msg in st.session_state.messages:
+                # 顯示鎖定手牌的對話歷史
+                chat_memory = None
+                if st.session_state.get("discussion_display_index") is not None:
+                    chat_memory = get_chat_memory(st.session_state.get("discussion_hand_id", ""))
+                for msg in chat_memory or []:
                     with st.chat_message(msg["role"]):
                         st.markdown(msg["content"])
                 # 底部輸入：有鎖定手牌時才可送追問（需有 coach_hand_context）
@@ -2924,19 +3037,19 @@ else:
                     if st.session_state.get("discussion_display_index") is None:
                         st.warning("請先在左欄完成分析並點「💬 針對此分析追問」鎖定手牌。")
                     else:
-                        st.session_state.messages.append({"role": "user", "content": prompt})
                         hand_ctx = st.session_state.get("coach_hand_context", "")
                         with st.chat_message("assistant"):
-                            with st.spinner("教練思考中…"):
-                                reply = chat_with_coach(
-                                    st.session_state.messages[:-1],
-                                    prompt,
-                                    hand_ctx,
-                                    api_key,
-                                    selected_model,
-                                )
-                            st.markdown(reply)
-                        st.session_state.messages.append({"role": "assistant", "content": reply})
+                            # 請求在 append 本輪輸入之前組好：history 不含本輪輸入
+                            reply_stream = stream_chat_with_coach(
+                                chat_memory,
+                                prompt,
+                                hand_ctx,
+                                api_key,
+                                selected_model,
+                            )
+                            chat_memory.append("user", prompt)
+                            reply = st.write_stream(reply_stream)
+                        chat_memory.append("assistant", reply)
                         st.rerun()
-                if not st.session_state.messages and st.session_state.get("discussion_display_index") is None:
+                if chat_memory is None:
                     st.caption("在左欄完成「立即分析這手牌」後，點「💬 針對此分析追問」，即可在此與教練對話。")
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+[效能量測] 比較單程序 iter_hands 與多程序 parse_hands_parallel 的解析速度。
+
+用法（專案根目錄）：
+    python bench/bench_parse_parallel.py --mb 128 --workers 1 2 4 8
+
+以 GGtest.txt 重複拼接出指定大小的暫存檔，逐一量測並確認結果與單程序完全一致。
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.parser import iter_hands, parse_hands_parallel  # noqa: E402
+
+
+def build_fixture(target_mb, source=ROOT / "GGtest.txt"):
+    """把樣本牌譜重複寫入暫存檔直到達到 target_mb，回傳檔案路徑。"""
+    sample = source.read_bytes().strip() + b"\n\n"
+    fd, path = tempfile.mkstemp(prefix="bench_hands_", suffix=".txt")
+    target = target_mb * (1 << 20)
+    written = 0
+    with os.fdopen(fd, "wb") as f:
+        while written < target:
+            f.write(sample)
+            written += len(sample)
+    return path
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--mb", type=int, default=64, help="測試檔大小 (MB)")
+    ap.add_argument("--workers", type=int, nargs="+", default=[2, 4, os.cpu_count() or 1])
+    args = ap.parse_args()
+
+    path = build_fixture(args.mb)
+    try:
+        size_mb = os.path.getsize(path) / (1 << 20)
+        baseline, base_sec = timed(lambda: list(iter_hands(path)))
+        n = len(baseline)
+        print(f"file: {size_mb:.1f} MB, {n:,} hands, cpu_count={os.cpu_count()}")
+        print(f"{'mode':<16}{'seconds':>10}{'hands/s':>12}{'speedup':>10}")
+        print(f"{'iter_hands':<16}{base_sec:>10.2f}{n / base_sec:>12,.0f}{1.0:>10.2f}")
+        for w in sorted(set(args.workers)):
+            (hands, _), sec = timed(lambda: parse_hands_parallel(path, workers=w))
+            if hands != baseline:
+                raise SystemExit(f"workers={w}: 結果與單程序不一致")
+            print(f"{f'parallel x{w}':<16}{sec:>10.2f}{n / sec:>12,.0f}{base_sec / sec:>10.2f}")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
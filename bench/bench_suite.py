@@ -0,0 +1,159 @@
+"""
+[效能量測] 以合成牌譜（bench/synth_hands.py）量測三條主要路徑在不同規模下的表現：
+- parse_hands：hands/sec、峰值記憶體（tracemalloc）、各欄位擷取的耗時拆解
+- render_hand_history_timeline：逐手產生時間軸 HTML（st.markdown 以收集字串取代，不量 Streamlit 本身）
+- generate_match_summary：整份牌譜的 prompt 組裝（call_llm_api 以回傳空字串取代，不呼叫 API）
+
+用法（專案根目錄）：
+    python bench/bench_suite.py                       # 1k / 10k / 100k 手
+    python bench/bench_suite.py --sizes 1000 5000 --seed 3 --out bench_output.txt
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "bench"))
+
+from core import coach, parser  # noqa: E402
+from core.parser import parse_hands, render_hand_history_timeline  # noqa: E402
+from core.table import HandTable  # noqa: E402
+from synth_hands import generate_text  # noqa: E402
+
+# 時間軸渲染較慢，只取前 N 手量測後換算 hands/sec
+RENDER_SAMPLE = 5000
+
+
+def _hero_of(text):
+    m = parser._DEALT_RE.search(text)
+    return m.group(1) if m else "Hero"
+
+
+def _preflop(text):
+    at = text.find(parser._FLOP_MARK)
+    return text[:at] if at != -1 else text
+
+
+# 與 _parse_single_hand 相同的擷取步驟，逐項獨立計時
+FIELD_STEPS = (
+    ("hero/hero_cards", lambda t, hero: parser._DEALT_RE.search(t)),
+    ("id", lambda t, hero: parser._HAND_ID_RE.search(t)),
+    ("bb_size", lambda t, hero: parser._LEVEL_BB_RE.search(t) or parser._POST_BB_RE.search(t)),
+    ("seats/stack", lambda t, hero: [m.group(2) for m in parser._SEAT_RE.finditer(t)]),
+    ("vpip/pfr", lambda t, hero: (
+        parser._starts_line(_preflop(t), hero + ": raises")
+        or parser._starts_line(_preflop(t), hero + ": calls")
+        or parser._starts_line(_preflop(t), hero + ": bets")
+    )),
+    ("pot_size", lambda t, hero: parser._TOTAL_POT_RE.search(t)),
+    ("button", lambda t, hero: parser._BUTTON_IN_SEAT_RE.search(t) or parser._SEAT_IS_BUTTON_RE.search(t)),
+    ("villain", lambda t, hero: (
+        parser._first_actor(_preflop(t), ": raises"), parser._first_actor(_preflop(t), ": bets")
+    )),
+    ("result", lambda t, hero: parser._hero_won(t, hero)),
+)
+
+
+def timed(fn):
+    gc.collect()
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+def peak_memory(fn):
+    """fn 執行期間 Python 配置的峰值位元組數（另外跑一次，避免 tracemalloc 拖慢計時）。"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def field_costs(texts):
+    """每個欄位擷取步驟跑過全部手牌的秒數。"""
+    heroes = [_hero_of(t) for t in texts]
+    costs = []
+    for name, step in FIELD_STEPS:
+        _, sec = timed(lambda: [step(t, h) for t, h in zip(texts, heroes)])
+        costs.append((name, sec))
+    return costs
+
+
+def bench_render(hands, hero):
+    sample = hands[:RENDER_SAMPLE]
+    html_bytes = [0]
+
+    def capture(body, **kwargs):
+        html_bytes[0] += len(body)
+
+    with mock.patch.object(parser.st, "markdown", capture):
+        _, sec = timed(lambda: [render_hand_history_timeline(h["content"], hero) for h in sample])
+    return len(sample), sec, html_bytes[0]
+
+
+def bench_summary(hands):
+    prompts = []
+
+    def capture(api_key, model, prompt, temperature=0.1, **kwargs):
+        prompts.append(prompt)
+        return ""
+
+    table, table_sec = timed(lambda: HandTable(hands))
+    vpip = round(int(table.vpip.sum()) / len(table) * 100, 1) if len(table) else 0
+    pfr = round(int(table.pfr.sum()) / len(table) * 100, 1) if len(table) else 0
+    with mock.patch.object(coach, "call_llm_api", capture):
+        _, sec = timed(lambda: coach.generate_match_summary(table, vpip, pfr, "", ""))
+    return table_sec, sec, len(prompts[0]) if prompts else 0
+
+
+def run(n, seed, emit):
+    text = generate_text(n, seed=seed)
+    (hands, hero), parse_sec = timed(lambda: parse_hands(text))
+    peak = peak_memory(lambda: parse_hands(text))
+    emit(f"\n== {n:,} hands ({len(text) / (1 << 20):.1f} MB, {len(hands):,} with hero) ==")
+    emit(f"{'parse_hands':<28}{parse_sec:>9.3f}s{n / parse_sec:>14,.0f} hands/s   peak {peak / (1 << 20):,.1f} MB")
+
+    texts = [h["content"] for h in hands]
+    costs = field_costs(texts)
+    total = sum(sec for _, sec in costs) or 1
+    for name, sec in costs:
+        emit(f"  field {name:<20}{sec:>9.3f}s{sec / max(len(texts), 1) * 1e6:>11.2f} us/hand {sec / total:>7.1%}")
+
+    count, render_sec, html_bytes = bench_render(hands, hero)
+    if count:
+        emit(f"{'render_timeline':<28}{render_sec:>9.3f}s{count / render_sec:>14,.0f} hands/s   ({count:,} hands, {html_bytes / count:,.0f} B html/hand)")
+
+    table_sec, summary_sec, prompt_len = bench_summary(hands)
+    emit(f"{'HandTable build':<28}{table_sec:>9.3f}s")
+    emit(f"{'match_summary prompt':<28}{summary_sec:>9.3f}s{'':>14}   prompt {prompt_len:,} chars")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", help="另存結果到檔案")
+    args = ap.parse_args()
+
+    lines = []
+
+    def emit(line):
+        print(line, flush=True)
+        lines.append(line)
+
+    for n in args.sizes:
+        run(n, args.seed, emit)
+    if args.out:
+        Path(args.out).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+[翻前勝率表建置] 重新計算 core.preflop 的 169×169 翻前勝率矩陣並寫入 data/preflop_equity_169.npy。
+- 所有花色同構的起手牌對戰（約 47,000 種）逐一精確列舉，單核約 17 分鐘
+- 寫入前檢查：a 對 b 與 b 對 a 相加為 1、同類別對戰為 0.5、幾個常見對戰與公認數值相符
+
+用法（專案根目錄）：
+    python bench/build_preflop_matrix.py                  # 計算並寫入預設路徑
+    python bench/build_preflop_matrix.py -o /tmp/m.npy
+    python bench/build_preflop_matrix.py --check          # 只檢查現有檔案
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.preflop import (  # noqa: E402
+    HAND_CLASSES,
+    PREFLOP_MATRIX_PATH,
+    build_preflop_matrix,
+    class_index,
+    load_preflop_matrix,
+    save_preflop_matrix,
+)
+
+# 公認的翻前勝率（平手算一半），容許 ±0.002
+KNOWN_MATCHUPS = {
+    ("AA", "KK"): 0.8195,
+    ("AKs", "QQ"): 0.4605,
+    ("AKo", "22"): 0.4735,
+    ("72o", "AA"): 0.1180,
+    ("JTs", "AKo"): 0.4051,
+}
+
+
+def check(label, ok):
+    print(f"{'PASS' if ok else 'FAIL'}  {label}")
+    if not ok:
+        raise SystemExit(1)
+
+
+def check_matrix(matrix):
+    check("shape 169x169 float32", matrix.shape == (len(HAND_CLASSES),) * 2 and matrix.dtype == np.float32)
+    check("matrix + matrix.T == 1", np.allclose(matrix + matrix.T, 1.0, atol=1e-6))
+    check("diagonal == 0.5", np.allclose(np.diag(matrix), 0.5, atol=1e-6))
+    for (a, b), expected in KNOWN_MATCHUPS.items():
+        value = float(matrix[class_index(a), class_index(b)])
+        check(f"{a} vs {b}: {value:.4f} (expected ~{expected})", abs(value - expected) < 0.002)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-o", "--output", type=Path, default=PREFLOP_MATRIX_PATH)
+    ap.add_argument("--check", action="store_true", help="只檢查現有檔案，不重新計算")
+    args = ap.parse_args()
+    if args.check:
+        check_matrix(np.asarray(load_preflop_matrix(args.output)))
+        return
+    t0 = time.perf_counter()
+
+    def progress(done, total):
+        if done % 13 == 0 or done == total:
+            print(f"{done}/{total} rows, {time.perf_counter() - t0:.0f}s", flush=True)
+
+    matrix = build_preflop_matrix(progress)
+    check_matrix(matrix)
+    save_preflop_matrix(matrix, args.output)
+    print(f"wrote {args.output} ({args.output.stat().st_size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+[推或棄均衡表建置] 以 core.preflop 的勝率矩陣重新解出 core.pushfold 的 Nash 推 / 棄均衡表，寫入 data/pushfold_nash.npz。
+- 需要先有 data/preflop_equity_169.npy（bench/build_preflop_matrix.py）
+- 寫入前檢查：AA 一律全下 / 跟注、範圍隨籌碼加深與身後人數增加（4BB 以上）而收緊（允許少數邊界類別擺動）、
+  單挑 SB 10BB 無前注的全下比例落在常見 Nash 表的區間
+
+用法（專案根目錄）：
+    python bench/build_pushfold_chart.py
+    python bench/build_pushfold_chart.py --check          # 只檢查現有檔案
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.preflop import class_index, combos_of_class  # noqa: E402
+from core.pushfold import (  # noqa: E402
+    PUSHFOLD_ANTES,
+    PUSHFOLD_CHART_PATH,
+    PUSHFOLD_STACKS,
+    build_pushfold_chart,
+    load_pushfold_chart,
+    save_pushfold_chart,
+)
+
+COMBO_COUNTS = np.array([len(combos_of_class(i)) for i in range(169)])
+
+
+def check(label, ok):
+    print(f"{'PASS' if ok else 'FAIL'}  {label}")
+    if not ok:
+        raise SystemExit(1)
+
+
+def share(mask):
+    """範圍佔全部 1326 種組合的比例。"""
+    return float(COMBO_COUNTS @ mask / COMBO_COUNTS.sum())
+
+
+def check_chart(chart):
+    push, call = chart["push"], chart["call"]
+    aa = class_index("AA")
+    check("AA always pushes", bool(push[..., aa].all()))
+    behind_index = np.arange(call.shape[1])[:, None]
+    valid = np.arange(call.shape[2])[None, :] <= behind_index
+    check("AA always calls", bool(call[:, valid][..., aa].all()))
+    a0 = PUSHFOLD_ANTES.index(0.0)
+    s10 = PUSHFOLD_STACKS.index(10)
+    hu_push = share(push[s10, 0, a0])
+    hu_call = share(call[s10, 0, 0, a0])
+    check(f"heads-up SB 10BB: push {hu_push:.1%}, BB call {hu_call:.1%}", 0.5 <= hu_push <= 0.65 and 0.3 <= hu_call <= 0.45)
+    shares = (push * COMBO_COUNTS).sum(axis=-1) / COMBO_COUNTS.sum()
+    # 籌碼越深、身後人數越多，全下範圍越窄（容許 1% 的邊界擺動）；
+    # 3BB 以下幾乎任兩張都推，只跟第一位跟注者對決的模型在此會有幾個百分點的起伏，不檢查身後人數
+    s4 = PUSHFOLD_STACKS.index(4)
+    check("push ranges tighten with stack depth", bool((np.diff(shares, axis=0) <= 0.01).all()))
+    check("push ranges tighten with players behind (>= 4BB)", bool((np.diff(shares[s4:], axis=1) <= 0.01).all()))
+    check("antes widen push ranges", bool((np.diff(shares, axis=2) >= -0.01).all()))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("-o", "--output", type=Path, default=PUSHFOLD_CHART_PATH)
+    ap.add_argument("--check", action="store_true", help="只檢查現有檔案，不重新計算")
+    args = ap.parse_args()
+    if args.check:
+        check_chart(load_pushfold_chart(args.output))
+        return
+    t0 = time.perf_counter()
+
+    def progress(done, total):
+        if done % 5 == 0 or done == total:
+            print(f"{done}/{total} stacks, {time.perf_counter() - t0:.0f}s", flush=True)
+
+    chart = build_pushfold_chart(progress=progress)
+    check_chart(chart)
+    save_pushfold_chart(chart, args.output)
+    print(f"wrote {args.output} ({args.output.stat().st_size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+[牌力驗證] 以暴力列舉檢查 core.evaluator，並量測單手 / 批次評估速度。
+- 全部 2,598,960 種五張牌：各牌型數量與標準組合數一致，且恰有 7,462 種不同牌力
+- 隨機 5 / 6 / 7 張牌：evaluate、evaluate_batch 與「所有五張組合各自以最直白的規則判定後取最大」三者一致
+- core.allin_ev：隨機翻前 / 翻牌 / 轉牌全下對戰的勝率，與逐一列舉全部剩餘公牌的結果一致
+- core.equity：手牌對範圍的蒙地卡羅勝率落在精確值（逐一組合精確列舉後平均）的 4 個標準誤差內，並量測每秒模擬次數
+
+用法（專案根目錄）：
+    python bench/eval_check.py                 # 預設每種張數隨機 20,000 手
+    python bench/eval_check.py --samples 100000 --seed 7
+"""
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.allin_ev import allin_equity  # noqa: E402
+from core.equity import equity_vs_range, parse_range  # noqa: E402
+from core.evaluator import CATEGORY_SHIFT, HAND_CATEGORIES, evaluate, evaluate_batch, parse_cards  # noqa: E402
+
+# 五張牌各牌型的組合數（同花順含皇家同花順）
+FIVE_CARD_COUNTS = {
+    "Straight Flush": 40,
+    "Four of a Kind": 624,
+    "Full House": 3744,
+    "Flush": 5108,
+    "Straight": 10200,
+    "Three of a Kind": 54912,
+    "Two Pair": 123552,
+    "One Pair": 1098240,
+    "High Card": 1302540,
+}
+
+
+def naive_five(cards):
+    """不查表、不用位元運算的五張牌判定，回傳可比較的 tuple (牌型, 踢腳...)。"""
+    ranks = sorted((c >> 2 for c in cards), reverse=True)
+    flush = len({c & 3 for c in cards}) == 1
+    distinct = sorted(set(ranks), reverse=True)
+    straight_top = None
+    if len(distinct) == 5:
+        if distinct[0] - distinct[4] == 4:
+            straight_top = distinct[0]
+        elif distinct == [12, 3, 2, 1, 0]:
+            straight_top = 3
+    groups = sorted(Counter(ranks).items(), key=lambda kv: (kv[1], kv[0]), reverse=True)
+    shape = [n for _, n in groups]
+    by_group = [r for r, _ in groups]
+    if straight_top is not None and flush:
+        return (8, straight_top)
+    if shape == [4, 1]:
+        return (7, *by_group)
+    if shape == [3, 2]:
+        return (6, *by_group)
+    if flush:
+        return (5, *ranks)
+    if straight_top is not None:
+        return (4, straight_top)
+    if shape == [3, 1, 1]:
+        return (3, *by_group)
+    if shape == [2, 2, 1]:
+        return (2, *by_group)
+    if shape == [2, 1, 1, 1]:
+        return (1, *by_group)
+    return (0, *ranks)
+
+
+def naive_best(cards):
+    return max(naive_five(combo) for combo in combinations(cards, 5))
+
+
+def check(label, ok):
+    print(f"{'PASS' if ok else 'FAIL'}  {label}")
+    if not ok:
+        raise SystemExit(1)
+
+
+def check_all_five_card_hands():
+    combos = np.array(list(combinations(range(52), 5)), dtype=np.int64)
+    values = evaluate_batch(combos)
+    counts = Counter(HAND_CATEGORIES[c] for c in (values >> CATEGORY_SHIFT).tolist())
+    check("all 2,598,960 five-card hands: category counts", counts == FIVE_CARD_COUNTS)
+    check("all five-card hands: 7,462 distinct values", len(np.unique(values)) == 7462)
+
+
+def check_random(n_cards, samples, rng):
+    deck = list(range(52))
+    hands = [rng.sample(deck, n_cards) for _ in range(samples)]
+    batch = evaluate_batch(np.array(hands)).tolist()
+    scalar = [evaluate(h) for h in hands]
+    check(f"{samples} random {n_cards}-card hands: evaluate == evaluate_batch", scalar == batch)
+    # 牌力值與 naive tuple 必須是同一種排序：依牌力值排序後，naive 結果不可倒退，且相同值對應相同 tuple
+    naive = [naive_best(h) for h in hands]
+    order = sorted(range(samples), key=lambda i: scalar[i])
+    monotone = all(
+        (naive[a] < naive[b]) if scalar[a] < scalar[b] else (naive[a] == naive[b])
+        for a, b in zip(order, order[1:])
+    )
+    same_category = all(scalar[i] >> CATEGORY_SHIFT == naive[i][0] for i in range(samples))
+    check(f"{samples} random {n_cards}-card hands: ordering matches brute force", monotone and same_category)
+
+
+def brute_force_equity(hands, board):
+    """逐一列舉所有剩餘公牌，回傳第一位玩家的平均分得比例（平手均分）。"""
+    known = {c for h in hands for c in h} | set(board)
+    deck = [c for c in range(52) if c not in known]
+    extra = np.array(list(combinations(deck, 5 - len(board))), dtype=np.int64)
+    boards = np.concatenate([np.broadcast_to(board, (len(extra), len(board))), extra], axis=1)
+    values = np.stack([
+        evaluate_batch(np.concatenate([np.broadcast_to(h, (len(boards), 2)), boards], axis=1)) for h in hands
+    ])
+    winners = values == values.max(axis=0)
+    return float((winners[0] / winners.sum(axis=0)).mean())
+
+
+def check_allin_equity(rng, matchups=12):
+    worst = 0.0
+    for i in range(matchups):
+        n_players = 2 + i % 3
+        n_board = (0, 3, 4)[i % 3] if i >= 3 else 0
+        cards = rng.sample(range(52), 2 * n_players + n_board)
+        hands = [tuple(cards[2 * p:2 * p + 2]) for p in range(n_players)]
+        board = cards[2 * n_players:]
+        players = [(f"p{p}", h) for p, h in enumerate(hands)]
+        equity, _ = allin_equity(players, board, [(1, tuple(range(n_players)))])
+        worst = max(worst, abs(equity - brute_force_equity(hands, board)))
+    check(f"{matchups} random all-in matchups: exact equity matches full enumeration", worst < 1e-9)
+
+
+def check_range_equity():
+    for hero, villain_range, board in (("Kh As", "AA", ""), ("Qs Qd", "77+, AQs+, AKo", ""), ("Ah Kd", "QQ, JTs", "Qc 7d 2s")):
+        hero_cards = tuple(parse_cards(hero))
+        board_cards = parse_cards(board)
+        combos = [c for c in parse_range(villain_range) if not set(c) & (set(hero_cards) | set(board_cards))]
+        exact = np.mean([
+            allin_equity([("hero", hero_cards), ("villain", c)], board_cards, [(1, (0, 1))])[0] for c in combos
+        ])
+        result = equity_vs_range(hero, villain_range, board, samples=1_000_000, target_stderr=0)
+        t0 = time.perf_counter()
+        equity_vs_range(hero, villain_range, board, samples=1_000_000, target_stderr=0)
+        cached_ms = (time.perf_counter() - t0) * 1000
+        ok = abs(result["equity"] - exact) <= 4 * result["stderr"] and cached_ms < 5
+        check(f"{hero} vs {villain_range} [{board}]: Monte Carlo {result['equity']:.4f} vs exact {exact:.4f}", ok)
+    t0 = time.perf_counter()
+    result = equity_vs_range("7c 6c", "22+, A2s+, K9s+, ATo+", samples=1_000_000, target_stderr=0, seed=1)
+    elapsed = time.perf_counter() - t0
+    print(f"equity_vs_range: {result['samples'] / elapsed / 1e6:.2f}M boards/s")
+
+
+def timing(rng):
+    hands = [rng.sample(range(52), 7) for _ in range(20000)]
+    evaluate(hands[0])
+    t0 = time.perf_counter()
+    for h in hands:
+        evaluate(h)
+    scalar_us = (time.perf_counter() - t0) / len(hands) * 1e6
+    arr = np.array([rng.sample(range(52), 7) for _ in range(1_000_000)])
+    t0 = time.perf_counter()
+    evaluate_batch(arr)
+    batch_us = (time.perf_counter() - t0) / len(arr) * 1e6
+    print(f"evaluate: {scalar_us:.2f} us/hand, evaluate_batch: {batch_us:.3f} us/hand (7 cards)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--samples", type=int, default=20000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    rng = random.Random(args.seed)
+    t0 = time.perf_counter()
+    evaluate([0, 1, 2, 3, 4])
+    print(f"tables built in {time.perf_counter() - t0:.2f}s")
+    check_all_five_card_hands()
+    for n_cards in (5, 6, 7):
+        check_random(n_cards, args.samples, rng)
+    check_allin_equity(rng)
+    check_range_equity()
+    timing(rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""
+[替身伺服器] 本機的 Gemini generateContent 替身，離線驗證 core.http_client 的連線池、逾時與重試。
+- 回傳與 Gemini 相同結構的 JSON（candidates[0].content.parts[0].text）
+- streamGenerateContent?alt=sse 以 server-sent events 分段送出同一份回覆，可設定每段間隔
+- cachedContents 建立 / 引用：記住上傳的前段，引用不存在的名稱回 404（模擬過期），可關閉以模擬不支援
+- 可設定前 N 個請求回 429/503、每個請求延遲幾秒，並記錄請求數、實際建立的連線數與同時處理中的請求數峰值
+
+用法（專案根目錄）：
+    python bench/fake_gemini.py --port 8765              # 啟動後以 GEMINI_API_BASE=http://127.0.0.1:8765/v1beta 執行 app
+    python bench/fake_gemini.py --selfcheck              # 跑一輪 keep-alive / 重試 / 逾時 / 脈絡快取 / prompt 預算 / AsyncCoach 檢查
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 客戶端逾時後先斷線是預期情境（逾時檢查），不印 traceback
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def _candidate(text):
+    return {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+
+
+class FakeGemini:
+    """
+    在背景執行緒啟動的替身伺服器，可當 context manager 使用：
+
+        with FakeGemini(fail_first=2, fail_status=503) as server:
+            post_json(server.url("gemini-test", "k"), payload)
+
+    reply(payload) 決定回覆文字，預設回報收到的字元數。
+    """
+
+    def __init__(self, port=0, fail_first=0, fail_status=503, retry_after=None, delay=0.0, reply=None,
+                 stream_chunk=8, stream_delay=0.0, context_cache=True):
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.delay = delay
+        self.stream_chunk = stream_chunk
+        self.stream_delay = stream_delay
+        self.context_cache = context_cache
+        self.cached_contents = {}
+        self.reply = reply or (lambda payload: f"ok ({len(json.dumps(payload, ensure_ascii=False))} chars)")
+        self.requests = 0
+        self.connections = 0
+        self.inflight = 0
+        self.peak_inflight = 0
+        self.payloads = []
+        self._lock = threading.Lock()
+        self._server = _QuietServer(("127.0.0.1", port), self._handler_class())
+        self._thread = None
+
+    @property
+    def base(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1beta"
+
+    def url(self, model, api_key="test", method="generateContent"):
+        return f"{self.base}/models/{model}:{method}?key={api_key}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body, headers=()):
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in headers:
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                with server._lock:
+                    server.inflight += 1
+                    server.peak_inflight = max(server.peak_inflight, server.inflight)
+                try:
+                    self._handle_post()
+                finally:
+                    with server._lock:
+                        server.inflight -= 1
+
+            def _handle_post(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b"{}"
+                with server._lock:
+                    server.requests += 1
+                    n = server.requests
+                try:
+                    payload = json.loads(raw.decode("utf-8"))
+                except ValueError:
+                    self._send(400, {"error": {"code": 400, "message": "invalid JSON"}})
+                    return
+                if server.delay:
+                    time.sleep(server.delay)
+                if n <= server.fail_first:
+                    headers = [("Retry-After", str(server.retry_after))] if server.retry_after is not None else []
+                    self._send(server.fail_status, {"error": {"code": server.fail_status, "message": "fake failure"}}, headers)
+                    return
+                if self.path.split("?")[0].endswith("/cachedContents"):
+                    self._create_cached_content(payload)
+                    return
+                cached_name = payload.get("cachedContent")
+                if cached_name and cached_name not in server.cached_contents:
+                    self._send(404, {"error": {"code": 404, "message": f"CachedContent not found: {cached_name}"}})
+                    return
+                with server._lock:
+                    server.payloads.append(payload)
+                text = server.reply(payload)
+                if ":streamGenerateContent" in self.path:
+                    self._send_stream(text)
+                    return
+                self._send(200, _candidate(text))
+
+            def _create_cached_content(self, payload):
+                if not server.context_cache:
+                    self._send(400, {"error": {"code": 400, "message": "context caching not supported"}})
+                    return
+                with server._lock:
+                    name = f"cachedContents/fake{len(server.cached_contents) + 1}"
+                    server.cached_contents[name] = payload
+                self._send(200, {"name": name, "model": payload.get("model"), "ttl": payload.get("ttl")})
+
+            def _send_stream(self, text):
+                # 分段長度未知，以 chunked transfer encoding 逐段送出 SSE 事件
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                step = max(1, server.stream_chunk)
+                for i in range(0, len(text), step):
+                    event = f"data: {json.dumps(_candidate(text[i:i + step]), ensure_ascii=False)}\r\n\r\n".encode("utf-8")
+                    self.wfile.write(f"{len(event):x}\r\n".encode("ascii") + event + b"\r\n")
+                    self.wfile.flush()
+                    if server.stream_delay:
+                        time.sleep(server.stream_delay)
+                self.wfile.write(b"0\r\n\r\n")
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def selfcheck():
+    """以替身伺服器驗證 core.http_client 的行為，任何一項不符即結束並回報。"""
+    import requests
+
+    from core import http_client
+
+    http_client.BACKOFF_BASE = 0.01
+    payload = {"contents": [{"parts": [{"text": "hi"}]}]}
+
+    def check(label, ok):
+        print(f"{'PASS' if ok else 'FAIL'}  {label}")
+        if not ok:
+            raise SystemExit(1)
+
+    http_client.close_session()
+    with FakeGemini() as server:
+        for _ in range(5):
+            http_client.post_json(server.url("m"), payload).json()
+        check("keep-alive: 5 requests over 1 connection", server.requests == 5 and server.connections == 1)
+
+    with FakeGemini(fail_first=2, fail_status=503) as server:
+        resp = http_client.post_json(server.url("m"), payload)
+        check("503 x2 then 200 after retries", resp.status_code == 200 and server.requests == 3)
+
+    with FakeGemini(fail_first=1, fail_status=429, retry_after=0) as server:
+        resp = http_client.post_json(server.url("m"), payload)
+        check("429 with Retry-After retried", resp.status_code == 200 and server.requests == 2)
+
+    with FakeGemini(fail_first=99, fail_status=500) as server:
+        resp = http_client.post_json(server.url("m"), payload, retries=2)
+        check("retries exhausted returns last response", resp.status_code == 500 and server.requests == 3)
+
+    with FakeGemini(delay=1.0) as server:
+        t0 = time.perf_counter()
+        try:
+            http_client.post_json(server.url("m"), payload, timeout=(1.0, 0.2))
+            timed_out = False
+        except requests.Timeout:
+            timed_out = True
+        check("read timeout raises without resending", timed_out and time.perf_counter() - t0 < 0.9 and server.requests == 1)
+
+    with FakeGemini(reply=lambda payload: "一句話狠評：♠️ 測試。\n===SPLIT===\n### 詳細", stream_chunk=3) as server:
+        resp = http_client.post_json(server.url("m", method="streamGenerateContent") + "&alt=sse", payload, stream=True)
+        chunks = [e["candidates"][0]["content"]["parts"][0]["text"] for e in http_client.iter_sse_json(resp)]
+        check("SSE stream yields chunks in order", len(chunks) > 3 and "".join(chunks).endswith("### 詳細"))
+
+    from core import coach, context_cache
+
+    hand = {"hero_cards": "Ah Kd", "position": "BTN", "bb": 20, "content": "Poker Hand #TM1: test"}
+    prefix = coach._hand_analysis_prefix()
+    with FakeGemini() as server:
+        http_client.GEMINI_API_BASE = server.base
+        context_cache.clear()
+        coach.call_llm_api("k", "m", coach._hand_analysis_prompt(hand), static_prefix=prefix)
+        sent = server.payloads[-1]
+        check(
+            "context cache: prefix uploaded once, call sends only the suffix",
+            len(server.cached_contents) == 1 and sent.get("cachedContent")
+            and not sent["contents"][0]["parts"][0]["text"].startswith(prefix[:50]),
+        )
+        server.cached_contents.clear()
+        coach.call_llm_api("k", "m", coach._hand_analysis_prompt(hand), static_prefix=prefix)
+        sent = server.payloads[-1]
+        check("expired cached content falls back to the full prompt", "cachedContent" not in sent
+              and sent["contents"][0]["parts"][0]["text"].startswith(prefix))
+    with FakeGemini(context_cache=False) as server:
+        http_client.GEMINI_API_BASE = server.base
+        context_cache.clear()
+        for _ in range(2):
+            coach.call_llm_api("k", "m", coach._hand_analysis_prompt(hand), static_prefix=prefix)
+        check("unsupported context cache: full prompt, creation tried once",
+              server.requests == 3 and all("cachedContent" not in p for p in server.payloads))
+
+    with FakeGemini(delay=0.2) as server:
+        http_client.GEMINI_API_BASE = server.base
+        context_cache.clear()
+        threads = [threading.Thread(target=coach.call_llm_api, args=("k", "m", coach._hand_analysis_prompt(hand)),
+                                    kwargs={"static_prefix": prefix}) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        check("cold key hit by 8 threads: cachedContent created once",
+              len(server.cached_contents) == 1 and all("cachedContent" in p for p in server.payloads))
+    with FakeGemini() as server:
+        http_client.GEMINI_API_BASE = server.base
+        context_cache.clear()
+        coach.call_llm_api("k", "m", "短前段。本手內容", static_prefix="短前段。")
+        check("prefix below the minimum cacheable size: no create request",
+              server.requests == 1 and not server.cached_contents)
+
+    # 策略檔約 8k 個中文字時，手牌紀錄仍須完整放進 prompt（前段不計入每手的預算）
+    import tempfile
+
+    from core.compact import compact_hand
+
+    real_hand = (ROOT / "GGtest.txt").read_text(encoding="utf-8").split("\n\n\n")[0]
+    with tempfile.TemporaryDirectory() as tmp:
+        bible = Path(tmp) / "poker_strategy_bible.txt"
+        bible.write_text("翻前範圍依位置收緊，短籌碼以推或棄為主。" * 400, encoding="utf-8")
+        original_file, coach._STRATEGY_FILE, coach._strategy_cache = coach._STRATEGY_FILE, bible, None
+        try:
+            prompt = coach._hand_analysis_prompt(dict(hand, content=real_hand, hero="Hero"))
+        finally:
+            coach._STRATEGY_FILE, coach._strategy_cache = original_file, None
+    check("8k-character strategy bible keeps the full hand log",
+          "已截斷" not in prompt and compact_hand(real_hand, "Hero") in prompt)
+
+    context_cache.clear()
+    http_client.close_session()
+    selfcheck_async(check)
+
+
+def selfcheck_async(check):
+    """AsyncCoach：並行上限、連線重用、重試與三個 API。回應快取改寫到暫存檔，不動 data/ 下的快取。"""
+    import asyncio
+    import tempfile
+
+    from core import context_cache, http_client
+    from core.async_coach import AsyncCoach
+    from core.llm_cache import _response_cache
+
+    hands = [
+        {"hero_cards": "Ah Kd", "position": "BTN", "bb": 20, "content": f"Poker Hand #TM{i}: test"}
+        for i in range(40)
+    ]
+    original_path = _response_cache.path
+    with tempfile.TemporaryDirectory() as tmp:
+        _response_cache.close()
+        _response_cache.path = Path(tmp) / "llm_cache.sqlite3"
+        try:
+            with FakeGemini(delay=0.2, context_cache=False) as server:
+                http_client.GEMINI_API_BASE = server.base
+                context_cache.clear()
+
+                async def batch():
+                    async with AsyncCoach("k", "m", max_concurrency=8) as coach:
+                        return [item async for item in coach.analyze_hands(hands)]
+
+                t0 = time.perf_counter()
+                results = asyncio.run(batch())
+                elapsed = time.perf_counter() - t0
+                check(f"async: 40 analyses at concurrency 8 in {elapsed:.2f}s",
+                      sorted(i for i, _ in results) == list(range(40))
+                      and all(text.startswith("ok") for _, text in results) and elapsed < 3.0)  # 逐一送出約需 8 秒
+                check(f"async: back-pressure (peak {server.peak_inflight} in flight, {server.connections} connections)",
+                      server.peak_inflight <= 8 and server.connections <= 8 + 1)  # +1：同步 client 嘗試建立脈絡快取
+
+                async def cached_again():
+                    async with AsyncCoach("k", "m") as coach:
+                        return await coach.analyze_specific_hand(hands[0])
+
+                before = server.requests
+                check("async: repeated analysis served from the response cache",
+                      asyncio.run(cached_again()).startswith("ok") and server.requests == before)
+
+            with FakeGemini(fail_first=2, fail_status=503) as server:
+                http_client.GEMINI_API_BASE = server.base
+
+                async def summary_and_chat():
+                    async with AsyncCoach("k", "m") as coach:
+                        summary = await coach.generate_match_summary(hands, 20.0, 10.0)
+                        reply = await coach.chat_with_coach([{"role": "assistant", "content": "已鎖定"}], "為什麼？", "ctx")
+                        return summary, reply
+
+                summary, reply = asyncio.run(summary_and_chat())
+                check("async: 503 x2 retried; match summary and chat reply",
+                      summary.startswith("ok") and reply.startswith("ok") and server.requests == 4)
+        finally:
+            _response_cache.close()
+            _response_cache.path = original_path
+    context_cache.clear()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--fail-first", type=int, default=0, help="前 N 個請求回傳錯誤")
+    ap.add_argument("--fail-status", type=int, default=503)
+    ap.add_argument("--delay", type=float, default=0.0, help="每個請求延遲秒數")
+    ap.add_argument("--stream-delay", type=float, default=0.05, help="串流每段之間的間隔秒數")
+    ap.add_argument("--selfcheck", action="store_true")
+    args = ap.parse_args()
+    if args.selfcheck:
+        selfcheck()
+        return
+    server = FakeGemini(
+        args.port, args.fail_first, args.fail_status, delay=args.delay, stream_delay=args.stream_delay
+    ).start()
+    print(f"fake Gemini listening: GEMINI_API_BASE={server.base}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
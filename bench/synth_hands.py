@@ -0,0 +1,322 @@
+"""
+[合成牌譜] 產生可重現的 GGPoker 錦標賽手牌紀錄，供效能量測與大檔測試使用。
+
+- 同一個 seed 永遠產生相同內容
+- 涵蓋 6/8/9 人桌、翻前/翻後全下、多人底池、Hero 不在桌上（解析器應略過）的手牌
+- 格式與 GGtest.txt 相同（新的手牌在前、手牌間空兩行），parse_hands 可直接解析
+
+用法（專案根目錄）：
+    python bench/synth_hands.py 10000 -o data/raw_hands/synth_10k.txt --seed 7
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+
+RANKS = "23456789TJQKA"
+SUITS = "cdhs"
+DECK = [r + s for r in RANKS for s in SUITS]
+
+# (小盲, 大盲, 前注)；每 LEVEL_HANDS 手升一級
+BLIND_LEVELS = [
+    (50, 100, 15), (100, 200, 25), (150, 300, 40), (200, 400, 50), (250, 500, 60),
+    (300, 600, 75), (400, 800, 100), (500, 1000, 125), (600, 1200, 150), (750, 1500, 200),
+    (1000, 2000, 250), (1250, 2500, 300), (1500, 3000, 400), (2000, 4000, 500),
+]
+LEVEL_HANDS = 60
+TABLE_SIZES = (6, 8, 9)
+HERO = "Hero"
+# Hero 不在桌上的手牌比例（模擬觀戰/換桌後的紀錄）
+MISSING_HERO_RATE = 0.03
+
+
+def _fmt(n):
+    return f"{n:,}"
+
+
+def _new_name(rng):
+    return f"{rng.getrandbits(32):08x}"
+
+
+class _Table:
+    """一張牌桌的狀態：座位、籌碼、按鈕位置；跨手牌延續。"""
+
+    def __init__(self, rng, table_no):
+        self.rng = rng
+        self.table_no = table_no
+        self.max_seats = rng.choice(TABLE_SIZES)
+        self.hero_seat = rng.randint(1, self.max_seats)
+        self.button = rng.randint(1, self.max_seats)
+        self.stacks = {}
+        self.names = {}
+        for seat in range(1, self.max_seats + 1):
+            self._seat_player(seat, start_bb=rng.randint(15, 80))
+
+    def _seat_player(self, seat, start_bb, bb=100):
+        name = HERO if seat == self.hero_seat else _new_name(self.rng)
+        self.names[seat] = name
+        self.stacks[seat] = start_bb * bb + self.rng.randint(0, bb)
+
+    def refill(self, bb):
+        """籌碼輸光的玩家由新玩家補位（Hero 直接重買）。"""
+        for seat, stack in self.stacks.items():
+            if stack <= 0:
+                self._seat_player(seat, start_bb=self.rng.randint(15, 60), bb=bb)
+
+
+class _HandSim:
+    """模擬一手牌並輸出 GG 格式文字。"""
+
+    def __init__(self, rng, table, level, hand_id, tournament_id, when, hero_present):
+        self.rng = rng
+        self.table = table
+        self.sb, self.bb, self.ante = level
+        self.hand_id = hand_id
+        self.tournament_id = tournament_id
+        self.when = when
+        self.lines = []
+        self.seats = [s for s in sorted(table.stacks) if hero_present or table.names[s] != HERO]
+        self.name = {s: table.names[s] if hero_present else self._replace_hero(s) for s in self.seats}
+        self.stack = {s: table.stacks[s] for s in self.seats}
+        self.invested = {s: 0 for s in self.seats}
+        self.folded = {}
+        self.board = []
+        self.shown = {}
+
+    def _replace_hero(self, seat):
+        name = self.table.names[seat]
+        return _new_name(self.rng) if name == HERO else name
+
+    # --- 工具 ---
+    def _order_from(self, seat):
+        i = self.seats.index(seat)
+        return self.seats[i:] + self.seats[:i]
+
+    def _next_seat(self, seat):
+        later = [s for s in self.seats if s > seat]
+        return later[0] if later else self.seats[0]
+
+    def _put(self, seat, amount):
+        amount = min(amount, self.stack[seat])
+        self.stack[seat] -= amount
+        self.invested[seat] += amount
+        return amount
+
+    def _live(self):
+        return [s for s in self.seats if s not in self.folded]
+
+    def _can_act(self, s):
+        return s not in self.folded and self.stack[s] > 0
+
+    # --- 下注輪 ---
+    def _betting_round(self, order, street_bets, current_bet, aggressive, fold_base):
+        """
+        order：本輪行動順序；street_bets：本輪已投入（盲注）；current_bet：目前要跟的額度。
+        aggressive 控制加注頻率，fold_base 為面對下注時的棄牌機率。回傳 (street_bets, current_bet)。
+        """
+        rng = self.rng
+        to_act = [s for s in order if self._can_act(s)]
+        min_raise = self.bb
+        while to_act:
+            seat = to_act.pop(0)
+            if not self._can_act(seat) or len(self._live()) == 1:
+                continue
+            name = self.name[seat]
+            to_call = current_bet - street_bets.get(seat, 0)
+            stack = self.stack[seat]
+            short = stack <= 12 * self.bb
+            r = rng.random()
+            if to_call > 0:
+                fold_p = fold_base + (0.1 if current_bet > self.bb * 4 else 0.0)
+                if r < fold_p:
+                    self.folded[seat] = self._street
+                    self.lines.append(f"{name}: folds")
+                    continue
+                if r < fold_p + aggressive * (1.4 if short else 1.0):
+                    target = stack + street_bets.get(seat, 0) if short else current_bet + max(min_raise, int(current_bet * rng.uniform(1.2, 2.2)))
+                    target = min(target, stack + street_bets.get(seat, 0))
+                    if target > current_bet:
+                        self._raise_to(seat, target, street_bets, current_bet)
+                        min_raise = max(min_raise, target - current_bet)
+                        current_bet = target
+                        to_act = [s for s in self._order_after(seat) if self._can_act(s)]
+                        continue
+                paid = self._put(seat, to_call)
+                street_bets[seat] = street_bets.get(seat, 0) + paid
+                tail = " and is all-in" if self.stack[seat] == 0 else ""
+                self.lines.append(f"{name}: calls {_fmt(paid)}{tail}")
+            else:
+                if r < aggressive * 1.3:
+                    pot = sum(self.invested.values())
+                    size = max(self.bb, int(pot * rng.choice((0.33, 0.5, 0.75, 1.0))))
+                    target = street_bets.get(seat, 0) + size
+                    if current_bet == 0:
+                        paid = self._put(seat, size)
+                        street_bets[seat] = street_bets.get(seat, 0) + paid
+                        tail = " and is all-in" if self.stack[seat] == 0 else ""
+                        self.lines.append(f"{name}: bets {_fmt(paid)}{tail}")
+                        current_bet = street_bets[seat]
+                    else:
+                        self._raise_to(seat, target, street_bets, current_bet)
+                        current_bet = street_bets[seat]
+                    min_raise = max(min_raise, size)
+                    to_act = [s for s in self._order_after(seat) if self._can_act(s)]
+                else:
+                    self.lines.append(f"{name}: checks")
+        return street_bets, current_bet
+
+    def _order_after(self, seat):
+        order = self._order_from(seat)
+        return order[1:]
+
+    def _raise_to(self, seat, target, street_bets, current_bet):
+        already = street_bets.get(seat, 0)
+        paid = self._put(seat, target - already)
+        street_bets[seat] = already + paid
+        tail = " and is all-in" if self.stack[seat] == 0 else ""
+        self.lines.append(f"{self.name[seat]}: raises {_fmt(street_bets[seat] - current_bet)} to {_fmt(street_bets[seat])}{tail}")
+
+    def _return_uncalled(self):
+        live = self._live()
+        ranked = sorted(live, key=lambda s: self.invested[s], reverse=True)
+        if not ranked:
+            return
+        top = ranked[0]
+        second = max([self.invested[s] for s in self.seats if s != top], default=0)
+        excess = self.invested[top] - second
+        if excess > 0:
+            self.invested[top] -= excess
+            self.stack[top] += excess
+            self.lines.append(f"Uncalled bet ({_fmt(excess)}) returned to {self.name[top]}")
+
+    # --- 主流程 ---
+    def run(self):
+        rng = self.rng
+        t = self.table
+        deck = DECK[:]
+        rng.shuffle(deck)
+        self.lines.append(
+            f"Poker Hand #TM{self.hand_id}: Tournament #{self.tournament_id}, $25 GGMasters Hold'em No Limit - "
+            f"Level{BLIND_LEVELS.index((self.sb, self.bb, self.ante)) + 1}({_fmt(self.sb)}/{_fmt(self.bb)}) - "
+            f"{self.when:%Y/%m/%d %H:%M:%S}"
+        )
+        button = t.button if t.button in self.seats else self.seats[0]
+        self.lines.append(f"Table '{t.table_no}' {t.max_seats}-max Seat #{button} is the button")
+        for s in self.seats:
+            self.lines.append(f"Seat {s}: {self.name[s]} ({_fmt(self.stack[s])} in chips)")
+        sb_seat = self._next_seat(button)
+        bb_seat = self._next_seat(sb_seat)
+        for s in rng.sample(self.seats, len(self.seats)):
+            self.lines.append(f"{self.name[s]}: posts the ante {_fmt(self._put(s, self.ante))}")
+        street_bets = {}
+        street_bets[sb_seat] = self._put(sb_seat, self.sb)
+        self.lines.append(f"{self.name[sb_seat]}: posts small blind {_fmt(street_bets[sb_seat])}")
+        street_bets[bb_seat] = self._put(bb_seat, self.bb)
+        self.lines.append(f"{self.name[bb_seat]}: posts big blind {_fmt(street_bets[bb_seat])}")
+        self.lines.append("*** HOLE CARDS ***")
+        hole = {s: (deck.pop(), deck.pop()) for s in self.seats}
+        for s in self._order_from(self._next_seat(button)):
+            cards = f" [{hole[s][0]} {hole[s][1]}]" if self.name[s] == HERO else " "
+            self.lines.append(f"Dealt to {self.name[s]}{cards}")
+
+        self._street = "before Flop"
+        self._betting_round(self._order_from(self._next_seat(bb_seat)), street_bets, self.bb, aggressive=0.12, fold_base=0.68)
+        streets = (("FLOP", 3, "on the Flop"), ("TURN", 1, "on the Turn"), ("RIVER", 1, "on the River"))
+        for label, count, fold_tag in streets:
+            self._return_uncalled()
+            live = self._live()
+            if len(live) < 2:
+                break
+            if sum(1 for s in live if self.stack[s] > 0) < 2 and not self.shown:
+                for s in live:
+                    self.shown[s] = hole[s]
+                    self.lines.append(f"{self.name[s]}: shows [{hole[s][0]} {hole[s][1]}]")
+            prev = list(self.board)
+            self.board.extend(deck.pop() for _ in range(count))
+            if label == "FLOP":
+                self.lines.append(f"*** FLOP *** [{' '.join(self.board)}]")
+            else:
+                self.lines.append(f"*** {label} *** [{' '.join(prev)}] [{self.board[-1]}]")
+            self._street = fold_tag
+            if not self.shown:
+                self._betting_round(self._order_from(sb_seat), {}, 0, aggressive=0.18, fold_base=0.4)
+        self._return_uncalled()
+
+        live = self._live()
+        if len(live) > 1:
+            for s in live:
+                if s not in self.shown:
+                    self.shown[s] = hole[s]
+                    self.lines.append(f"{self.name[s]}: shows [{hole[s][0]} {hole[s][1]}]")
+        pot = sum(self.invested.values())
+        winner = rng.choice(live)
+        self.lines.append("*** SHOWDOWN ***")
+        self.lines.append(f"{self.name[winner]} collected {_fmt(pot)} from pot")
+        self.stack[winner] += pot
+        self.lines.append("*** SUMMARY ***")
+        self.lines.append(f"Total pot {_fmt(pot)} | Rake 0 | Jackpot 0 | Bingo 0 | Fortune 0 | Tax 0")
+        if self.board:
+            self.lines.append(f"Board [{' '.join(self.board)}]")
+        roles = {button: " (button)", sb_seat: " (small blind)", bb_seat: " (big blind)"}
+        for s in self.seats:
+            head = f"Seat {s}: {self.name[s]}{roles.get(s, '')}"
+            if s in self.folded:
+                self.lines.append(f"{head} folded {self.folded[s]}")
+            elif s in self.shown:
+                cards = f"[{self.shown[s][0]} {self.shown[s][1]}]"
+                outcome = f"and won ({_fmt(pot)})" if s == winner else "and lost"
+                self.lines.append(f"{head} showed {cards} {outcome}")
+            else:
+                self.lines.append(f"{head} collected ({_fmt(pot)})")
+
+        for s in self.seats:
+            t.stacks[s] = self.stack[s]
+        t.button = self._next_seat(button)
+        return "\n".join(self.lines)
+
+
+def generate_hands(n, seed=0, tables=4):
+    """
+    依序產出 n 手牌的文字（新的手牌在前，與 GG 匯出檔一致）。
+    tables 張牌桌輪流發牌；每 LEVEL_HANDS 手升一級盲注。
+    """
+    rng = random.Random(seed)
+    tournament_id = 258000000 + rng.randint(0, 999999)
+    table_list = [_Table(rng, table_no=rng.randint(100, 999)) for _ in range(tables)]
+    first_id = 5500000000 + n
+    start = datetime(2026, 2, 1, 20, 0, 0) + timedelta(seconds=25 * n)
+    for i in range(n):
+        level = BLIND_LEVELS[min(i // LEVEL_HANDS, len(BLIND_LEVELS) - 1)]
+        table = table_list[i % tables]
+        table.refill(level[1])
+        hero_present = rng.random() >= MISSING_HERO_RATE
+        sim = _HandSim(rng, table, level, first_id - i, tournament_id, start - timedelta(seconds=25 * i), hero_present)
+        yield sim.run()
+
+
+def generate_text(n, seed=0, tables=4):
+    """整份牌譜字串（手牌間空兩行）。"""
+    return "\n\n\n".join(generate_hands(n, seed, tables)) + "\n"
+
+
+def write_hands(path, n, seed=0, tables=4):
+    """串流寫檔，不在記憶體保留整份內容。"""
+    with open(path, "w", encoding="utf-8") as f:
+        for i, text in enumerate(generate_hands(n, seed, tables)):
+            if i:
+                f.write("\n\n\n")
+            f.write(text)
+        f.write("\n")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("n", type=int, help="手牌數")
+    ap.add_argument("-o", "--output", required=True, help="輸出檔路徑")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--tables", type=int, default=4)
+    args = ap.parse_args()
+    write_hands(args.output, args.n, args.seed, args.tables)
+
+
+if __name__ == "__main__":
+    main()
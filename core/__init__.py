@@ -3,25 +3,84 @@ from .parser import (
     load_content,
     cards_to_emoji,
     parse_hands,
+    iter_hands,
     render_hand_history_timeline,
 )
-from .coach import generate_match_summary, analyze_specific_hand, chat_with_coach
-from .history import get_api_key, set_api_key, get_use_demo, set_use_demo, ensure_session_defaults
+from .hand import Hand
+from .table import HandTable
+from .cache import load_hand_table, build_hand_table
+from .coach import (
+    generate_match_summary,
+    analyze_specific_hand,
+    analyze_hands_concurrently,
+    chat_with_coach,
+    stream_hand_analysis,
+    stream_chat_with_coach,
+)
+from .evaluator import evaluate, evaluate_batch, hand_category, best_hand_value, showdown_winners
+from .allin_ev import allin_ev, allin_results, allin_summary, bad_beat_mask
+from .equity import equity_vs_range, parse_range
+from .preflop import class_index, load_preflop_matrix, preflop_equity, preflop_equity_vs_range
+from .pushfold import nash_call, nash_push, pushfold_review, pushfold_summary
+from .async_coach import AsyncCoach, AsyncRateLimiter
+from .history import (
+    get_api_key,
+    set_api_key,
+    get_use_demo,
+    set_use_demo,
+    ensure_session_defaults,
+    get_prefetch_queue,
+    get_chat_memory,
+)
+from .metrics import get_metrics, start_metrics_server
 from .profiler import get_user_profile, update_user_profile
 
 __all__ = [
+    "Hand",
+    "HandTable",
+    "load_hand_table",
+    "build_hand_table",
     "load_content",
     "cards_to_emoji",
     "parse_hands",
+    "iter_hands",
     "render_hand_history_timeline",
     "generate_match_summary",
     "analyze_specific_hand",
+    "analyze_hands_concurrently",
     "chat_with_coach",
+    "stream_hand_analysis",
+    "stream_chat_with_coach",
+    "evaluate",
+    "evaluate_batch",
+    "hand_category",
+    "best_hand_value",
+    "showdown_winners",
+    "allin_ev",
+    "allin_results",
+    "allin_summary",
+    "bad_beat_mask",
+    "equity_vs_range",
+    "parse_range",
+    "class_index",
+    "load_preflop_matrix",
+    "preflop_equity",
+    "preflop_equity_vs_range",
+    "nash_call",
+    "nash_push",
+    "pushfold_review",
+    "pushfold_summary",
+    "AsyncCoach",
+    "AsyncRateLimiter",
     "get_api_key",
     "set_api_key",
     "get_use_demo",
     "set_use_demo",
     "ensure_session_defaults",
+    "get_prefetch_queue",
+    "get_chat_memory",
+    "get_metrics",
+    "start_metrics_server",
     "get_user_profile",
     "update_user_profile",
 ]
@@ -0,0 +1,370 @@
+"""
+[全下 EV] 找出 Hero 全下且所有存活玩家都亮牌的手牌，以全下當下的完整列舉算出 Hero 的精確勝率與期望籌碼。
+- 全下時機 = 最後一個行動發生時的公牌（翻前 / 翻牌 / 轉牌）；河牌才全下或有人未亮牌的手牌不算
+- 底池依存活玩家的投入分層（主池 / 邊池），每一層只在有資格的玩家之間分配，平手均分；棄牌者的投入算死錢
+- 期望 = Σ 各層底池 × Hero 在該層的期望分得比例；運氣 = 實際拿回 − 期望拿回
+- 翻牌、轉牌全下直接列舉剩餘公牌（≤ C(48,2) 種）；翻前不列舉 C(48,5) 種公牌，改列舉 6,188 種公牌點數組合
+  （每種乘上實際張數的組合數），再對「某花色夠多、可能成同花」的公牌逐一修正，結果與逐一列舉完全相同
+- 勝率以花色正規化後的 (手牌, 公牌, 底池分層) 記憶，同樣的對戰只算一次
+牌力評估見 core.evaluator。
+"""
+import re
+import threading
+import weakref
+from functools import lru_cache
+from itertools import combinations, combinations_with_replacement
+from math import comb
+
+import numpy as np
+
+from .compact import _amount
+from .evaluator import card_index, card_str, evaluate, evaluate_batch, evaluate_ranks_batch, flush_values
+
+# 視為「領先時被逆轉」的全下勝率門檻：這類輸掉的底池是運氣，不列入關鍵失誤
+BAD_BEAT_EQUITY = 0.5
+ALLIN_CACHE_SIZE = 4096
+
+_DEALT_RE = re.compile(r"^Dealt to (\S+) \[([^\]]+)\]")
+_STREET_RE = re.compile(r"^\*\*\* ([A-Z ]+) \*\*\*(.*)$")
+_ACTION_RE = re.compile(
+    r"^(\S+): (folds|checks|calls ([\d,]+)|bets ([\d,]+)|raises [\d,]+ to ([\d,]+)"
+    r"|posts (?:small blind|big blind|straddle) ([\d,]+)|posts the ante ([\d,]+)|shows \[([^\]]+)\])"
+)
+_UNCALLED_RE = re.compile(r"^Uncalled bet \(([\d,]+)\) returned to (\S+)")
+_COLLECTED_RE = re.compile(r"^(\S+) collected ([\d,]+) from")
+_STREET_LABELS = {0: "Preflop", 3: "Flop", 4: "Turn"}
+
+# _SMALL_BINOM[n][k] = C(n, k)，n = 某點數剩下的張數（0～4）
+_SMALL_BINOM = np.array([[comb(n, k) for k in range(6)] for n in range(5)], dtype=np.int64)
+
+
+def _rank_multiset_table(k):
+    """取 k 張時所有的點數組合 (C(12 + k, k), k)，以及每種組合各點數的張數 (C(12 + k, k), 13)。"""
+    ranks = np.array(list(combinations_with_replacement(range(13), k)), dtype=np.int64).reshape(comb(12 + k, k), k)
+    return ranks, np.stack([(ranks == r).sum(axis=1) for r in range(13)], axis=1)
+
+
+# 翻前列舉用：k = 0～5
+_RANK_MULTISETS = {k: _rank_multiset_table(k) for k in range(6)}
+_results_cache = weakref.WeakKeyDictionary()
+_results_lock = threading.Lock()
+
+
+def parse_allin(content, hero):
+    """
+    從原始手牌文字找出可計算的全下局面；不符合條件時回傳 None。
+    回傳 dict：players（Hero 在第一個的 [(名稱, 兩張牌整數)]）、board（全下時的公牌整數 list）、
+    pots（[(金額, 有資格的玩家索引 tuple)]）、invested（Hero 總投入）、collected（Hero 實際拿回）。
+    """
+    contrib = {}
+    street_put = {}
+    folded = set()
+    shown = {}
+    all_in = False
+    board = []
+    action_board = 0
+    collected = 0
+    hero_cards = None
+    for raw in content.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        marker = _STREET_RE.match(line)
+        if marker:
+            name = marker.group(1)
+            if name == "SUMMARY":
+                break
+            if "FIRST" in name or "SECOND" in name:
+                # 發兩次（run it twice）的底池分配與單次列舉不同，不計算
+                return None
+            if name in ("FLOP", "TURN", "RIVER"):
+                board = " ".join(re.findall(r"\[([^\]]+)\]", marker.group(2))).split()
+                street_put = {}
+            continue
+        m = _ACTION_RE.match(line)
+        if m:
+            name, verb = m.group(1), m.group(2)
+            if m.group(8) is not None:
+                shown[name] = m.group(8)
+                continue
+            if m.group(7):
+                contrib[name] = contrib.get(name, 0) + _amount(m.group(7))
+                continue
+            paid = 0
+            if m.group(6):
+                paid = _amount(m.group(6))
+                street_put[name] = street_put.get(name, 0) + paid
+            else:
+                action_board = len(board)
+                if verb == "folds":
+                    folded.add(name)
+                    contrib.setdefault(name, 0)
+                elif m.group(3) or m.group(4):
+                    paid = _amount(m.group(3) or m.group(4))
+                    street_put[name] = street_put.get(name, 0) + paid
+                elif m.group(5):
+                    total = _amount(m.group(5))
+                    paid = total - street_put.get(name, 0)
+                    street_put[name] = total
+            contrib[name] = contrib.get(name, 0) + paid
+            all_in = all_in or line.endswith("and is all-in")
+            continue
+        m = _DEALT_RE.match(line)
+        if m:
+            if m.group(1) == hero:
+                hero_cards = m.group(2)
+            continue
+        m = _UNCALLED_RE.match(line)
+        if m:
+            contrib[m.group(2)] = contrib.get(m.group(2), 0) - _amount(m.group(1))
+            continue
+        m = _COLLECTED_RE.match(line)
+        if m and m.group(1) == hero:
+            collected += _amount(m.group(2))
+
+    live = [name for name in contrib if name not in folded]
+    if not all_in or action_board >= 5 or hero not in live or len(live) < 2:
+        return None
+    shown.setdefault(hero, hero_cards)
+    if any(not shown.get(name) for name in live):
+        return None
+    order = [hero] + [name for name in live if name != hero]
+    try:
+        players = [(name, tuple(card_index(c) for c in shown[name].split())) for name in order]
+        board_cards = [card_index(c) for c in board[:action_board]]
+    except ValueError:
+        return None
+    if any(len(cards) != 2 for _, cards in players):
+        return None
+    return {
+        "players": players,
+        "board": board_cards,
+        "pots": pot_layers(contrib, order),
+        "invested": contrib[hero],
+        "collected": collected,
+    }
+
+
+def pot_layers(contrib, live):
+    """
+    各玩家投入（含棄牌者）→ [(金額, 有資格的玩家索引 tuple)]，索引對應 live 的順序。
+    依存活玩家的投入由小到大分層；超出所有存活玩家投入的部分（理論上不會發生）併入最後一層。
+    """
+    pots = []
+    prev = 0
+    for level in sorted({contrib[name] for name in live}):
+        amount = sum(min(c, level) - min(c, prev) for c in contrib.values())
+        eligible = tuple(i for i, name in enumerate(live) if contrib[name] >= level)
+        if amount > 0:
+            pots.append((amount, eligible))
+        prev = level
+    extra = sum(max(c - prev, 0) for c in contrib.values())
+    if extra and pots:
+        pots[-1] = (pots[-1][0] + extra, pots[-1][1])
+    return pots
+
+
+def _canonical_suits(players, board):
+    """依花色第一次出現的順序重新編號，讓只差在花色名稱的局面共用同一筆記憶。"""
+    mapping = {}
+    for c in [c for _, cards in players for c in cards] + list(board):
+        mapping.setdefault(c & 3, len(mapping))
+    for s in range(4):
+        mapping.setdefault(s, len(mapping))
+
+    def relabel(cards):
+        return tuple(c & ~3 | mapping[c & 3] for c in cards)
+
+    return tuple(relabel(cards) for _, cards in players), relabel(board)
+
+
+def _combo_array(cards, k):
+    """cards 取 k 張的所有組合 → (C(n, k), k) 陣列（k = 0 時為一列空組合）。"""
+    return np.array(list(combinations(cards, k)), dtype=np.int64).reshape(comb(len(cards), k), k)
+
+
+def _runouts(hands, board):
+    """
+    所有可能的剩餘公牌 → (values (玩家數, 列數) 牌力, weights (列數,) 權重)。
+    期望值 = Σ weights × 結果 / Σ weights；翻前的修正列權重可能為負。
+    """
+    known = {c for cards in hands for c in cards} | set(board)
+    deck = [c for c in range(52) if c not in known]
+    missing = 5 - len(board)
+    if missing == 0:
+        values = np.array([[evaluate(list(cards) + list(board))] for cards in hands], dtype=np.int64)
+        return values, np.ones(1)
+    if board:
+        extra = _combo_array(deck, missing)
+        boards = np.concatenate([np.broadcast_to(board, (len(extra), len(board))), extra], axis=1)
+        values = np.stack([
+            evaluate_batch(np.concatenate([np.broadcast_to(cards, (len(boards), 2)), boards], axis=1))
+            for cards in hands
+        ]).astype(np.int64)
+        return values, np.ones(len(boards))
+    return _preflop_runouts(hands, deck)
+
+
+def _rank_multisets(available, k):
+    """
+    從各點數剩餘 available[r] 張中取 k 張，忽略花色 → (點數組合 (M, k), 權重 (M,))；
+    權重 = Π C(available[r], 使用張數)，只保留權重 > 0 的組合。
+    """
+    ranks, counts = _RANK_MULTISETS[k]
+    weights = np.prod(_SMALL_BINOM[available, counts], axis=1)
+    keep = weights > 0
+    return ranks[keep], weights[keep]
+
+
+def _hole_rank_values(hole_ranks, ranks):
+    """每位玩家的兩張點數 + 公牌點數組合 → (玩家數, M) 的不看花色牌力。"""
+    return np.stack([
+        evaluate_ranks_batch(np.concatenate([np.broadcast_to(hr, (len(ranks), 2)), ranks], axis=1))
+        for hr in hole_ranks
+    ]).astype(np.int64)
+
+
+def _preflop_runouts(hands, deck):
+    """
+    翻前：先忽略花色，列舉公牌的點數組合（權重 = 該點數組合對應的實際公牌數）；
+    再對每個花色 s，列舉「s 花色至少 t 張」的公牌（t = 5 − 各玩家手上 s 花色張數的最大值，恆 ≥ 3，
+    因此不同花色的修正列互不重疊），以負權重扣掉點數值、正權重加回真實牌力。
+    修正列中 s 花色的牌逐張列舉，其餘 ≤ 2 張只依點數組合列舉；只保留有人因同花而變強的列。
+    """
+    hole_ranks = np.array([[c >> 2 for c in cards] for cards in hands], dtype=np.int64)
+    ranks, weights = _rank_multisets(np.bincount(np.array(deck) >> 2, minlength=13), 5)
+    values = [_hole_rank_values(hole_ranks, ranks)]
+    weight_parts = [weights.astype(np.float64)]
+
+    for suit in range(4):
+        hole_masks = [sum(1 << (c >> 2) for c in cards if c & 3 == suit) for cards in hands]
+        need = 5 - max(mask.bit_count() for mask in hole_masks)
+        suited = [c for c in deck if c & 3 == suit]
+        other_available = np.bincount(np.array([c >> 2 for c in deck if c & 3 != suit], dtype=np.int64), minlength=13)
+        for k in range(need, min(5, len(suited)) + 1):
+            suited_ranks = _combo_array(suited, k) >> 2
+            other_ranks, other_weights = _rank_multisets(other_available, 5 - k)
+            board_ranks = np.concatenate([
+                np.repeat(suited_ranks, len(other_ranks), axis=0),
+                np.tile(other_ranks, (len(suited_ranks), 1)),
+            ], axis=1)
+            board_mask = np.repeat(np.left_shift(1, suited_ranks).sum(axis=1), len(other_ranks))
+            row_weights = np.tile(other_weights, len(suited_ranks)).astype(np.float64)
+            rank_only = _hole_rank_values(hole_ranks, board_ranks)
+            flushes = np.stack([flush_values(board_mask | hm) for hm in hole_masks]).astype(np.int64)
+            changed = (flushes > rank_only).any(axis=0)
+            if not changed.any():
+                continue
+            rank_only = rank_only[:, changed]
+            values += [rank_only, np.maximum(rank_only, flushes[:, changed])]
+            weight_parts += [-row_weights[changed], row_weights[changed]]
+    return np.concatenate(values, axis=1), np.concatenate(weight_parts)
+
+
+@lru_cache(maxsize=ALLIN_CACHE_SIZE)
+def _pot_shares(hands, board, eligibles):
+    """花色正規化後的局面 → 每一層底池中各玩家的期望分得比例（tuple of tuple）。"""
+    values, weights = _runouts(hands, board)
+    total = weights.sum()
+    shares = []
+    for eligible in eligibles:
+        idx = list(eligible)
+        sub = values[idx]
+        winners = sub == sub.max(axis=0)
+        split = winners / winners.sum(axis=0)
+        per_player = dict(zip(idx, (split @ weights / total).tolist()))
+        shares.append(tuple(per_player.get(i, 0.0) for i in range(len(hands))))
+    return tuple(shares)
+
+
+def allin_equity(players, board, pots):
+    """
+    parse_allin 的 players / board / pots → (Hero 總勝率, Hero 期望拿回的籌碼)。
+    總勝率 = Hero 期望拿回 / Hero 有資格爭奪的底池合計。
+    """
+    hands, canon_board = _canonical_suits(players, board)
+    shares = _pot_shares(hands, canon_board, tuple(eligible for _, eligible in pots))
+    ev_won = sum(amount * share[0] for (amount, _), share in zip(pots, shares))
+    contested = sum(amount for amount, eligible in pots if 0 in eligible)
+    return (ev_won / contested if contested else 0.0), ev_won
+
+
+def allin_ev(content, hero, bb_size=0):
+    """單手全下 EV；不符合條件時回傳 None。金額單位為籌碼，*_bb 欄位換算成大盲（bb_size 為 0 時不換算）。"""
+    spot = parse_allin(content, hero)
+    if spot is None:
+        return None
+    equity, ev_won = allin_equity(spot["players"], spot["board"], spot["pots"])
+    ev_net = ev_won - spot["invested"]
+    actual_net = spot["collected"] - spot["invested"]
+    unit = bb_size or 1
+    return {
+        "street": _STREET_LABELS.get(len(spot["board"]), "Preflop"),
+        "hero_cards": " ".join(card_str(c) for c in spot["players"][0][1]),
+        "villains": ", ".join(f"{name} [{' '.join(card_str(c) for c in cards)}]" for name, cards in spot["players"][1:]),
+        "board": " ".join(card_str(c) for c in spot["board"]),
+        "equity": equity,
+        "pot": sum(amount for amount, _ in spot["pots"]),
+        "invested": spot["invested"],
+        "ev_net": ev_net,
+        "actual_net": actual_net,
+        "luck": actual_net - ev_net,
+        "ev_net_bb": ev_net / unit,
+        "actual_net_bb": actual_net / unit,
+        "luck_bb": (actual_net - ev_net) / unit,
+    }
+
+
+def allin_results(table):
+    """
+    整份牌譜的全下 EV：回傳 [dict]，每手在 allin_ev 的欄位外加 row（列索引）、id、display_index。
+    先以文字遮罩篩出有全下且有亮牌的手牌；結果依 HandTable 物件快取。
+    """
+    with _results_lock:
+        cached = _results_cache.get(table)
+    if cached is not None:
+        return cached
+    candidates = np.flatnonzero(table.text_contains("and is all-in") & table.text_contains(": shows ["))
+    heroes = table.labels("hero", candidates)
+    results = []
+    for row, hero in zip(candidates.tolist(), heroes):
+        try:
+            result = allin_ev(table.content(row), hero or "Hero", int(table.bb_size[row]))
+        except Exception:
+            result = None
+        if result is None:
+            continue
+        result["row"] = row
+        result["id"] = table.ids[row]
+        if table.display_index[row] != -1:
+            result["display_index"] = int(table.display_index[row])
+        results.append(result)
+    with _results_lock:
+        _results_cache[table] = results
+    return results
+
+
+def allin_summary(results):
+    """全部全下手牌的合計：手數、期望 / 實際淨籌碼、運氣（籌碼與大盲），以及依手牌順序的累計曲線。"""
+    ev = np.array([r["ev_net_bb"] for r in results], dtype=np.float64)
+    actual = np.array([r["actual_net_bb"] for r in results], dtype=np.float64)
+    return {
+        "hands": len(results),
+        "ev_net": sum(r["ev_net"] for r in results),
+        "actual_net": sum(r["actual_net"] for r in results),
+        "luck": sum(r["luck"] for r in results),
+        "ev_net_bb": float(ev.sum()),
+        "actual_net_bb": float(actual.sum()),
+        "luck_bb": float(actual.sum() - ev.sum()),
+        "cumulative_ev_bb": np.cumsum(ev),
+        "cumulative_actual_bb": np.cumsum(actual),
+    }
+
+
+def bad_beat_mask(table, min_equity=BAD_BEAT_EQUITY):
+    """Hero 全下時勝率 ≥ min_equity 卻少拿了籌碼的手牌（純運氣），給關鍵失誤偵測排除用。"""
+    mask = np.zeros(len(table), dtype=bool)
+    for r in allin_results(table):
+        if r["equity"] >= min_equity and r["luck"] < 0:
+            mask[r["row"]] = True
+    return mask
@@ -0,0 +1,241 @@
+"""
+[非同步教練] analyze_specific_hand / generate_match_summary / chat_with_coach 的 asyncio 版本，給批次覆盤工具使用。
+- 一個 AsyncCoach 共用一個 httpx.AsyncClient（keep-alive 連線池），數百個分析在單一執行緒內並行，不必每個請求一條執行緒
+- max_concurrency 限制同時進行的請求數，其餘協程排隊等待（back-pressure）；可再加 AsyncRateLimiter 限制每秒請求數
+- 逾時、重試、回應快取、脈絡快取與 metrics 的規則與同步版相同（core.http_client、core.coach）
+- prompt 一律由 core.coach 組出，同一手牌同步 / 非同步送出的內容完全一致，也共用回應快取
+需要 httpx（pip install httpx）；Streamlit app 本身不依賴本模組。
+
+    async with AsyncCoach(api_key, model, max_concurrency=32) as coach:
+        async for idx, analysis in coach.analyze_hands(hands):
+            ...
+"""
+import asyncio
+import contextlib
+import time
+
+try:
+    import httpx
+except ImportError:  # 只有批次工具需要
+    httpx = None
+
+from .chat_memory import ChatMemory
+from .coach import (
+    HAND_ANALYSIS_TEMPERATURE,
+    _chat_payload,
+    _chat_prompt_text,
+    _chat_request,
+    _chat_summary_prompt,
+    _hand_analysis_prefix,
+    _hand_analysis_prompt,
+    _http_error_text,
+    _match_summary_prompt,
+    _prompt_payload,
+)
+from .context_cache import get_cached_content, invalidate
+from .http_client import (
+    BACKOFF_MAX,
+    BATCH_BURST,
+    BATCH_RATE_PER_SEC,
+    CONNECT_TIMEOUT,
+    MAX_RETRIES,
+    READ_TIMEOUT,
+    RETRY_STATUS,
+    _retry_after,
+    backoff_delay,
+    gemini_url,
+)
+from .llm_cache import _response_cache, response_key
+from .metrics import start_call
+
+# 同時進行的請求上限（也是連線池大小）
+ASYNC_MAX_CONCURRENCY = 16
+
+
+class AsyncRateLimiter:
+    """RateLimiter 的協程版 token bucket：每秒補充 rate 個 token，最多累積 burst 個。"""
+
+    def __init__(self, rate=BATCH_RATE_PER_SEC, burst=BATCH_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncCoach:
+    """
+    綁定一組 (api_key, model) 的非同步教練 client。請以 async with 使用，或結束時 await aclose()。
+    失敗時與同步版一樣回傳「AI 連線失敗: …」字串，不拋例外，批次中單手失敗不影響其他手。
+    """
+
+    def __init__(self, api_key, model, max_concurrency=ASYNC_MAX_CONCURRENCY, rate_limiter=None,
+                 timeout=None, retries=MAX_RETRIES):
+        if httpx is None:
+            raise ImportError("AsyncCoach 需要 httpx：pip install httpx")
+        self.api_key = api_key
+        self.model = model
+        self.retries = retries
+        self._limiter = rate_limiter
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._context_lock = asyncio.Lock()
+        connect, read = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read, connect=connect),
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+            headers={"Content-Type": "application/json"},
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    # --- 與 core.coach 對應的公開 API ---
+    async def analyze_specific_hand(self, hand_data):
+        # 事實清單含蒙地卡羅勝率（最多約 20 萬次模擬），放到執行緒組 prompt，不卡住事件迴圈
+        prompt = await asyncio.to_thread(_hand_analysis_prompt, hand_data)
+        return await self.call(
+            prompt,
+            temperature=HAND_ANALYSIS_TEMPERATURE, use_cache=True, static_prefix=_hand_analysis_prefix(),
+        )
+
+    async def generate_match_summary(self, hands_data, vpip, pfr):
+        return await self.call(_match_summary_prompt(hands_data, vpip, pfr), temperature=0.1, use_cache=True)
+
+    async def chat_with_coach(self, history, user_input, hand_context):
+        """history 可為 ChatMemory（需要時先以協程產生滾動摘要）或訊息 list，不含本輪輸入。"""
+        memory = history if isinstance(history, ChatMemory) else ChatMemory(history)
+        start, transcript = memory.pending()
+        if transcript:
+            summary = await self.call(_chat_summary_prompt(memory.summary, transcript), temperature=0.1, use_cache=True)
+            memory.fold(start, None if summary.startswith("AI 連線失敗") else summary)
+        # 摘要已在上面處理；失敗時這次只略過舊訊息，不再同步重試
+        contents, system_instruction = _chat_request(
+            memory, user_input, hand_context, summarize=lambda prev, transcript: None
+        )
+        payload = _chat_payload(contents, system_instruction, temperature=0.2)
+        async with self._slot():
+            # 取得名額後才開始計時，排隊時間不算進延遲
+            call = start_call("chat", self.model, _chat_prompt_text(contents, system_instruction))
+            try:
+                resp = await self._post_json(gemini_url(self.model, self.api_key), payload)
+            except Exception as e:
+                call.fail(e)
+                return f"AI 連線失敗: {str(e)}"
+        return self._finish(call, resp)
+
+    async def analyze_hands(self, hands):
+        """並行分析多手牌，依完成順序 yield (索引, 分析文字)；中途停止迭代時取消尚未完成的請求。"""
+        async def run(idx, hand):
+            return idx, await self.analyze_specific_hand(hand)
+
+        tasks = [asyncio.ensure_future(run(i, hand)) for i, hand in enumerate(hands)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def call(self, prompt, temperature=0.1, use_cache=False, static_prefix=None):
+        """call_llm_api 的協程版。"""
+        key = response_key(self.model, temperature, prompt) if use_cache else None
+        if key is not None:
+            cached = _response_cache.get(key)
+            if cached is not None:
+                start_call("generate", self.model, prompt).finish(cached, cache_hit=True)
+                return cached
+        async with self._slot():
+            call = start_call("generate", self.model, prompt)
+            try:
+                resp = await self._post_prompt(prompt, temperature, static_prefix)
+            except Exception as e:
+                call.fail(e)
+                return f"AI 連線失敗: {str(e)}"
+        text = self._finish(call, resp)
+        if key is not None and call.error is None:
+            _response_cache.put(key, self.model, text)
+        return text
+
+    # --- 內部 ---
+    @contextlib.asynccontextmanager
+    async def _slot(self):
+        """取得一個並行名額；有速率上限時再等一個 token。"""
+        async with self._semaphore:
+            if self._limiter is not None:
+                await self._limiter.acquire()
+            yield
+
+    @staticmethod
+    def _finish(call, resp):
+        """解析 generateContent 回應並結束 metrics 紀錄，回傳文字或錯誤訊息。"""
+        call.response(resp)
+        if not resp.is_success:
+            call.finish(error=f"HTTP {resp.status_code}")
+            return f"AI 連線失敗: {_http_error_text(resp)}"
+        try:
+            data = resp.json()
+            call.usage(data.get("usageMetadata"))
+            if not data.get("candidates"):
+                call.finish(error="empty")
+                return "AI 未回傳內容，請再試一次。"
+            text = data["candidates"][0]["content"]["parts"][0]["text"]
+        except Exception as e:
+            call.fail(e)
+            return f"AI 連線失敗: {str(e)}"
+        call.finish(text)
+        return text
+
+    async def _post_prompt(self, prompt, temperature, static_prefix=None):
+        """同 core.coach._post_prompt：可用脈絡快取時只送 prompt 的後段，被拒絕時改送完整 prompt。"""
+        url = gemini_url(self.model, self.api_key)
+        if static_prefix and prompt.startswith(static_prefix):
+            # 建立 cachedContent 走同步 client，只在第一次（或過期）時發生；get_cached_content 本身對同一份前段
+            # single-flight（也涵蓋同步的背景執行緒），這裡再以鎖排隊，避免一批協程各佔一條等待中的執行緒
+            async with self._context_lock:
+                cached_content = await asyncio.to_thread(get_cached_content, self.api_key, self.model, static_prefix)
+            if cached_content:
+                payload = _prompt_payload(prompt[len(static_prefix):], temperature, cached_content)
+                resp = await self._post_json(url, payload)
+                if resp.status_code not in (400, 403, 404):
+                    resp.context_cache = "hit"
+                    return resp
+                invalidate(self.api_key, self.model, static_prefix)
+                resp = await self._post_json(url, _prompt_payload(prompt, temperature))
+                resp.context_cache = "expired"
+                return resp
+        return await self._post_json(url, _prompt_payload(prompt, temperature))
+
+    async def _post_json(self, url, payload):
+        """同 core.http_client.post_json 的重試規則；回傳的 Response 帶有 retry_count。"""
+        for attempt in range(self.retries + 1):
+            try:
+                resp = await self._client.post(url, json=payload)
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                # 讀取逾時代表伺服器已在處理，不重送
+                if attempt == self.retries:
+                    e.retry_count = attempt
+                    raise
+                await asyncio.sleep(backoff_delay(attempt))
+                continue
+            if resp.status_code not in RETRY_STATUS or attempt == self.retries:
+                resp.retry_count = attempt
+                return resp
+            wait = _retry_after(resp)
+            await resp.aclose()
+            await asyncio.sleep(min(wait, BACKOFF_MAX) if wait is not None else backoff_delay(attempt))
+        return resp
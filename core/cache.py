@@ -0,0 +1,204 @@
+"""
+[快取] 解析結果的程序內快取，讓 Streamlit 每次 rerun（篩選、點選、聊天）不必重新解析。
+- 以上傳內容的 BLAKE2b 雜湊為 key，同一份檔案不論哪個使用者上傳都共用同一張 HandTable
+- LRU + 容量上限（依 HandTable.nbytes 計），超過時從最久未用的開始淘汰
+- pin=True 的項目（如 Demo 牌譜）常駐，不參與淘汰
+- 記憶體沒命中時再查 data/parse_cache/ 的磁碟快取，重啟伺服器或重複上傳同一份檔案都不必重新解析；
+  磁碟快取總量超過 PARSE_CACHE_DISK_MAX_BYTES 時依 mtime 淘汰最久未用的檔案（命中時更新 mtime）
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from . import hand, parser, table
+from .parser import parse_hands
+from .table import HandTable
+
+# 所有使用者共用的解析快取容量上限
+PARSE_CACHE_MAX_BYTES = 256 << 20
+# 磁碟快取目錄：每個解析器版本一個子目錄
+DISK_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "parse_cache"
+# 磁碟快取（目前版本目錄）的容量上限
+PARSE_CACHE_DISK_MAX_BYTES = 1 << 30
+
+
+def _parser_version():
+    """解析邏輯版本戳：parser / hand / table 任一原始碼變動，舊的磁碟快取即失效。"""
+    h = hashlib.blake2b(digest_size=8)
+    for module in (parser, hand, table):
+        h.update(Path(module.__file__).read_bytes())
+    return h.hexdigest()
+
+
+PARSER_VERSION = _parser_version()
+
+
+def content_key(content):
+    """內容雜湊：content 為 str、bytes，或有 getbuffer() 的上傳檔案物件（不複製整份資料）。"""
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(content, str):
+        h.update(content.encode("utf-8"))
+    elif isinstance(content, (bytes, bytearray, memoryview)):
+        h.update(content)
+    else:
+        with content.getbuffer() as buf:
+            h.update(buf)
+    return h.hexdigest()
+
+
+class ParseCache:
+    """執行緒安全、以位元組數為上限的 LRU。"""
+
+    def __init__(self, max_bytes=PARSE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._pinned = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._pinned:
+                self.hits += 1
+                return self._pinned[key]
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, nbytes, pin=False):
+        with self._lock:
+            if pin:
+                self._pinned[key] = value
+                return
+            if nbytes > self.max_bytes:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pinned.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+
+_parse_cache = ParseCache()
+
+
+def build_hand_table(content):
+    """
+    解析整份牌譜並轉成 HandTable：反轉為時間正序（最舊→最新），
+    並為每手牌加上 display_index（與 UI 一致）。回傳 (table, hero 名稱)。
+    """
+    if not isinstance(content, str):
+        content.seek(0)
+    hands, hero_name = parse_hands(content)
+    hands.reverse()
+    for idx, h in enumerate(hands, start=1):
+        h["display_index"] = idx
+    return HandTable(hands), hero_name
+
+
+def _disk_path(key):
+    return DISK_CACHE_DIR / PARSER_VERSION / f"{key}.npz"
+
+
+def _load_from_disk(key):
+    path = _disk_path(key)
+    if not path.exists():
+        return None
+    try:
+        hand_table = HandTable.load(path)
+    except Exception:
+        return None
+    try:
+        # 以 mtime 當最近使用時間，淘汰時保留常被讀取的檔案
+        os.utime(path)
+    except OSError:
+        pass
+    # build_hand_table 已把手牌反轉，檔案中的第一手（parse_hands 取 hero 的那手）在最後一列
+    hero_name = hand_table.categories("hero")[hand_table.hero[-1]] if len(hand_table) else None
+    return hand_table, hero_name
+
+
+def _evict_disk(directory, keep=None, max_bytes=None):
+    """目錄內 .npz 總量超過上限時，從 mtime 最舊的開始刪（剛寫入的 keep 除外）；其他程序已刪掉的檔案略過。"""
+    max_bytes = PARSE_CACHE_DISK_MAX_BYTES if max_bytes is None else max_bytes
+    files = []
+    for f in directory.glob("*.npz"):
+        try:
+            st = f.stat()
+        except OSError:
+            continue
+        files.append((st.st_mtime, st.st_size, f))
+    total = sum(size for _, size, _ in files)
+    for _, size, f in sorted(files, key=lambda item: item[0]):
+        if total <= max_bytes:
+            break
+        if f == keep:
+            continue
+        try:
+            f.unlink()
+        except OSError:
+            continue
+        total -= size
+
+
+def _save_to_disk(key, hand_table):
+    """先寫暫存檔再 rename，避免其他程序讀到寫一半的檔案；寫入失敗時刪掉暫存檔。同時清掉舊版本的快取目錄。"""
+    path = _disk_path(key)
+    tmp = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            hand_table.save(f)
+        os.replace(tmp, path)
+        tmp = None
+        for old in DISK_CACHE_DIR.iterdir():
+            if old.is_dir() and old.name != PARSER_VERSION:
+                shutil.rmtree(old, ignore_errors=True)
+        _evict_disk(path.parent, keep=path)
+    except Exception:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+
+def load_hand_table(content, pin=False):
+    """
+    build_hand_table 的快取版：記憶體 → 磁碟 → 重新解析，相同內容只解析一次。
+    pin=True 時常駐於程序內（仍會寫入磁碟）。
+    """
+    key = content_key(content)
+    cached = _parse_cache.get(key)
+    if cached is not None:
+        return cached
+    result = _load_from_disk(key)
+    if result is None:
+        result = build_hand_table(content)
+        _save_to_disk(key, result[0])
+    _parse_cache.put(key, result, result[0].nbytes, pin=pin)
+    return result
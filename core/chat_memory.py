@@ -0,0 +1,97 @@
+"""
+[對話記憶] 每一手鎖定的手牌各自一份對話紀錄，送給 LLM 時只帶「滾動摘要 + 最近幾輪原文」。
+- 最近 CHAT_WINDOW_TURNS 輪（一輪 = 使用者一則 + 教練一則）逐字保留，更早的對話每累積幾輪就摺進摘要
+- 摘要在真正需要時才產生（window() 被呼叫且有新的舊訊息要摺入），結果記在 ChatMemory 上重複使用
+- 摘要失敗時這次先略過舊訊息、不推進摘要進度，下一輪再試
+- 逐字保留的部分另有 token 上限；超過時少保留幾則，多出來的一樣摺進摘要
+不碰 Streamlit API；存放在 session 的部分見 core.history.get_chat_memory。
+"""
+from .compact import estimate_tokens, truncate_to_tokens
+
+# 逐字保留最近幾輪
+CHAT_WINDOW_TURNS = 4
+# 舊訊息累積到多出幾輪才摺進摘要一次
+CHAT_SUMMARY_BATCH_TURNS = 2
+# 逐字保留的訊息合計 token 上限（不含手牌脈絡、摘要與本輪輸入）
+CHAT_HISTORY_TOKEN_BUDGET = 3000
+# 單則訊息放進摘要請求前的上限，避免一則超長回覆撐爆摘要 prompt
+CHAT_SUMMARY_MESSAGE_TOKENS = 600
+
+_SPEAKERS = {"user": "使用者", "assistant": "教練"}
+
+
+class ChatMemory:
+    """單一手牌的對話紀錄。messages 為 [{"role": "user"|"assistant", "content": "..."}]（Streamlit 慣例）。"""
+
+    def __init__(self, messages=None, window_turns=CHAT_WINDOW_TURNS, history_tokens=CHAT_HISTORY_TOKEN_BUDGET):
+        self.messages = list(messages or [])
+        self.window_turns = window_turns
+        self.history_tokens = history_tokens
+        self.summary = ""
+        # messages[:summarized_upto] 已摺進 summary
+        self.summarized_upto = 0
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __iter__(self):
+        return iter(self.messages)
+
+    def append(self, role, content):
+        self.messages.append({"role": role, "content": content})
+
+    def _token_start(self):
+        """合計不超過 history_tokens 的最早起點（至少保留最後一則）。"""
+        used = 0
+        for i in range(len(self.messages) - 1, -1, -1):
+            used += estimate_tokens(self.messages[i].get("content", ""))
+            if used > self.history_tokens and i < len(self.messages) - 1:
+                return i + 1
+        return 0
+
+    def _window_start(self):
+        """
+        逐字保留的起點。尚未摺入的訊息超過 window_turns + CHAT_SUMMARY_BATCH_TURNS 輪（或超過 token 上限）時
+        才一次摺到只剩 window_turns 輪，避免每一輪都多打一次摘要請求。
+        """
+        end = len(self.messages)
+        token_start = self._token_start()
+        if max(end - 2 * (self.window_turns + CHAT_SUMMARY_BATCH_TURNS), token_start) <= self.summarized_upto:
+            return self.summarized_upto
+        return max(end - 2 * self.window_turns, token_start)
+
+    def pending(self):
+        """回傳 (逐字保留的起點, 待摺進摘要的逐字稿)；不需要摺入時逐字稿為空字串。"""
+        start = self._window_start()
+        if start <= self.summarized_upto:
+            return start, ""
+        return start, format_transcript(self.messages[self.summarized_upto:start])
+
+    def fold(self, start, summary):
+        """把 messages[:start] 視為已摺進 summary；summary 為 None（摘要失敗）時不推進。"""
+        if summary is not None and start > self.summarized_upto:
+            self.summary = summary.strip()
+            self.summarized_upto = start
+
+    def window(self, summarize):
+        """
+        回傳 (摘要, 最近訊息 list)。
+        summarize(previous_summary, transcript) 回傳新摘要字串，失敗時回傳 None；只在有新的舊訊息要摺入時呼叫。
+        非同步呼叫端可先用 pending() / fold() 自行產生摘要，再呼叫本函式（此時不會再呼叫 summarize）。
+        """
+        start, transcript = self.pending()
+        if start > self.summarized_upto:
+            self.fold(start, summarize(self.summary, transcript) if transcript else self.summary)
+        return self.summary, self.messages[start:]
+
+
+def format_transcript(messages):
+    """把訊息轉成「使用者：… / 教練：…」的純文字，供摘要 prompt 使用。"""
+    lines = []
+    for msg in messages:
+        text = (msg.get("content") or "").strip()
+        if not text:
+            continue
+        text = truncate_to_tokens(text, CHAT_SUMMARY_MESSAGE_TOKENS)
+        lines.append(f"{_SPEAKERS.get(msg.get('role'), '使用者')}：{text}")
+    return "\n".join(lines)
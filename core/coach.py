@@ -1,38 +1,285 @@
 """
 [教練大腦] 負責跟 LLM 溝通、處理 Prompt。
-包含：call_llm_api、analyze_specific_hand、generate_match_summary。
+包含：call_llm_api、analyze_specific_hand、generate_match_summary，以及逐段產出文字的串流版本、多手並行分析。
 """
-import json
-import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-from .parser import cards_to_emoji
+from .chat_memory import ChatMemory
+from .compact import COMPACT_LEGEND, PROMPT_TOKEN_BUDGET, compact_hand, estimate_tokens, join_within_budget, truncate_to_tokens
+from .context_cache import get_cached_content, invalidate
+from .equity import equity_vs_range, open_range, parse_range
+from .http_client import POOL_SIZE, RateLimiter, gemini_url, iter_sse_json, post_json
+from .llm_cache import _response_cache, response_key
+from .metrics import start_call
+from .parser import cards_to_emoji, seat_position
+from .table import HandTable
 
 # 策略檔路徑：專案根目錄
 _STRATEGY_FILE = Path(__file__).resolve().parent.parent / "poker_strategy_bible.txt"
 if not _STRATEGY_FILE.exists():
     _STRATEGY_FILE = Path(__file__).resolve().parent.parent / "poker_strategy_bible"
+# 策略檔快取：(上次檢查時間, (mtime_ns, size), 內容, 單手分析 prompt 前段)
+_STRATEGY_CHECK_INTERVAL = 1.0
+_strategy_cache = None
+_strategy_lock = threading.Lock()
+# 追問時手牌脈絡（紀錄 + 分析）的 token 上限
+CHAT_CONTEXT_TOKEN_BUDGET = 3000
 
 
-def call_llm_api(api_key: str, model: str, prompt: str, temperature: float = 0.1) -> str:
+def _prompt_payload(text, temperature, cached_content=None):
+    payload = {
+        "contents": [{"parts": [{"text": text}]}],
+        "generationConfig": {"temperature": temperature},
+    }
+    if cached_content:
+        payload["cachedContent"] = cached_content
+    return payload
+
+
+def _post_prompt(api_key, model, prompt, temperature, static_prefix=None, method="generateContent", **kwargs):
+    """
+    送出單輪 prompt 並回傳 Response。static_prefix 為 prompt 的固定開頭時，
+    先以脈絡快取引用它、只送出其後的內容；快取不可用或被伺服器拒絕時送出完整 prompt。
+    """
+    url = gemini_url(model, api_key, method)
+    if static_prefix and prompt.startswith(static_prefix):
+        cached_content = get_cached_content(api_key, model, static_prefix)
+        if cached_content:
+            resp = post_json(url, _prompt_payload(prompt[len(static_prefix):], temperature, cached_content), **kwargs)
+            if resp.status_code not in (400, 403, 404):
+                resp.context_cache = "hit"
+                return resp
+            # 引用的快取已過期或被刪除：丟掉本地紀錄，改送完整 prompt
+            resp.close()
+            invalidate(api_key, model, static_prefix)
+            resp = post_json(url, _prompt_payload(prompt, temperature), **kwargs)
+            resp.context_cache = "expired"
+            return resp
+    return post_json(url, _prompt_payload(prompt, temperature), **kwargs)
+
+
+def _http_error_text(resp):
+    """非 2xx 回應 → 「HTTP 狀態碼 + Gemini 錯誤訊息」。"""
+    try:
+        message = resp.json().get("error", {}).get("message", "")
+    except Exception:
+        message = ""
+    return f"HTTP {resp.status_code}" + (f" {message}" if message else "")
+
+
+def call_llm_api(
+    api_key: str,
+    model: str,
+    prompt: str,
+    temperature: float = 0.1,
+    use_cache: bool = False,
+    static_prefix: str | None = None,
+) -> str:
     """
     呼叫 Gemini API，傳入 prompt，回傳模型輸出的文字。
     失敗時回傳錯誤訊息字串（供 UI 顯示）。
+    use_cache=True 時先查回應快取（core.llm_cache），成功的回覆才會寫入。
+    static_prefix 見 _post_prompt；回應快取的 key 一律以完整 prompt 計算。
     """
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}"
+    call = start_call("generate", model, prompt)
+    key = response_key(model, temperature, prompt) if use_cache else None
+    if key is not None:
+        cached = _response_cache.get(key)
+        if cached is not None:
+            call.finish(cached, cache_hit=True)
+            return cached
+    try:
+        resp = _post_prompt(api_key, model, prompt, temperature, static_prefix)
+        call.response(resp)
+        if not resp.ok:
+            error = _http_error_text(resp)
+            call.finish(error=f"HTTP {resp.status_code}")
+            return f"AI 連線失敗: {error}"
+        data = resp.json()
+        call.usage(data.get("usageMetadata"))
+        text = data["candidates"][0]["content"]["parts"][0]["text"]
+    except Exception as e:
+        call.fail(e)
+        return f"AI 連線失敗: {str(e)}"
+    call.finish(text)
+    if key is not None:
+        _response_cache.put(key, model, text)
+    return text
+
+
+def _chat_payload(contents, system_instruction=None, temperature=0.1):
     payload = {
-        "contents": [{"parts": [{"text": prompt}]}],
+        "contents": contents,
         "generationConfig": {"temperature": temperature},
     }
+    if system_instruction:
+        payload["systemInstruction"] = {"parts": [{"text": system_instruction}]}
+    return payload
+
+
+def _candidate_text(data):
+    """回應（或串流事件）中第一個 candidate 的文字；沒有內容時回傳空字串。"""
+    candidates = data.get("candidates") or []
+    if not candidates:
+        return ""
+    parts = (candidates[0].get("content") or {}).get("parts") or []
+    return "".join(p.get("text", "") for p in parts)
+
+
+def _stream_generate(open_stream, model, cache_key=None, kind="generate_stream", prompt_text=""):
+    """
+    open_stream() 送出 streamGenerateContent 請求並回傳 Response，本函式逐段 yield 文字。
+    cache_key 不為 None 時先查回應快取（命中則一次 yield 全文），完整收到後才寫入。
+    失敗時 yield 錯誤訊息字串；串流中途斷線則在已輸出的內容後附上中斷說明，且不寫入快取。
+    kind / prompt_text 用於 core.metrics 的紀錄；首位元組時間以收到第一段文字為準。
+    """
+    call = start_call(kind, model, prompt_text)
+    if cache_key is not None:
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            call.finish(cached, cache_hit=True)
+            yield cached
+            return
+    received = []
     try:
-        resp = requests.post(
-            url,
-            headers={"Content-Type": "application/json"},
-            data=json.dumps(payload),
-        )
-        return resp.json()["candidates"][0]["content"]["parts"][0]["text"]
+        resp = open_stream()
+        call.response(resp)
+        for event in iter_sse_json(resp):
+            call.usage(event.get("usageMetadata"))
+            text = _candidate_text(event)
+            if text:
+                call.first_byte()
+                received.append(text)
+                yield text
     except Exception as e:
-        return f"AI 連線失敗: {str(e)}"
+        call.fail(e, "".join(received))
+        yield f"\n\n（AI 連線中斷: {str(e)}）" if received else f"AI 連線失敗: {str(e)}"
+        return
+    if not received:
+        call.finish(error="empty")
+        yield "AI 未回傳內容，請再試一次。"
+        return
+    call.finish("".join(received))
+    if cache_key is not None:
+        _response_cache.put(cache_key, model, "".join(received))
+
+
+def stream_llm_api(
+    api_key: str,
+    model: str,
+    prompt: str,
+    temperature: float = 0.1,
+    use_cache: bool = False,
+    static_prefix: str | None = None,
+):
+    """call_llm_api 的串流版：回傳 generator，可直接交給 st.write_stream。"""
+    key = response_key(model, temperature, prompt) if use_cache else None
+    return _stream_generate(
+        lambda: _post_prompt(
+            api_key, model, prompt, temperature, static_prefix, method="streamGenerateContent", stream=True
+        ),
+        model,
+        cache_key=key,
+        prompt_text=prompt,
+    )
+
+
+SPLIT_MARKER = "===SPLIT==="
+
+
+class SplitStream:
+    """
+    把分析串流依 ===SPLIT=== 切成兩段，各自是可交給 st.write_stream 的 generator：
+    先迭代 summary()（一句話狠評），標記出現後再迭代 detail()（Markdown 分析）。
+    標記可能被切在兩個 chunk 之間，因此 summary 會暫留最後 len(標記)-1 個字元，確認不是標記開頭才輸出。
+    結束後 summary_text / detail_text 與舊版 split 後 strip 的結果相同，full_text 為原始全文。
+    """
+
+    def __init__(self, chunks, marker=SPLIT_MARKER):
+        self._chunks = self._record(chunks)
+        self._raw = []
+        self._marker = marker
+        self._pending = ""
+        self.found_marker = False
+        self._summary = []
+        self._detail = []
+
+    def summary(self):
+        hold = len(self._marker) - 1
+        buf = ""
+        for chunk in self._chunks:
+            buf += chunk
+            at = buf.find(self._marker)
+            if at != -1:
+                self.found_marker = True
+                head, self._pending = buf[:at], buf[at + len(self._marker):]
+                if head:
+                    self._summary.append(head)
+                    yield head
+                return
+            if len(buf) > hold:
+                head, buf = buf[:len(buf) - hold], buf[len(buf) - hold:]
+                self._summary.append(head)
+                yield head
+        if buf:
+            self._summary.append(buf)
+            yield buf
+
+    def detail(self):
+        if not self.found_marker:
+            # summary() 尚未跑完時先把它消耗掉
+            for _ in self.summary():
+                pass
+            if not self.found_marker:
+                return
+        # 同 summary()：暫留可能是下一個標記開頭的尾巴；出現第二個標記即結束（其後內容不顯示，但仍讀完以保留 full_text）
+        hold = len(self._marker) - 1
+        buf = ""
+        for chunk in self._iter_rest():
+            buf += chunk
+            if not self._detail:
+                buf = buf.lstrip()
+            at = buf.find(self._marker)
+            if at != -1:
+                if buf[:at]:
+                    self._detail.append(buf[:at])
+                    yield buf[:at]
+                for _ in self._chunks:
+                    pass
+                return
+            if len(buf) > hold:
+                head, buf = buf[:len(buf) - hold], buf[len(buf) - hold:]
+                self._detail.append(head)
+                yield head
+        if buf:
+            self._detail.append(buf)
+            yield buf
+
+    def _record(self, chunks):
+        for chunk in chunks:
+            self._raw.append(chunk)
+            yield chunk
+
+    def _iter_rest(self):
+        if self._pending:
+            yield self._pending
+            self._pending = ""
+        yield from self._chunks
+
+    @property
+    def summary_text(self):
+        return "".join(self._summary).strip()
+
+    @property
+    def detail_text(self):
+        return "".join(self._detail).strip()
+
+    @property
+    def full_text(self):
+        return "".join(self._raw)
 
 
 def _call_llm_chat(
@@ -46,100 +293,159 @@ def _call_llm_chat(
     呼叫 Gemini API 多輪對話。contents 為 [{"role": "user"|"model", "parts": [{"text": "..."}]}, ...]。
     若有 system_instruction 則作為系統指示（手牌脈絡）。
     """
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}"
-    payload = {
-        "contents": contents,
-        "generationConfig": {"temperature": temperature},
-    }
-    if system_instruction:
-        payload["systemInstruction"] = {"parts": [{"text": system_instruction}]}
+    payload = _chat_payload(contents, system_instruction, temperature)
+    call = start_call("chat", model, _chat_prompt_text(contents, system_instruction))
     try:
-        resp = requests.post(
-            url,
-            headers={"Content-Type": "application/json"},
-            data=json.dumps(payload),
-        )
+        resp = post_json(gemini_url(model, api_key), payload)
+        call.response(resp)
+        if not resp.ok:
+            call.finish(error=f"HTTP {resp.status_code}")
+            return f"AI 連線失敗: {_http_error_text(resp)}"
         data = resp.json()
+        call.usage(data.get("usageMetadata"))
         if "candidates" not in data or not data["candidates"]:
+            call.finish(error="empty")
             return "AI 未回傳內容，請再試一次。"
-        return data["candidates"][0]["content"]["parts"][0]["text"]
+        text = data["candidates"][0]["content"]["parts"][0]["text"]
     except Exception as e:
+        call.fail(e)
         return f"AI 連線失敗: {str(e)}"
+    call.finish(text)
+    return text
 
 
-def chat_with_coach(history, user_input, hand_context, api_key, model):
-    """
-    根據「手牌脈絡」+「對話歷史」+「使用者輸入」呼叫 Gemini，回傳教練回覆文字。
+def _chat_prompt_text(contents, system_instruction):
+    """多輪對話請求的全部文字（僅供 metrics 計算 prompt 大小）。"""
+    texts = [system_instruction or ""] + [p.get("text", "") for c in contents for p in c["parts"]]
+    return "\n".join(texts)
 
-    - history: list of {"role": "user"|"assistant", "content": "..."}（Streamlit 慣例）
-    - user_input: 使用者本輪輸入
-    - hand_context: 當前鎖定手牌的紀錄與分析摘要（字串），會作為 system instruction
-    - api_key, model: Gemini API 參數
+
+def _chat_summary_prompt(previous_summary, transcript):
+    return (
+        "以下是使用者與撲克教練針對同一手牌的較早對話。請整理成 200 字以內的重點摘要："
+        "使用者問過什麼、教練給出的結論與建議、仍未解決的疑問。只輸出摘要本身，不要加標題或開場白。\n\n"
+        f"【先前摘要】\n{previous_summary or '（無）'}\n\n"
+        f"【新增對話】\n{transcript}"
+    )
+
+
+def _summarize_chat(previous_summary, transcript, api_key, model):
+    """把較早的對話摺進滾動摘要；失敗回傳 None（ChatMemory 下次再試）。"""
+    prompt = _chat_summary_prompt(previous_summary, transcript)
+    summary = call_llm_api(api_key, model, prompt, temperature=0.1, use_cache=True)
+    if summary.startswith("AI 連線失敗"):
+        return None
+    return summary
+
+
+def _chat_request(history, user_input, hand_context, api_key=None, model=None, summarize=None):
     """
+    組出多輪對話的 (contents, system_instruction)。
+    history 為 ChatMemory 時只帶摘要 + 最近幾輪原文（必要時先呼叫 LLM 產生摘要）；為 list 時視為一次性的紀錄。
+    summarize 可替換產生摘要的方式（預設為同步呼叫 _summarize_chat）。
+    手牌脈絡與本輪輸入各自有上限，整個請求控制在 PROMPT_TOKEN_BUDGET 內。
+    """
+    memory = history if isinstance(history, ChatMemory) else ChatMemory(history)
+    summary, recent = memory.window(
+        summarize or (lambda prev, transcript: _summarize_chat(prev, transcript, api_key, model))
+    )
     system_instruction = (
         "你是 Poker Copilot 撲克教練。你正在針對「當前鎖定的一手牌」回答用戶的追問。"
         "以下手牌紀錄與分析是你與用戶共同看到的上下文，請嚴格依此回答，勿臆測其他手牌。\n\n"
         "【手牌與分析上下文】\n"
-        f"{hand_context}"
+        f"{truncate_to_tokens(hand_context, CHAT_CONTEXT_TOKEN_BUDGET)}"
     )
+    if summary:
+        system_instruction += f"\n\n【先前對話摘要】\n{summary}"
     # 將 Streamlit 的 user/assistant 轉成 Gemini 的 user/model，且只保留 parts
     role_map = {"user": "user", "assistant": "model"}
     contents = []
-    for msg in history:
+    for msg in recent:
         role = role_map.get(msg.get("role"), "user")
         text = msg.get("content", "")
         if not text.strip():
             continue
-        contents.append({"role": role, "parts": [{"text": text}]})
-    contents.append({"role": "user", "parts": [{"text": user_input}]})
+        contents.append({"role": role, "parts": [{"text": truncate_to_tokens(text, memory.history_tokens)}]})
+    used = estimate_tokens(system_instruction) + sum(estimate_tokens(c["parts"][0]["text"]) for c in contents)
+    contents.append({"role": "user", "parts": [{"text": truncate_to_tokens(user_input, max(PROMPT_TOKEN_BUDGET - used, 200))}]})
+    return contents, system_instruction
+
+
+def chat_with_coach(history, user_input, hand_context, api_key, model):
+    """
+    根據「手牌脈絡」+「對話歷史」+「使用者輸入」呼叫 Gemini，回傳教練回覆文字。
+
+    - history: 該手牌的 ChatMemory（或 list of {"role": "user"|"assistant", "content": "..."}），不含本輪輸入
+    - user_input: 使用者本輪輸入
+    - hand_context: 當前鎖定手牌的紀錄與分析摘要（字串），會作為 system instruction
+    - api_key, model: Gemini API 參數
+    """
+    contents, system_instruction = _chat_request(history, user_input, hand_context, api_key, model)
     return _call_llm_chat(
         api_key, model, contents, system_instruction=system_instruction, temperature=0.2
     )
 
 
-def _load_strategy_logic():
+def stream_chat_with_coach(history, user_input, hand_context, api_key, model):
+    """chat_with_coach 的串流版，回傳逐段產出回覆的 generator（對話不快取）。"""
+    contents, system_instruction = _chat_request(history, user_input, hand_context, api_key, model)
+    payload = _chat_payload(contents, system_instruction, temperature=0.2)
+    return _stream_generate(
+        lambda: post_json(gemini_url(model, api_key, "streamGenerateContent"), payload, stream=True), model,
+        kind="chat_stream", prompt_text=_chat_prompt_text(contents, system_instruction),
+    )
+
+
+def _strategy_stamp():
     try:
-        return _STRATEGY_FILE.read_text(encoding="utf-8")
-    except Exception:
-        return "（策略檔案未找到，使用預設邏輯）"
+        stat = _STRATEGY_FILE.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
 
-def generate_match_summary(hands_data, vpip, pfr, api_key, model):
-    total_hands = len(hands_data)
-    vpip_count = sum(1 for h in hands_data if h.get("vpip"))
-    pfr_count = sum(1 for h in hands_data if h.get("pfr"))
-    agg_freq = round((pfr_count / vpip_count) * 100, 1) if vpip_count > 0 else 0.0
-    POS_GROUPS = {
-        "BTN": ["BTN"], "SB": ["SB"], "BB": ["BB"],
-        "EP": ["UTG", "UTG+1"], "MP": ["MP", "MP+1", "HJ"], "CO": ["CO"],
-    }
+def _strategy_state():
+    """
+    回傳 (策略檔內容, 單手分析 prompt 固定前段)，依檔案 (mtime, size) 快取。
+    每 _STRATEGY_CHECK_INTERVAL 秒最多 stat 一次；檔案有變動才重讀並重新組前段（改檔後不必重啟即生效）。
+    """
+    global _strategy_cache
+    now = time.monotonic()
+    cached = _strategy_cache
+    if cached is not None and now - cached[0] < _STRATEGY_CHECK_INTERVAL:
+        return cached[2], cached[3]
+    stamp = _strategy_stamp()
+    with _strategy_lock:
+        cached = _strategy_cache
+        if cached is None or cached[1] != stamp:
+            try:
+                text = _STRATEGY_FILE.read_text(encoding="utf-8")
+            except Exception:
+                text = "（策略檔案未找到，使用預設邏輯）"
+            cached = (now, stamp, text, _render_hand_analysis_prefix(text))
+        else:
+            cached = (now,) + cached[1:]
+        _strategy_cache = cached
+    return cached[2], cached[3]
 
-    def calc_pos_stats(pos_keys):
-        hands_in_pos = [h for h in hands_data if h.get("position") in pos_keys or h.get("position_name") in pos_keys]
-        n = len(hands_in_pos)
-        if n == 0:
-            return "N/A", "N/A", 0
-        v = sum(1 for h in hands_in_pos if h.get("vpip"))
-        p = sum(1 for h in hands_in_pos if h.get("pfr"))
-        vpip_pct = round((v / n) * 100, 1)
-        pfr_pct = round((p / n) * 100, 1)
-        return vpip_pct, pfr_pct, n
-
-    vpip_btn, pfr_btn, _ = calc_pos_stats(POS_GROUPS["BTN"])
-    vpip_sb, pfr_sb, _ = calc_pos_stats(POS_GROUPS["SB"])
-    vpip_bb, pfr_bb, _ = calc_pos_stats(POS_GROUPS["BB"])
-    vpip_ep, pfr_ep, _ = calc_pos_stats(POS_GROUPS["EP"])
-    vpip_mp, pfr_mp, _ = calc_pos_stats(POS_GROUPS["MP"])
-    vpip_co, pfr_co, _ = calc_pos_stats(POS_GROUPS["CO"])
 
-    def fmt_pos(vpip_val, pfr_val):
-        if vpip_val == "N/A" or pfr_val == "N/A":
-            return "N/A"
-        return f"VPIP {vpip_val}% / PFR {pfr_val}%"
+def _load_strategy_logic():
+    return _strategy_state()[0]
 
-    key_hands_raw = [h for h in hands_data if h.get("vpip")]
-    key_hands_raw.sort(key=lambda h: h.get("pot_size", 0), reverse=True)
-    key_hands = key_hands_raw[:5]
+
+def generate_match_summary(hands_data, vpip, pfr, api_key, model):
+    """hands_data 可為 HandTable 或手牌列表；統計一律以 HandTable 的向量化遮罩計算。"""
+    return call_llm_api(api_key, model, _match_summary_prompt(hands_data, vpip, pfr), temperature=0.1, use_cache=True)
+
+
+def _match_summary_prompt(hands_data, vpip, pfr):
+    table = hands_data if isinstance(hands_data, HandTable) else HandTable(hands_data)
+    total_hands = len(table)
+    vpip_count = int(table.vpip.sum())
+    pfr_count = int(table.pfr.sum())
+    agg_freq = round((pfr_count / vpip_count) * 100, 1) if vpip_count > 0 else 0.0
+    pos_stats = table.positional_stats()
+    key_hands = table.rows(table.top_by_pot(table.vpip, 5))
     key_hands_lines = []
     for i, h in enumerate(key_hands, 1):
         display_idx = h.get("display_index", i)
@@ -151,11 +457,34 @@ def generate_match_summary(hands_data, vpip, pfr, api_key, model):
             f"【Hand #{display_idx}】\n"
             f"- Hero 底牌: {hero_cards} {suited_label} (牌型: {ht})\n"
             f"- 底池: {pot_size}\n"
-            f"- 完整紀錄:\n{h.get('content', '')}"
+            f"- 手牌紀錄（精簡格式：{COMPACT_LEGEND}）:\n{compact_hand(h.get('content', ''), h.get('hero'))}"
         )
-    key_hands_text = "\n\n---\n\n".join(key_hands_lines) if key_hands_lines else "（無 VPIP 手牌）"
+    # 關鍵手牌依底池由大到小加入，直到整份 prompt 的估算 token 數達到上限
+    key_hands_budget = PROMPT_TOKEN_BUDGET - estimate_tokens(_render_match_summary_prompt(
+        total_hands, vpip, pfr, agg_freq, pos_stats, "", 0
+    ))
+    key_hands_text, key_hands_count = join_within_budget(key_hands_lines, "\n\n---\n\n", key_hands_budget)
+    if not key_hands_lines:
+        key_hands_text = "（無 VPIP 手牌）"
+    return _render_match_summary_prompt(
+        total_hands, vpip, pfr, agg_freq, pos_stats, key_hands_text, key_hands_count
+    )
 
-    prompt = f"""你是一位專業且資深的撲克導師。語氣要求：專業、冷靜、客觀，帶有建設性。請勿使用「兄弟」、「喔！」、「秀肌肉」等過於輕浮或江湖味的詞彙。
+
+def _render_match_summary_prompt(total_hands, vpip, pfr, agg_freq, pos_stats, key_hands_text, key_hands_count):
+    vpip_btn, pfr_btn, _ = pos_stats["BTN"]
+    vpip_sb, pfr_sb, _ = pos_stats["SB"]
+    vpip_bb, pfr_bb, _ = pos_stats["BB"]
+    vpip_ep, pfr_ep, _ = pos_stats["EP"]
+    vpip_mp, pfr_mp, _ = pos_stats["MP"]
+    vpip_co, pfr_co, _ = pos_stats["CO"]
+
+    def fmt_pos(vpip_val, pfr_val):
+        if vpip_val == "N/A" or pfr_val == "N/A":
+            return "N/A"
+        return f"VPIP {vpip_val}% / PFR {pfr_val}%"
+
+    return f"""你是一位專業且資深的撲克導師。語氣要求：專業、冷靜、客觀，帶有建設性。請勿使用「兄弟」、「喔！」、「秀肌肉」等過於輕浮或江湖味的詞彙。
 
 ---
 
@@ -171,7 +500,7 @@ def generate_match_summary(hands_data, vpip, pfr, api_key, model):
 - MP:  {fmt_pos(vpip_mp, pfr_mp)}
 - CO:  {fmt_pos(vpip_co, pfr_co)}
 
-【關鍵手牌（共 5 手，依底池大小選出）】
+【關鍵手牌（共 {key_hands_count} 手，依底池大小選出）】
 以下手牌編號為 Hand #數字，與使用者介面列表完全對應。請依此編號引用，勿使用 TM 等原始 ID。手牌已標註 (Suited) 或 (Offsuit)，請依此解讀花色。
 
 {key_hands_text}
@@ -184,34 +513,81 @@ def generate_match_summary(hands_data, vpip, pfr, api_key, model):
 請寫一段約 150～200 字的完整段落，像賽後新聞稿一樣，專業地總結選手的風格（鬆/緊、被動/激進）以及本場比賽的主要漏洞。**務必結合「位置別數據」指出特定位置的漏洞**（例如 BB 防守過緊、BTN 開池過少等）。不要只寫一句話。
 
 ## 🔥 關鍵戰役覆盤
-針對上述 5 手大底池手牌，分析 Hero 在大底池處理上的優缺點。每當提到某一手時，必須標註「Hand #數字」（例如 Hand #3、Hand #12），與介面列表一致。
+針對上述 {key_hands_count} 手大底池手牌，分析 Hero 在大底池處理上的優缺點。每當提到某一手時，必須標註「Hand #數字」（例如 Hand #3、Hand #12），與介面列表一致。
 
 ## 💡 下場比賽調整
 給出 1～2 個具體可執行的建議。"""
 
-    return call_llm_api(api_key, model, prompt, temperature=0.1)
+
+# 單手分析固定的溫度（預先分析查快取時用同一個值組 key）
+HAND_ANALYSIS_TEMPERATURE = 0.1
 
 
 def analyze_specific_hand(hand_data, api_key, model):
     """
     傳入完整 hand_data；花色與位置由系統事實強制注入，AI 無解釋權。
     """
-    strategy_logic = _load_strategy_logic()
-    hero_cards_emoji = hand_data.get("hero_cards_emoji") or cards_to_emoji(hand_data.get("hero_cards"))
-    hero_position = hand_data.get("position", "Other")
-    bb_count = hand_data.get("bb", 0)
-    relative_pos_str = hand_data.get("relative_pos_str", "N/A")
-    fact_sheet = f"""【系統判定事實 - 分析基準，請嚴格遵守】
-- Hero 手牌: {hero_cards_emoji}
-- Hero 位置: {hero_position}
-- 籌碼量: {bb_count} BB
-- 相對位置優劣: {relative_pos_str} (針對主要對手)
-若原始文本與上述衝突，以上述為準。輸出時請勿重複列出此清單，直接進入分析。
+    return call_llm_api(
+        api_key, model, _hand_analysis_prompt(hand_data),
+        temperature=HAND_ANALYSIS_TEMPERATURE, use_cache=True, static_prefix=_hand_analysis_prefix(),
+    )
 
-**相對位置思考限制**：你必須基於上述的「相對位置優劣」進行分析，嚴禁自行推斷 Hero 是 IP 還是 OOP。若 Hero 處於 **In Position (IP)**，請傾向於建議更寬的跟注 (Call) 或浮打 (Float) 範圍；若 **Out of Position (OOP)**，則建議更緊的防守。勿出現「CO vs UTG+1 是不利位置」等與系統事實矛盾的結論。**"""
-    hand_content = hand_data.get("content", "")
 
-    prompt = f"""你是 Hero 的專屬撲克教練 "Poker Copilot"。
+def analyze_hands_concurrently(hands, api_key, model, max_workers=4, rate_limiter=None):
+    """
+    以有上限的 thread pool 同時分析多手牌，依完成順序 yield (索引, 分析文字)。
+    每個請求送出前先向 rate_limiter 取 token（預設每次呼叫新建一個 RateLimiter）；
+    總耗時約等於最慢的一手，而非逐一相加。並行數不超過連線池大小，避免等待連線。
+    """
+    hands = list(hands)
+    if not hands:
+        return
+    limiter = rate_limiter or RateLimiter()
+
+    def run(hand):
+        limiter.acquire()
+        return analyze_specific_hand(hand, api_key, model)
+
+    workers = max(1, min(max_workers, len(hands), POOL_SIZE))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="coach-batch") as pool:
+        futures = {pool.submit(run, hand): i for i, hand in enumerate(hands)}
+        for future in as_completed(futures):
+            try:
+                analysis = future.result()
+            except Exception as e:
+                analysis = f"AI 連線失敗: {str(e)}"
+            yield futures[future], analysis
+
+
+def hand_analysis_request(hand_data):
+    """
+    單手分析要送出的 (完整 prompt, 可放進脈絡快取的固定前段)；
+    給需要先查回應快取、估算成本再決定是否送出的呼叫端（例如 core.prefetch）。
+    """
+    return _hand_analysis_prompt(hand_data), _hand_analysis_prefix()
+
+
+def stream_hand_analysis(hand_data, api_key, model):
+    """
+    analyze_specific_hand 的串流版，回傳 SplitStream：
+    先以 summary() 顯示一句話狠評，再以 detail() 串流 Markdown 分析。
+    """
+    return SplitStream(stream_llm_api(
+        api_key, model, _hand_analysis_prompt(hand_data),
+        temperature=HAND_ANALYSIS_TEMPERATURE, use_cache=True, static_prefix=_hand_analysis_prefix(),
+    ))
+
+
+def _hand_analysis_prefix():
+    """
+    單手分析 prompt 的固定前段：角色、風格規則、策略聖經、時間線與一致性規則、語氣範例。
+    與手牌無關，可整段放進 Gemini 脈絡快取（core.context_cache）；隨策略檔快取預先組好。
+    """
+    return _strategy_state()[1]
+
+
+def _render_hand_analysis_prefix(strategy_logic):
+    return f"""你是 Hero 的專屬撲克教練 "Poker Copilot"。
 你的風格是：**先同理心 (Empathy)，再講邏輯 (Logic)，最後給建議 (Action)**。
 你要像一個在牌桌旁看了 20 年牌的老手，說話犀利但有溫度，不要像機器人一樣背誦公式。
 
@@ -281,11 +657,60 @@ GTO 在這裡是非常明確的：面對早位強勢加注，JTo 這種雜色牌
 
 ---
 
-【真實手牌數據】
+"""
+
+
+# 單手分析 prompt 後段除了事實清單與手牌紀錄之外的固定文字（輸出格式說明等）約略的 token 數
+_HAND_SUFFIX_OVERHEAD_TOKENS = 200
+
+
+def _equity_fact(hand_data):
+    """
+    事實清單的勝率一行：Hero 底牌對主要對手（翻前第一個加注者）所在位置開池範圍的翻前勝率。
+    沒有主要對手（Hero 先加注或無人加注）或無法計算時回傳空字串。
+    """
+    villain_seat = hand_data.get("villain_seat")
+    if villain_seat is None or not hand_data.get("hero_cards"):
+        return ""
+    try:
+        position = seat_position(hand_data.get("content", ""), villain_seat)
+        range_text = open_range(position)
+        result = equity_vs_range(hand_data["hero_cards"], range_text)
+        share = len(parse_range(range_text)) / 1326
+    except Exception:
+        return ""
+    return (
+        f"\n- Hero 翻前勝率: {result['equity']:.1%}（對 {position} 開池範圍，約前 {share:.0%} 的起手牌，"
+        f"模擬 {result['samples']:,} 次；請以此數字為準，不要自行估算）"
+    )
+
+
+def _hand_analysis_prompt(hand_data):
+    """單手分析的完整 prompt = 固定前段（_hand_analysis_prefix）+ 本手的事實與紀錄。"""
+    hero_cards_emoji = hand_data.get("hero_cards_emoji") or cards_to_emoji(hand_data.get("hero_cards"))
+    hero_position = hand_data.get("position", "Other")
+    bb_count = hand_data.get("bb", 0)
+    relative_pos_str = hand_data.get("relative_pos_str", "N/A")
+    fact_sheet = f"""【系統判定事實 - 分析基準，請嚴格遵守】
+- Hero 手牌: {hero_cards_emoji}
+- Hero 位置: {hero_position}
+- 籌碼量: {bb_count} BB
+- 相對位置優劣: {relative_pos_str} (針對主要對手){_equity_fact(hand_data)}
+若原始文本與上述衝突，以上述為準。輸出時請勿重複列出此清單，直接進入分析。
+
+**相對位置思考限制**：你必須基於上述的「相對位置優劣」進行分析，嚴禁自行推斷 Hero 是 IP 還是 OOP。若 Hero 處於 **In Position (IP)**，請傾向於建議更寬的跟注 (Call) 或浮打 (Float) 範圍；若 **Out of Position (OOP)**，則建議更緊的防守。勿出現「CO vs UTG+1 是不利位置」等與系統事實矛盾的結論。**"""
+    prefix = _hand_analysis_prefix()
+    hand_log = compact_hand(hand_data.get("content", ""), hand_data.get("hero"))
+    # 預算只算每手不同的後段（事實清單 + 紀錄 + 格式說明）：固定前段走 context cache 不隨請求送出，
+    # 策略檔再長也不會把手牌紀錄擠掉；超出預算時只裁切紀錄本身
+    suffix_tokens = estimate_tokens(fact_sheet) + _HAND_SUFFIX_OVERHEAD_TOKENS
+    hand_log = truncate_to_tokens(hand_log, PROMPT_TOKEN_BUDGET - suffix_tokens)
+
+    return prefix + f"""【真實手牌數據】
 {fact_sheet}
 
-【手牌紀錄】
-{hand_content}
+【手牌紀錄】（精簡格式：{COMPACT_LEGEND}）
+{hand_log}
 
 ---
 
@@ -295,4 +720,3 @@ GTO 在這裡是非常明確的：面對早位強勢加注，JTo 這種雜色牌
 2. ===SPLIT===
 3. **Markdown 分析**：(包含「🧐 局勢解讀」與「💡 教練建議」兩個區塊，請用口語化解釋 EV 與範圍，不要機械式背誦定律)
 """
-    return call_llm_api(api_key, model, prompt, temperature=0.1)
@@ -0,0 +1,251 @@
+"""
+[精簡編碼] 把 GG 原始手牌紀錄轉成送給 LLM 的精簡格式，並估算 / 限制 prompt 的 token 數。
+- 玩家 ID 改成位置（BTN、SB、UTG…），金額一律換算成 BB
+- 去掉 ante / 盲注逐行紀錄、"Dealt to" 與 SUMMARY 座位行；連續棄牌合併成一段
+- 每條街一行，附上該街開始時的底池；只列出有主動投入籌碼的玩家（與 Hero）的起始籌碼
+- 決策所需的資訊（行動順序、尺寸、全下、攤牌、結果）全部保留
+"""
+import re
+
+from .parser import calculate_position, distance_to_button
+
+# 每次請求的輸入 token 上限（估算值）；超過時由呼叫端裁切手牌內容
+PROMPT_TOKEN_BUDGET = 8000
+# 放在 prompt 中說明精簡格式的一句話
+COMPACT_LEGEND = "玩家以位置表示、金額單位為 BB、每條街一行並標示該街開始時的底池、raise to 為加注後總額"
+
+_LEVEL_RE = re.compile(r"Level(\d+)\(([\d,]+)/([\d,]+)\)")
+_ANTE_RE = re.compile(r"posts the ante ([\d,]+)")
+_POST_BB_RE = re.compile(r"posts big blind ([\d,]+)")
+_BUTTON_RE = re.compile(r"Seat #(\d+) is the button|The button is in seat #(\d+)")
+_TABLE_MAX_RE = re.compile(r"(\d+)-max")
+_SEAT_LINE_RE = re.compile(r"^Seat (\d+): (\S+) \(([\d,]+)(?: in chips)?\)", re.MULTILINE)
+_DEALT_HERO_RE = re.compile(r"Dealt to (\S+) \[([^\]]+)\]")
+_STREET_RE = re.compile(r"^\*\*\* (HOLE CARDS|FLOP|TURN|RIVER|SHOWDOWN|SUMMARY) \*\*\*(.*)$")
+_ACTION_RE = re.compile(
+    r"^(\S+): (folds|checks|calls ([\d,]+)|bets ([\d,]+)|raises [\d,]+ to ([\d,]+)"
+    r"|posts small blind ([\d,]+)|posts big blind ([\d,]+)|posts the ante ([\d,]+)|shows \[([^\]]+)\])"
+)
+_UNCALLED_RE = re.compile(r"^Uncalled bet \(([\d,]+)\) returned to (\S+)")
+_COLLECTED_RE = re.compile(r"^(\S+) collected ([\d,]+) from")
+_STREET_NAMES = {"FLOP": "Flop", "TURN": "Turn", "RIVER": "River"}
+
+
+def estimate_tokens(text):
+    """
+    粗估 token 數：ASCII 約 4 字元 1 token，中文、emoji 等非 ASCII 字元約 1 字元 1 token。
+    """
+    if not text:
+        return 0
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return (len(text) - ascii_chars) + ascii_chars // 4 + 1
+
+
+def truncate_to_tokens(text, max_tokens, marker="\n…（內容過長，已截斷）"):
+    """估算超過 max_tokens 時從尾端截斷（以二分搜尋找最長可容納的前綴）。"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    budget = max(0, max_tokens - estimate_tokens(marker))
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo] + marker
+
+
+def join_within_budget(blocks, sep, max_tokens):
+    """
+    依序加入 blocks，直到再加一段就會超過 max_tokens 為止；回傳 (合併文字, 實際加入段數)。
+    第一段就放不下時截斷第一段，確保至少有一段內容。
+    """
+    taken = []
+    used = 0
+    sep_tokens = estimate_tokens(sep)
+    for block in blocks:
+        cost = estimate_tokens(block) + (sep_tokens if taken else 0)
+        if used + cost > max_tokens:
+            if not taken:
+                taken.append(truncate_to_tokens(block, max_tokens))
+            break
+        taken.append(block)
+        used += cost
+    return sep.join(taken), len(taken)
+
+
+def _amount(s):
+    return int(s.replace(",", ""))
+
+
+def _bb(chips, bb_size):
+    value = round(chips / bb_size, 1) if bb_size else chips
+    return f"{value:g}"
+
+
+def _unique_positions(seats, button_seat):
+    """
+    玩家 → 位置標籤，保證不重複：9 人以上桌多位玩家同為 "MP" 時依行動順序標成 MP、MP+1、MP+2…；
+    其他重複（例如找不到 Button 時全部為 "Other"）改用座位號 "Seat N"。
+    """
+    seat_numbers = sorted(seats.values())
+    pos = {name: calculate_position(seat, button_seat, seat_numbers) for name, seat in seats.items()}
+    groups = {}
+    for name, label in pos.items():
+        groups.setdefault(label, []).append(name)
+    for label, names in groups.items():
+        if len(names) < 2:
+            continue
+        if label == "MP":
+            names.sort(key=lambda n: distance_to_button(seats[n], button_seat, seat_numbers))
+            for i, name in enumerate(names):
+                pos[name] = "MP" if i == 0 else f"MP+{i}"
+        else:
+            for name in names:
+                pos[name] = f"Seat {seats[name]}"
+    return pos
+
+
+def compact_hand(content, hero_name=None):
+    """
+    原始手牌文字 → 精簡文字。無法辨識的行直接略過；content 為空時回傳空字串。
+    hero_name 未指定時以 "Dealt to X [..]" 的 X 為 Hero。
+    """
+    if not content or not content.strip():
+        return ""
+    dealt = _DEALT_HERO_RE.search(content)
+    hero = hero_name or (dealt.group(1) if dealt else "Hero")
+    hero_cards = dealt.group(2) if dealt and dealt.group(1) == hero else None
+
+    level = _LEVEL_RE.search(content)
+    if level:
+        sb_size, bb_size = _amount(level.group(2)), _amount(level.group(3))
+    else:
+        post_bb = _POST_BB_RE.search(content)
+        bb_size = _amount(post_bb.group(1)) if post_bb else 0
+        sb_size = bb_size // 2
+    ante = _ANTE_RE.search(content)
+
+    hole_at = content.find("*** HOLE CARDS ***")
+    seat_text = content[:hole_at] if hole_at != -1 else content
+    seats = {}
+    stacks = {}
+    for m in _SEAT_LINE_RE.finditer(seat_text):
+        seats[m.group(2)] = int(m.group(1))
+        stacks[m.group(2)] = _amount(m.group(3))
+    btn = _BUTTON_RE.search(content)
+    button_seat = int(btn.group(1) or btn.group(2)) if btn else None
+    pos = _unique_positions(seats, button_seat)
+
+    def who(name):
+        label = pos.get(name, name)
+        return f"Hero({label})" if name == hero else label
+
+    pot = 0
+    street = None
+    street_put = {}
+    actions = []
+    folds = []
+    lines = []
+    voluntary = set()
+    shows = []
+    results = []
+
+    def flush_folds():
+        if folds:
+            actions.append("/".join(folds) + " fold")
+            folds.clear()
+
+    def close_street():
+        flush_folds()
+        if street is not None:
+            lines.append(street + (": " + ", ".join(actions) if actions else ""))
+        actions.clear()
+
+    for raw in content.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        marker = _STREET_RE.match(line)
+        if marker:
+            name = marker.group(1)
+            if name in ("SHOWDOWN", "SUMMARY"):
+                close_street()
+                street = None
+                if name == "SUMMARY":
+                    break
+                continue
+            close_street()
+            street_put = {}
+            if name == "HOLE CARDS":
+                street = "Preflop"
+            else:
+                boards = re.findall(r"\[([^\]]+)\]", marker.group(2))
+                new_cards = boards[-1] if boards else ""
+                street = f"{_STREET_NAMES[name]} [{new_cards}] (pot {_bb(pot, bb_size)})"
+            continue
+        m = _ACTION_RE.match(line)
+        if m:
+            name, verb = m.group(1), m.group(2)
+            if m.group(9) is not None:
+                shows.append(f"{who(name)} [{m.group(9)}]")
+                continue
+            if m.group(6) or m.group(7) or m.group(8):
+                paid = _amount(m.group(6) or m.group(7) or m.group(8))
+                pot += paid
+                if not m.group(8):
+                    street_put[name] = street_put.get(name, 0) + paid
+                continue
+            all_in = " all-in" if line.endswith("and is all-in") else ""
+            if verb == "folds":
+                folds.append(who(name))
+                continue
+            flush_folds()
+            voluntary.add(name)
+            if verb == "checks":
+                actions.append(f"{who(name)} check")
+            elif m.group(3):
+                paid = _amount(m.group(3))
+                pot += paid
+                street_put[name] = street_put.get(name, 0) + paid
+                actions.append(f"{who(name)} call {_bb(paid, bb_size)}{all_in}")
+            elif m.group(4):
+                paid = _amount(m.group(4))
+                pot += paid
+                street_put[name] = street_put.get(name, 0) + paid
+                actions.append(f"{who(name)} bet {_bb(paid, bb_size)}{all_in}")
+            else:
+                total = _amount(m.group(5))
+                pot += total - street_put.get(name, 0)
+                street_put[name] = total
+                actions.append(f"{who(name)} raise to {_bb(total, bb_size)}{all_in}")
+            continue
+        m = _UNCALLED_RE.match(line)
+        if m:
+            pot -= _amount(m.group(1))
+            continue
+        m = _COLLECTED_RE.match(line)
+        if m:
+            results.append(f"{who(m.group(1))} won {_bb(_amount(m.group(2)), bb_size)}")
+    close_street()
+
+    header = f"Blinds {sb_size:,}/{bb_size:,}"
+    if ante:
+        header += f" ante {_amount(ante.group(1)):,}"
+    table_max = _TABLE_MAX_RE.search(content)
+    header += f" | {len(seats)} players" + (f" ({table_max.group(1)}-max)" if table_max else "")
+    if hero in seats:
+        header += f" | Hero {pos.get(hero)} {_bb(stacks[hero], bb_size)}bb"
+    if hero_cards:
+        header += f" [{hero_cards}]"
+    out = [header]
+    others = [n for n in seats if n in voluntary and n != hero]
+    if others:
+        out.append("Stacks(bb): " + ", ".join(f"{pos.get(n, n)} {_bb(stacks[n], bb_size)}" for n in others))
+    out.extend(lines)
+    if shows:
+        out.append("Shows: " + ", ".join(shows))
+    if results:
+        out.append("Result: " + ", ".join(results))
+    return "\n".join(out)
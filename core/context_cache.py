@@ -0,0 +1,122 @@
+"""
+[脈絡快取] 用 Gemini cachedContents API 把單手分析 prompt 的固定前段（風格規則、策略聖經、範例）上傳一次，
+之後每次分析只送出手牌事實與紀錄，並以 cachedContent 名稱引用前段。
+- 以 (API key, model, 前段雜湊) 為 key 記在程序內，到期前一段時間自動重建
+- 同一 key 同時只有一個建立請求（single-flight）：其他執行緒等它完成後共用同一份，不會上傳出多份各自計費的快取
+- 前段估算 token 數低於模型的最小快取量時直接不建立；建立失敗（模型不支援、權限不足…）時記住失敗一段時間，
+  期間直接送完整 prompt
+- 引用的快取在伺服器端失效時，呼叫端 invalidate() 後改送完整 prompt
+"""
+import hashlib
+import threading
+import time
+
+from .compact import estimate_tokens
+from .http_client import cached_contents_url, post_json
+from .metrics import start_call
+
+CONTEXT_CACHE_TTL = 3600
+# 剩餘壽命少於此秒數就不再引用，改為重建，避免請求途中過期
+CONTEXT_CACHE_REFRESH_MARGIN = 300
+# 建立失敗後多久內不再嘗試
+CONTEXT_CACHE_RETRY_AFTER = 600
+# 其他執行緒正在建立同一份快取時，最多等多久（秒）；逾時就先送完整 prompt
+CONTEXT_CACHE_WAIT = 30
+# cachedContents 的最小 token 數（依模型名稱前綴），低於此值建立必定失敗
+CONTEXT_CACHE_MIN_TOKENS = {"gemini-2.5-pro": 4096}
+CONTEXT_CACHE_DEFAULT_MIN_TOKENS = 1024
+
+_entries = {}
+_failures = {}
+# key → 建立中的 threading.Event（建立完成即 set 並移除）
+_pending = {}
+_lock = threading.Lock()
+
+
+def _min_tokens(model):
+    for name, tokens in CONTEXT_CACHE_MIN_TOKENS.items():
+        if model.startswith(name):
+            return tokens
+    return CONTEXT_CACHE_DEFAULT_MIN_TOKENS
+
+
+def _key(api_key, model, prefix):
+    h = hashlib.sha256()
+    for part in (api_key, model, prefix):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _create(api_key, model, prefix):
+    """建立 cachedContent，成功回傳資源名稱（cachedContents/...），失敗回傳 None。"""
+    payload = {
+        "model": f"models/{model}",
+        "contents": [{"role": "user", "parts": [{"text": prefix}]}],
+        "ttl": f"{CONTEXT_CACHE_TTL}s",
+    }
+    call = start_call("context_cache", model, prefix)
+    try:
+        resp = post_json(cached_contents_url(api_key), payload, retries=1)
+        call.response(resp)
+        if not resp.ok:
+            call.finish(error=f"HTTP {resp.status_code}")
+            return None
+        name = resp.json().get("name")
+    except Exception as e:
+        call.fail(e)
+        return None
+    call.finish(error=None if name else "empty")
+    return name
+
+
+def get_cached_content(api_key, model, prefix):
+    """回傳可引用的 cachedContent 名稱；無法使用脈絡快取時回傳 None（呼叫端改送完整 prompt）。"""
+    if estimate_tokens(prefix) < _min_tokens(model):
+        return None
+    key = _key(api_key, model, prefix)
+    waited = False
+    while True:
+        now = time.monotonic()
+        with _lock:
+            entry = _entries.get(key)
+            if entry is not None and entry[1] - now > CONTEXT_CACHE_REFRESH_MARGIN:
+                return entry[0]
+            if _failures.get(key, 0) > now:
+                return None
+            pending = _pending.get(key)
+            if pending is None:
+                pending = _pending[key] = threading.Event()
+                break
+        # 別的執行緒正在建立：等它完成後重新查表；只等一輪，逾時或仍無結果就送完整 prompt
+        if waited or not pending.wait(CONTEXT_CACHE_WAIT):
+            return None
+        waited = True
+    # 建立請求在鎖外進行，期間同一 key 的其他呼叫端在上面等待
+    name = None
+    try:
+        name = _create(api_key, model, prefix)
+    finally:
+        with _lock:
+            if name:
+                _entries[key] = (name, now + CONTEXT_CACHE_TTL)
+                _failures.pop(key, None)
+            else:
+                _entries.pop(key, None)
+                _failures[key] = now + CONTEXT_CACHE_RETRY_AFTER
+            _pending.pop(key, None)
+        pending.set()
+    return name
+
+
+def invalidate(api_key, model, prefix):
+    """伺服器回報引用的快取無效時呼叫：丟掉本地紀錄，下次重新建立。"""
+    with _lock:
+        _entries.pop(_key(api_key, model, prefix), None)
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+        _failures.clear()
+        _pending.clear()
@@ -0,0 +1,200 @@
+"""
+[勝率模擬] Hero 手牌對一個範圍（例如 UTG 開池範圍）的蒙地卡羅勝率，給教練的「系統判定事實」使用。
+- 範圍用常見寫法："77+, ATs+, KQo, A5s-A2s, AhKh"；各位置的預設開池範圍見 OPEN_RANGES
+- 每批以 NumPy 一次發出數萬組（對手組合, 剩餘公牌），兩邊都用 evaluate_batch 評估，不逐手迴圈
+- 精度 / 時間預算：最多 samples 次；標準誤差低於 target_stderr 或超過 time_budget 秒即提早停止
+- 固定 seed 且不設 time_budget 時結果可重現（prompt 內容不變，回應快取才會命中）
+- 以 (手牌, 範圍, 公牌, 精度設定) 記憶結果；範圍以文字給定時先做花色正規化，花色同構的查詢共用一筆
+精確列舉見 core.allin_ev；牌力評估見 core.evaluator。
+"""
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from .evaluator import RANKS, SUITS, card_index, evaluate_batch, parse_cards
+
+EQUITY_SAMPLES = 200_000
+EQUITY_BATCH = 50_000
+# 勝率的標準誤差低於此值即停止（0.0025 ≈ 95% 信賴區間 ±0.5%）
+EQUITY_TARGET_STDERR = 0.0025
+EQUITY_CACHE_SIZE = 1024
+
+# 8-max 錦標賽常見的開池（RFI）範圍；BB 或無法判定位置時用 DEFAULT_OPEN_POSITION
+OPEN_RANGES = {
+    "UTG": "77+, ATs+, KTs+, QTs+, JTs, T9s, AJo+, KQo",
+    "UTG+1": "66+, A9s+, KTs+, QTs+, JTs, T9s, 98s, ATo+, KJo+",
+    "MP": "55+, A7s+, A5s, K9s+, Q9s+, J9s+, T9s, 98s, 87s, ATo+, KJo+, QJo",
+    "HJ": "44+, A2s+, K9s+, Q9s+, J9s+, T8s+, 98s, 87s, 76s, A9o+, KTo+, QTo+, JTo",
+    "CO": "22+, A2s+, K6s+, Q8s+, J8s+, T8s+, 97s+, 86s+, 75s+, 65s, 54s, A7o+, K9o+, Q9o+, J9o+, T9o",
+    "BTN": "22+, A2s+, K2s+, Q5s+, J7s+, T7s+, 96s+, 85s+, 74s+, 64s+, 53s+, A2o+, K8o+, Q9o+, J9o+, T8o+, 98o",
+    "SB": "22+, A2s+, K4s+, Q7s+, J7s+, T7s+, 96s+, 86s+, 75s+, 65s, 54s, A4o+, K9o+, QTo+, JTo",
+}
+DEFAULT_OPEN_POSITION = "MP"
+
+
+def _rank(ch):
+    if ch.upper() not in RANKS:
+        raise ValueError(f"無法辨識的點數: {ch!r}")
+    return RANKS.index(ch.upper())
+
+
+def class_combos(high, low, kind):
+    """點數 high ≥ low（0～12）與種類（"s" 同花 / "o" 不同花 / "" 兩者皆是）→ 所有兩張牌組合。"""
+    combos = []
+    for s1 in range(4):
+        for s2 in range(4):
+            if high == low and s2 <= s1:
+                continue
+            if high != low and (kind == "s" and s1 != s2 or kind == "o" and s1 == s2):
+                continue
+            a, b = high * 4 + s1, low * 4 + s2
+            combos.append((min(a, b), max(a, b)))
+    return combos
+
+
+def _token_classes(token):
+    """單一範圍片段 → [(high, low, kind)]；支援 "AKs"、"77+"、"ATs+"、"A5s-A2s"、"99-66"。"""
+    if "-" in token:
+        first, last = token.split("-", 1)
+        (h1, l1, k1), (h2, l2, k2) = _parse_class(first), _parse_class(last)
+        if h1 == l1 and h2 == l2:
+            return [(r, r, "") for r in range(min(h1, h2), max(h1, h2) + 1)]
+        if h1 != h2 or k1 != k2:
+            raise ValueError(f"範圍兩端需同一高張與種類: {token!r}")
+        return [(h1, low, k1) for low in range(min(l1, l2), max(l1, l2) + 1)]
+    plus = token.endswith("+")
+    high, low, kind = _parse_class(token.rstrip("+"))
+    if not plus:
+        return [(high, low, kind)]
+    if high == low:
+        return [(r, r, "") for r in range(high, 13)]
+    return [(high, r, kind) for r in range(low, high)]
+
+
+def _parse_class(text):
+    if len(text) not in (2, 3) or (len(text) == 3 and text[2].lower() not in "so"):
+        raise ValueError(f"無法辨識的範圍片段: {text!r}")
+    a, b = _rank(text[0]), _rank(text[1])
+    kind = text[2].lower() if len(text) == 3 else ""
+    return max(a, b), min(a, b), "" if a == b else kind
+
+
+def _is_combo_token(token):
+    """單一組合的寫法，例如 "AhKh"。"""
+    return len(token) == 4 and token[1].lower() in SUITS and token[3].lower() in SUITS
+
+
+def parse_range(text):
+    """範圍文字 → 排序後不重複的兩張牌組合 list [(c1, c2), ...]（c1 < c2）。無法辨識時拋出 ValueError。"""
+    combos = set()
+    for token in text.replace(";", ",").replace(" ", ",").split(","):
+        if not token:
+            continue
+        if _is_combo_token(token):
+            a, b = card_index(token[:2]), card_index(token[2:])
+            if a == b:
+                raise ValueError(f"重複的牌: {token!r}")
+            combos.add((min(a, b), max(a, b)))
+            continue
+        for high, low, kind in _token_classes(token):
+            combos.update(class_combos(high, low, kind))
+    return sorted(combos)
+
+
+def _canonical(hero, board):
+    """依花色第一次出現的順序重新編號 Hero 手牌與公牌（範圍本身花色對稱時才可用）。"""
+    mapping = {}
+    for c in list(hero) + list(board):
+        mapping.setdefault(c & 3, len(mapping))
+    return (
+        tuple(sorted(c & ~3 | mapping[c & 3] for c in hero)),
+        tuple(sorted(c & ~3 | mapping[c & 3] for c in board)),
+    )
+
+
+def _distinct_picks(rng, rows, n, k):
+    """每列從 0～n-1 取 k 個不重複的索引：第 j 個從 n-j 個中抽，再依序跳過已抽到的值。"""
+    picks = np.empty((rows, k), dtype=np.int64)
+    for j in range(k):
+        r = rng.integers(n - j, size=rows)
+        taken = np.sort(picks[:, :j], axis=1)
+        for t in range(j):
+            r += r >= taken[:, t]
+        picks[:, j] = r
+    return picks
+
+
+@lru_cache(maxsize=EQUITY_CACHE_SIZE)
+def _simulate(hero, combos, board, samples, target_stderr, time_budget, seed):
+    dead = set(hero) | set(board)
+    combos = np.array([c for c in combos if not dead.intersection(c)], dtype=np.int64).reshape(-1, 2)
+    if not len(combos):
+        raise ValueError("範圍內的組合全部被 Hero 手牌或公牌擋住")
+    deck = np.array([c for c in range(52) if c not in dead], dtype=np.int64)
+    # live_deck[i] = 扣掉第 i 個對手組合後剩下的牌
+    live = (deck != combos[:, :1]) & (deck != combos[:, 1:])
+    live_deck = np.broadcast_to(deck, live.shape)[live].reshape(len(combos), len(deck) - 2)
+    missing = 5 - len(board)
+    hero = np.array(hero, dtype=np.int64)
+    board = np.array(board, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    deadline = time.perf_counter() + time_budget if time_budget else None
+    wins = ties = done = 0
+    stderr = 0.0
+    while done < samples:
+        rows = len(combos) if missing == 0 else min(EQUITY_BATCH, samples - done)
+        # 河牌時沒有公牌可抽，每個對手組合各評估一次即為精確值
+        villain = np.arange(rows) if missing == 0 else rng.integers(len(combos), size=rows)
+        runout = live_deck[villain[:, None], _distinct_picks(rng, rows, live_deck.shape[1], missing)]
+        full_board = np.concatenate([np.broadcast_to(board, (rows, len(board))), runout], axis=1)
+        hero_values = evaluate_batch(np.concatenate([np.broadcast_to(hero, (rows, 2)), full_board], axis=1))
+        villain_values = evaluate_batch(np.concatenate([combos[villain], full_board], axis=1))
+        wins += int((hero_values > villain_values).sum())
+        ties += int((hero_values == villain_values).sum())
+        done += rows
+        if missing == 0:
+            break
+        equity = (wins + ties / 2) / done
+        # 每次結果為 1 / 0.5 / 0，平方和 = wins + ties / 4
+        stderr = max((wins + ties / 4) / done - equity * equity, 0.0) ** 0.5 / done ** 0.5
+        if stderr <= target_stderr or (deadline is not None and time.perf_counter() >= deadline):
+            break
+    return {
+        "equity": (wins + ties / 2) / done,
+        "win": wins / done,
+        "tie": ties / done,
+        "samples": done,
+        "stderr": stderr,
+        "combos": len(combos),
+        "exact": missing == 0,
+    }
+
+
+def equity_vs_range(hero_cards, villain_range, board=(), samples=EQUITY_SAMPLES,
+                    target_stderr=EQUITY_TARGET_STDERR, time_budget=None, seed=0):
+    """
+    Hero 手牌對 villain_range 的勝率（平手算一半），回傳 dict：
+    equity、win、tie、samples（實際模擬次數）、stderr、combos（扣掉阻擋牌後的對手組合數）、exact（河牌時為精確值）。
+    hero_cards / board 可為 "Ah Kd" 字串或整數 list；villain_range 為範圍文字或 [(c1, c2), ...]。
+    同樣的查詢直接回傳記憶的結果（呼叫端請勿修改回傳的 dict）。
+    """
+    hero = parse_cards(hero_cards) if isinstance(hero_cards, str) else list(hero_cards)
+    board = parse_cards(board) if isinstance(board, str) else list(board)
+    if len(hero) != 2 or len(board) > 5 or len(board) in (1, 2):
+        raise ValueError("需要 2 張手牌與 0、3、4 或 5 張公牌")
+    if len(set(hero) | set(board)) != len(hero) + len(board):
+        raise ValueError("手牌與公牌有重複的牌")
+    if isinstance(villain_range, str):
+        combos = tuple(parse_range(villain_range))
+        if not any(_is_combo_token(token) for token in villain_range.replace(" ", ",").split(",")):
+            # 只用點數寫法的範圍對花色對稱，可把 Hero / 公牌的花色正規化後共用記憶
+            hero, board = _canonical(hero, board)
+    else:
+        combos = tuple(sorted((min(a, b), max(a, b)) for a, b in villain_range))
+    return _simulate(tuple(hero), combos, tuple(board), samples, target_stderr, time_budget, seed)
+
+
+def open_range(position):
+    """位置（calculate_position 的結果）→ 該位置的預設開池範圍文字。"""
+    return OPEN_RANGES.get(position, OPEN_RANGES[DEFAULT_OPEN_POSITION])
@@ -0,0 +1,142 @@
+"""
+[手牌紀錄] 解析後單手牌的資料型別。
+Hand 以 __slots__ 儲存，取代原本每手一個 22 鍵的 dict：
+- 只存解析得到的原始欄位；由底牌衍生的欄位（emoji、牌型、同花/對子…）在讀取時才計算
+- 衍生結果依底牌字串快取，同樣的 1326 種起手牌共用同一組值
+- 保留 dict 風格的 h["key"] / h.get("key") / h["display_index"] = i，app.py 與 coach 不需改動
+"""
+from collections.abc import Mapping
+from functools import lru_cache
+import sys
+
+SUIT_EMOJI = {'c': '♣️', 's': '♠️', 'h': '♥️', 'd': '♦️'}
+_RANK_ORDER = "AKQJT98765432"
+_BROADWAY_RANKS = "AKQJT"
+
+# 與原 dict 相同的鍵順序；display_index 由 app.py 事後指定
+_KEYS = (
+    "id", "content", "vpip", "pfr", "bb", "hero", "hero_cards", "hero_cards_emoji",
+    "is_suited", "hand_type", "pot_size", "position", "villain_seat", "relative_pos_str",
+    "result", "is_winner", "total_pot", "bb_size", "is_pair", "is_ax", "is_broadway",
+    "position_name",
+)
+_DERIVED = frozenset(("hero_cards_emoji", "is_suited", "hand_type", "is_pair", "is_ax", "is_broadway", "is_winner", "total_pot"))
+
+
+@lru_cache(maxsize=None)
+def _card_facts(hero_cards):
+    """
+    由底牌字串（如 "Ah Ks"）計算 (hero_cards_emoji, is_suited, hand_type, is_pair, is_ax, is_broadway)。
+    """
+    is_suited = False
+    hand_type = None
+    is_pair = False
+    is_ax = False
+    is_broadway = False
+    hero_cards_emoji = "Unknown"
+    if hero_cards:
+        cards = hero_cards.split()
+        if len(cards) >= 2:
+            suit1, suit2 = cards[0][-1].lower(), cards[1][-1].lower()
+            is_suited = (suit1 == suit2)
+            r1, r2 = cards[0][:-1].upper(), cards[1][:-1].upper()
+            is_pair = (r1 == r2)
+            is_ax = (r1 == "A" or r2 == "A")
+            is_broadway = (r1 in _BROADWAY_RANKS and r2 in _BROADWAY_RANKS)
+            if r1 not in _RANK_ORDER or r2 not in _RANK_ORDER:
+                hand_type = f"{r1}{r2}{'s' if is_suited else 'o'}"
+            else:
+                high, low = (r1, r2) if _RANK_ORDER.index(r1) < _RANK_ORDER.index(r2) else (r2, r1)
+                hand_type = f"{high}{low}{'s' if is_suited else 'o'}"
+        emoji_parts = [f"{c[:-1]}{SUIT_EMOJI.get(c[-1].lower(), c[-1])}" for c in cards if len(c) >= 2]
+        hero_cards_emoji = " ".join(emoji_parts) if emoji_parts else "Unknown"
+    return hero_cards_emoji, is_suited, hand_type, is_pair, is_ax, is_broadway
+
+
+class Hand(Mapping):
+    """解析後的一手牌。欄位與舊版 dict 相同，可用 h["vpip"]、h.get("pot_size", 0) 讀取。"""
+
+    __slots__ = (
+        "id", "content", "vpip", "pfr", "bb", "hero", "hero_cards", "pot_size", "position",
+        "villain_seat", "relative_pos_str", "result", "bb_size", "position_name", "display_index",
+    )
+
+    def __init__(self, id, content, vpip, pfr, bb, hero, hero_cards, pot_size, position,
+                 villain_seat, relative_pos_str, result, bb_size, position_name):
+        self.id = id
+        self.content = content
+        self.vpip = vpip
+        self.pfr = pfr
+        self.bb = bb
+        # 同一份檔案裡 hero 名稱幾乎都相同，intern 後所有手牌共用同一個字串
+        self.hero = sys.intern(hero)
+        self.hero_cards = hero_cards
+        self.pot_size = pot_size
+        self.position = position
+        self.villain_seat = villain_seat
+        self.relative_pos_str = relative_pos_str
+        self.result = result
+        self.bb_size = bb_size
+        self.position_name = position_name
+
+    # --- 衍生欄位：讀取時才計算 ---
+    @property
+    def hero_cards_emoji(self):
+        return _card_facts(self.hero_cards)[0]
+
+    @property
+    def is_suited(self):
+        return _card_facts(self.hero_cards)[1]
+
+    @property
+    def hand_type(self):
+        return _card_facts(self.hero_cards)[2]
+
+    @property
+    def is_pair(self):
+        return _card_facts(self.hero_cards)[3]
+
+    @property
+    def is_ax(self):
+        return _card_facts(self.hero_cards)[4]
+
+    @property
+    def is_broadway(self):
+        return _card_facts(self.hero_cards)[5]
+
+    @property
+    def is_winner(self):
+        return self.result == "win"
+
+    @property
+    def total_pot(self):
+        return self.pot_size
+
+    # --- dict 相容介面 ---
+    def __getitem__(self, key):
+        if key in _KEYS or key == "display_index":
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in _DERIVED or not (key in _KEYS or key == "display_index"):
+            raise KeyError(f"Hand 不支援寫入欄位: {key}")
+        setattr(self, key, value)
+
+    def __iter__(self):
+        yield from _KEYS
+        if hasattr(self, "display_index"):
+            yield "display_index"
+
+    def __len__(self):
+        return len(_KEYS) + hasattr(self, "display_index")
+
+    def __repr__(self):
+        return f"Hand(id={self.id!r}, hero_cards={self.hero_cards!r}, position={self.position!r}, result={self.result!r})"
+
+    def to_dict(self):
+        """轉回舊版的一般 dict。"""
+        return dict(self.items())
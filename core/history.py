@@ -3,6 +3,9 @@
 """
 import streamlit as st
 
+from .chat_memory import ChatMemory
+from .prefetch import PrefetchQueue
+
 
 def get_api_key():
     return st.session_state.get("api_key")
@@ -24,3 +27,18 @@ def ensure_session_defaults():
     """確保 use_demo 等鍵存在（主程式啟動時呼叫一次）。"""
     if "use_demo" not in st.session_state:
         st.session_state.use_demo = False
+
+
+def get_prefetch_queue():
+    """本 session 的背景預先分析佇列（第一次呼叫時建立）。"""
+    if "prefetch_queue" not in st.session_state:
+        st.session_state["prefetch_queue"] = PrefetchQueue()
+    return st.session_state["prefetch_queue"]
+
+
+def get_chat_memory(hand_id):
+    """鎖定手牌 hand_id 的對話紀錄（每手牌各一份，第一次呼叫時建立）。"""
+    memories = st.session_state.setdefault("chat_memories", {})
+    if hand_id not in memories:
+        memories[hand_id] = ChatMemory()
+    return memories[hand_id]
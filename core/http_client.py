@@ -0,0 +1,159 @@
+"""
+[HTTP 連線] Gemini API 共用的連線池 client。
+- 整個程序共用一個 requests.Session：keep-alive 重用 TCP/TLS 連線，不必每次分析都重新握手
+- 連線逾時與讀取逾時分開設定，卡住的請求不會讓 Streamlit worker 永遠等下去
+- 429 / 5xx 與連線失敗以指數退避 + full jitter 重試；伺服器給 Retry-After 時照著等
+- 串流（streamGenerateContent?alt=sse）共用同一個 Session；讀取逾時對每個 chunk 之間的間隔生效
+- API 位址可用環境變數 GEMINI_API_BASE 指向本機替身伺服器（見 bench/fake_gemini.py）離線驗證
+"""
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+GEMINI_API_BASE = os.environ.get("GEMINI_API_BASE", "https://generativelanguage.googleapis.com/v1beta")
+# (連線逾時, 讀取逾時) 秒；長篇賽後總結可能要生成數十秒
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 120.0
+# 第一次之外最多再試幾次；每次等待 uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**n)) 秒
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+RETRY_STATUS = frozenset((429, 500, 502, 503, 504))
+POOL_SIZE = 10
+# 批次呼叫（如一次分析多手漏洞）時的速率上限：每秒請求數與瞬間可連發數
+BATCH_RATE_PER_SEC = 2.0
+BATCH_BURST = 4
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """取得共用 Session（第一次呼叫時建立）。"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # 重試由 post_json 自行處理，adapter 本身不重試
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"Content-Type": "application/json"})
+                _session = session
+    return _session
+
+
+def close_session():
+    """關閉共用 Session 釋放連線池；下次呼叫 get_session 會重新建立。"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def _retry_after(resp):
+    """Retry-After 標頭（秒數格式）；沒有或無法解析時回傳 None。"""
+    value = resp.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    """第 attempt 次重試前的等待秒數（full jitter）。"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def post_json(url, payload, timeout=None, retries=MAX_RETRIES, **kwargs):
+    """
+    POST JSON 並回傳 Response。429 / 5xx 與連線失敗（含連線逾時）會重試；
+    重試用盡時回傳最後一個 Response，若最後一次仍是連線錯誤則拋出該例外。
+    timeout 預設為 (CONNECT_TIMEOUT, READ_TIMEOUT)。
+    回傳的 Response（或重試用盡時拋出的連線例外）帶有 retry_count 屬性，供 core.metrics 記錄。
+    """
+    timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+    data = json.dumps(payload)
+    session = get_session()
+    for attempt in range(retries + 1):
+        try:
+            resp = session.post(url, data=data, timeout=timeout, **kwargs)
+        except requests.ConnectionError as e:
+            # 含 ConnectTimeout；讀取逾時（ReadTimeout）代表伺服器已在處理，不重送
+            if attempt == retries:
+                e.retry_count = attempt
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+        if resp.status_code not in RETRY_STATUS or attempt == retries:
+            resp.retry_count = attempt
+            return resp
+        wait = _retry_after(resp)
+        resp.close()
+        time.sleep(min(wait, BACKOFF_MAX) if wait is not None else backoff_delay(attempt))
+    return resp
+
+
+class RateLimiter:
+    """
+    執行緒安全的 token bucket：每秒補充 rate 個 token，最多累積 burst 個。
+    acquire() 在 token 不足時阻塞到可用為止。
+    """
+
+    def __init__(self, rate=BATCH_RATE_PER_SEC, burst=BATCH_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def iter_sse_json(resp):
+    """
+    逐一產出 server-sent events 中 data: 行的 JSON。
+    非 2xx 狀態碼時先讀完錯誤內容再拋出 requests.HTTPError。
+    """
+    with resp:
+        if not resp.ok:
+            try:
+                message = resp.json()["error"]["message"]
+            except Exception:
+                message = resp.text[:200]
+            raise requests.HTTPError(f"{resp.status_code}: {message}", response=resp)
+        # 以 bytes 逐行讀再 decode，多位元組字元不會被 chunk 邊界切斷
+        for line in resp.iter_lines():
+            if not line.startswith(b"data:"):
+                continue
+            data = line[5:].strip()
+            if data:
+                yield json.loads(data.decode("utf-8"))
+
+
+def gemini_url(model, api_key, method="generateContent"):
+    url = f"{GEMINI_API_BASE}/models/{model}:{method}?key={api_key}"
+    if method == "streamGenerateContent":
+        url += "&alt=sse"
+    return url
+
+
+def cached_contents_url(api_key):
+    return f"{GEMINI_API_BASE}/cachedContents?key={api_key}"
@@ -0,0 +1,152 @@
+"""
+[回應快取] LLM 回覆的磁碟快取（SQLite），同一手牌重複分析時直接回傳，不再呼叫 Gemini。
+- key = (model, temperature, prompt) 的 SHA-256；prompt 是確定性組出來的，相同手牌必得相同 key
+- 超過 TTL 的項目視為不存在；總容量超過上限時從最久未讀取的開始刪
+- 只快取成功的回覆（錯誤訊息不寫入），命中 / 未命中次數記在程序內
+- 檔案位於 data/llm_cache.sqlite3，WAL 模式，多個 Streamlit 程序可同時讀寫
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+LLM_CACHE_PATH = Path(__file__).resolve().parent.parent / "data" / "llm_cache.sqlite3"
+LLM_CACHE_TTL = 7 * 24 * 3600
+LLM_CACHE_MAX_BYTES = 64 << 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+def response_key(model, temperature, prompt):
+    raw = json.dumps([model, round(float(temperature), 4), prompt], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite 回應快取；所有操作失敗時都當作未命中，不影響分析流程。"""
+
+    def __init__(self, path=LLM_CACHE_PATH, ttl=LLM_CACHE_TTL, max_bytes=LLM_CACHE_MAX_BYTES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT response FROM responses WHERE key = ? AND created >= ?", (key, now - self.ttl)
+                ).fetchone()
+                if row is not None:
+                    conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            except (sqlite3.Error, OSError):
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def contains(self, key):
+        """是否有未過期的項目（不計入命中 / 未命中，也不更新讀取時間）。"""
+        with self._lock:
+            try:
+                row = self._connect().execute(
+                    "SELECT 1 FROM responses WHERE key = ? AND created >= ?", (key, time.time() - self.ttl)
+                ).fetchone()
+            except (sqlite3.Error, OSError):
+                row = None
+        return row is not None
+
+    def put(self, key, model, response):
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, response, size, created, accessed) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, response, size, now, now),
+                )
+                self._evict(conn, now)
+            except (sqlite3.Error, OSError):
+                pass
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def stats(self):
+        """{"hits", "misses", "entries", "bytes"}；讀不到檔案時 entries / bytes 為 0。"""
+        with self._lock:
+            try:
+                entries, size = self._connect().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+            except (sqlite3.Error, OSError):
+                entries, size = 0, 0
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+    def clear(self):
+        with self._lock:
+            try:
+                self._connect().execute("DELETE FROM responses")
+            except (sqlite3.Error, OSError):
+                pass
+            self.hits = 0
+            self.misses = 0
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_response_cache = ResponseCache()
+
+
+def has_cached_response(model, temperature, prompt):
+    """這組 (模型, 溫度, prompt) 是否已有未過期的回應（不計入命中統計）。"""
+    return _response_cache.contains(response_key(model, temperature, prompt))
@@ -0,0 +1,287 @@
+"""
+[儀表板] 每一次 LLM 呼叫的延遲與 token 紀錄，存在程序內的 registry。
+- 每筆紀錄：種類、模型、prompt 字元 / token、回應 token、首位元組時間、總延遲、HTTP 狀態、重試次數、快取命中、錯誤類別
+- token 數優先採用 Gemini 回傳的 usageMetadata，沒有時以 core.compact.estimate_tokens 估算
+- 依 (種類, 模型) 累計次數、錯誤、token、延遲分布，可輸出 Prometheus text format
+- 設定環境變數 POKER_METRICS_PORT 時，start_metrics_server() 在背景提供 /metrics 供 Prometheus 抓取；
+  預設只綁 127.0.0.1，需要讓其他主機抓取時以 POKER_METRICS_HOST 指定（例如 0.0.0.0）
+"""
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .compact import estimate_tokens
+
+# 保留最近幾筆呼叫明細（除錯面板用）
+METRICS_KEEP_CALLS = 200
+# 延遲分布的上界（秒）
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 60.0)
+METRICS_PREFIX = "poker_llm"
+# /metrics 預設綁定的位址（POKER_METRICS_HOST 可覆寫）
+METRICS_DEFAULT_HOST = "127.0.0.1"
+
+
+class CallRecord:
+    """單次 LLM 呼叫的量測；由 start_call() 建立，呼叫端結束時 finish()。"""
+
+    __slots__ = (
+        "kind", "model", "started_at", "prompt_chars", "prompt_tokens", "response_tokens", "cached_tokens",
+        "ttfb", "latency", "status", "retries", "cache_hit", "context_cache", "error", "_t0",
+    )
+
+    def __init__(self, kind, model, prompt_text):
+        self.kind = kind
+        self.model = model
+        self.started_at = time.time()
+        self.prompt_chars = len(prompt_text)
+        self.prompt_tokens = estimate_tokens(prompt_text)
+        self.response_tokens = 0
+        self.cached_tokens = 0
+        self.ttfb = None
+        self.latency = None
+        self.status = None
+        self.retries = 0
+        self.cache_hit = False
+        self.context_cache = None
+        self.error = None
+        self._t0 = time.perf_counter()
+
+    def first_byte(self):
+        """收到第一段回應時呼叫（只記第一次）。"""
+        if self.ttfb is None:
+            self.ttfb = time.perf_counter() - self._t0
+
+    def response(self, resp):
+        """記下 HTTP 狀態、重試次數與脈絡快取狀態（見 core.http_client.post_json / core.coach._post_prompt）。"""
+        self.status = resp.status_code
+        self.retries += getattr(resp, "retry_count", 0)
+        self.context_cache = getattr(resp, "context_cache", None)
+
+    def usage(self, usage_metadata):
+        """套用 Gemini 的 usageMetadata（prompt / 回應 / 脈絡快取 token 數）。"""
+        if not usage_metadata:
+            return
+        self.prompt_tokens = usage_metadata.get("promptTokenCount", self.prompt_tokens)
+        self.response_tokens = usage_metadata.get("candidatesTokenCount", self.response_tokens)
+        self.cached_tokens = usage_metadata.get("cachedContentTokenCount", self.cached_tokens)
+
+    def finish(self, response_text="", error=None, cache_hit=False):
+        """結束量測並寫入 registry；error 為錯誤類別字串（例如 "HTTP 429"、"ReadTimeout"）。"""
+        # 非串流呼叫拿不到首位元組時間，ttfb 維持 None，不混進首位元組時間的統計
+        self.latency = time.perf_counter() - self._t0
+        if not self.response_tokens and response_text:
+            self.response_tokens = estimate_tokens(response_text)
+        self.cache_hit = cache_hit
+        self.error = error
+        _registry.record(self)
+        return self
+
+    def fail(self, exc, response_text=""):
+        """以例外結束量測；連線失敗重試用盡時，例外上帶有 retry_count。"""
+        self.retries += getattr(exc, "retry_count", 0)
+        return self.finish(response_text, error=error_label(exc))
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if not name.startswith("_")}
+
+
+def error_label(exc):
+    """例外 → 錯誤類別字串；HTTP 錯誤帶上狀態碼。"""
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    return f"HTTP {status}" if status else type(exc).__name__
+
+
+class _Series:
+    __slots__ = ("calls", "errors", "cache_hits", "retries", "prompt_tokens", "response_tokens",
+                 "cached_tokens", "latency_sum", "latency_buckets", "ttfb_sum", "ttfb_count")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self.cached_tokens = 0
+        self.latency_sum = 0.0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.ttfb_sum = 0.0
+        self.ttfb_count = 0
+
+
+class MetricsRegistry:
+    """執行緒安全的呼叫紀錄：最近 keep 筆明細 + 依 (種類, 模型) 的累計值。"""
+
+    def __init__(self, keep=METRICS_KEEP_CALLS):
+        self._recent = deque(maxlen=keep)
+        self._series = {}
+        self._statuses = {}
+        self._lock = threading.Lock()
+
+    def record(self, call):
+        key = (call.kind, call.model)
+        with self._lock:
+            self._recent.append(call)
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = _Series()
+            s.calls += 1
+            s.errors += call.error is not None
+            s.cache_hits += call.cache_hit
+            s.retries += call.retries
+            s.prompt_tokens += call.prompt_tokens
+            s.response_tokens += call.response_tokens
+            s.cached_tokens += call.cached_tokens
+            s.latency_sum += call.latency
+            bucket = next((i for i, le in enumerate(LATENCY_BUCKETS) if call.latency <= le), len(LATENCY_BUCKETS))
+            s.latency_buckets[bucket] += 1
+            if call.ttfb is not None and not call.cache_hit:
+                s.ttfb_sum += call.ttfb
+                s.ttfb_count += 1
+            status = "cache" if call.cache_hit else str(call.status or call.error or "none")
+            self._statuses[key + (status,)] = self._statuses.get(key + (status,), 0) + 1
+
+    def recent(self, limit=50):
+        """最近 limit 筆明細（新的在前），每筆為 dict。"""
+        with self._lock:
+            calls = list(self._recent)[-limit:]
+        return [c.as_dict() for c in reversed(calls)]
+
+    def summary(self):
+        """依 (種類, 模型) 彙總：次數、錯誤、快取命中、平均延遲 / 首位元組時間、p95 延遲（取自最近明細）、token 合計。"""
+        with self._lock:
+            series = {k: _copy_series(s) for k, s in self._series.items()}
+            recent = list(self._recent)
+        rows = []
+        for (kind, model), s in sorted(series.items()):
+            latencies = sorted(c.latency for c in recent if c.kind == kind and c.model == model and not c.cache_hit)
+            rows.append({
+                "kind": kind,
+                "model": model,
+                "calls": s.calls,
+                "errors": s.errors,
+                "cache_hits": s.cache_hits,
+                "retries": s.retries,
+                "avg_latency": round(s.latency_sum / s.calls, 3),
+                "p95_latency": round(latencies[int(0.95 * (len(latencies) - 1))], 3) if latencies else None,
+                "avg_ttfb": round(s.ttfb_sum / s.ttfb_count, 3) if s.ttfb_count else None,
+                "prompt_tokens": s.prompt_tokens,
+                "response_tokens": s.response_tokens,
+                "cached_tokens": s.cached_tokens,
+            })
+        return rows
+
+    def prometheus_text(self, prefix=METRICS_PREFIX):
+        """Prometheus text exposition format（0.0.4）。"""
+        with self._lock:
+            series = {k: _copy_series(s) for k, s in self._series.items()}
+            statuses = dict(self._statuses)
+        out = []
+
+        def family(name, kind, help_text):
+            out.append(f"# HELP {prefix}_{name} {help_text}")
+            out.append(f"# TYPE {prefix}_{name} {kind}")
+
+        def labels(kind, model, **extra):
+            pairs = {"kind": kind, "model": model, **extra}
+            return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs.items()) + "}"
+
+        family("calls_total", "counter", "LLM calls by HTTP status (cache = served from the response cache).")
+        for (kind, model, status), n in sorted(statuses.items()):
+            out.append(f"{prefix}_calls_total{labels(kind, model, status=status)} {n}")
+        for name, attr, help_text in (
+            ("errors_total", "errors", "LLM calls that ended in an error."),
+            ("retries_total", "retries", "HTTP retries performed for LLM calls."),
+            ("prompt_tokens_total", "prompt_tokens", "Prompt tokens sent."),
+            ("response_tokens_total", "response_tokens", "Response tokens received."),
+            ("cached_tokens_total", "cached_tokens", "Prompt tokens served from Gemini context caching."),
+        ):
+            family(name, "counter", help_text)
+            for (kind, model), s in sorted(series.items()):
+                out.append(f"{prefix}_{name}{labels(kind, model)} {getattr(s, attr)}")
+        family("latency_seconds", "histogram", "Total LLM call latency.")
+        for (kind, model), s in sorted(series.items()):
+            cumulative = 0
+            for le, n in zip(LATENCY_BUCKETS + (float("inf"),), s.latency_buckets):
+                cumulative += n
+                bound = "+Inf" if le == float("inf") else f"{le:g}"
+                out.append(f"{prefix}_latency_seconds_bucket{labels(kind, model, le=bound)} {cumulative}")
+            out.append(f"{prefix}_latency_seconds_sum{labels(kind, model)} {s.latency_sum:.6f}")
+            out.append(f"{prefix}_latency_seconds_count{labels(kind, model)} {s.calls}")
+        family("ttfb_seconds", "summary", "Time to first response chunk (streaming network calls only).")
+        for (kind, model), s in sorted(series.items()):
+            out.append(f"{prefix}_ttfb_seconds_sum{labels(kind, model)} {s.ttfb_sum:.6f}")
+            out.append(f"{prefix}_ttfb_seconds_count{labels(kind, model)} {s.ttfb_count}")
+        return "\n".join(out) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._recent.clear()
+            self._series.clear()
+            self._statuses.clear()
+
+
+def _copy_series(s):
+    c = _Series()
+    for name in _Series.__slots__:
+        value = getattr(s, name)
+        setattr(c, name, list(value) if isinstance(value, list) else value)
+    return c
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_registry = MetricsRegistry()
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_call(kind, model, prompt_text):
+    return CallRecord(kind, model, prompt_text)
+
+
+def get_metrics():
+    return _registry
+
+
+def start_metrics_server(port=None, host=None):
+    """
+    在背景執行緒提供 GET /metrics（Prometheus text format）。
+    port 未指定時讀 POKER_METRICS_PORT，兩者皆無則不啟動；host 未指定時讀 POKER_METRICS_HOST，預設 127.0.0.1。
+    同一程序只啟動一次。回傳實際埠號或 None。
+    """
+    global _server
+    port = port if port is not None else os.environ.get("POKER_METRICS_PORT")
+    host = host or os.environ.get("POKER_METRICS_HOST") or METRICS_DEFAULT_HOST
+    if port in (None, ""):
+        return None
+    with _server_lock:
+        if _server is not None:
+            return _server.server_address[1]
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                data = _registry.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            _server = ThreadingHTTPServer((host, int(port)), Handler)
+        except (OSError, ValueError):
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server.server_address[1]
@@ -2,18 +2,32 @@
 [搬運工] 負責解析 PokerStars/GG 格式的手牌文字。
 所有依賴 re 正則表達式的手牌解析函數皆在此模組：
 - parse_hands(content) : 解析整份紀錄，回傳 (手牌列表, hero 名稱)
+- iter_hands(source) : 從檔案路徑 (mmap) 或二進位檔案物件 (分塊) 讀取，逐手產出解析結果
+- parse_hands_parallel(path, workers) : 大檔依手牌邊界切成位元組區段，多程序平行解析
 - load_content(uploaded_file) : 讀取上傳檔案內容
 - cards_to_emoji, calculate_position, distance_to_button : 輔助解析
 - render_hand_history_timeline : 將單手 log 轉成聊天風格 UI
 """
 import re
+import os
 import html
+import mmap
+import codecs
+from concurrent.futures import ProcessPoolExecutor
 import streamlit as st
 
+from .hand import Hand, SUIT_EMOJI
+
+# iter_hands 每次從檔案讀取的位元組數
+_READ_CHUNK_SIZE = 1 << 16
+# parse_hands_parallel：每個分片至少這麼大才值得開程序，否則直接單程序解析
+_MIN_SHARD_BYTES = 4 << 20
+
 
 def load_content(uploaded_file):
     if uploaded_file is not None:
-        return uploaded_file.getvalue().decode("utf-8")
+        uploaded_file.seek(0)
+        return "".join(_iter_text_chunks(uploaded_file))
     return None
 
 
@@ -37,9 +51,6 @@ def cards_to_emoji(cards_str):
     return " ".join(emoji_cards)
 
 
-SUIT_EMOJI = {'c': '♣️', 's': '♠️', 'h': '♥️', 'd': '♦️'}
-
-
 def _card_badge(card_str):
     """單張牌 → 帶顏色的 HTML badge。紅心/方塊紅，黑桃/梅花灰藍。"""
     card_str = card_str.strip()
@@ -236,153 +247,329 @@ def render_hand_history_timeline(hand_content, hero_name="Hero"):
     st.markdown("".join(out), unsafe_allow_html=True)
 
 
-def parse_hands(content):
+# --- 單次掃描 tokenizer：正則全部在 import 時編譯一次，不再依玩家名稱動態組 pattern ---
+_HAND_MARK = "Poker Hand #"
+_HAND_MARK_BYTES = _HAND_MARK.encode("utf-8")
+_FLOP_MARK = "*** FLOP ***"
+_HAND_ID_RE = re.compile(r"Poker Hand #(TM\d+|[A-Za-z0-9_]+):")
+_LEVEL_BB_RE = re.compile(r"Level\d+\([\d,]+/([\d,]+)\)")
+_POST_BB_RE = re.compile(r"posts big blind ([\d,]+)")
+_DEALT_RE = re.compile(r"Dealt to (\S+) \[([A-Za-z0-9]{2} [A-Za-z0-9]{2})\]")
+_SEAT_RE = re.compile(r"Seat (\d+):(?: (\S+)(?=\s))?")
+_SEAT_STACK_RE = re.compile(r" \(([\d,]+)(?: in chips)?\)")
+_BUTTON_IN_SEAT_RE = re.compile(r"The button is in seat #(\d+)")
+_SEAT_IS_BUTTON_RE = re.compile(r"Seat #(\d+) is the button")
+_TOTAL_POT_RE = re.compile(r"Total pot ([\d,]+)")
+_COLLECTED_RE = re.compile(r"collected ([\d,]+) from pot")
+_WON_RE = re.compile(r"won \(([\d,]+)\)")
+_WIN_WORDS = ("collected", "won", "wins", "matches")
+_DIST_TO_NAME = {0: "BTN", 1: "SB", 2: "BB", 3: "UTG", 4: "UTG+1", 5: "MP", 6: "MP+1", 7: "CO"}
+
+
+def _iter_text_chunks(source, chunk_size=_READ_CHUNK_SIZE):
     """
-    專為 GGPoker 格式設計的手牌解析器。
+    分塊讀取檔案物件，以 UTF-8 增量解碼後逐塊產出字串。
+    跨塊被切斷的多位元組字元由增量解碼器自動接回。
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        text = chunk if isinstance(chunk, str) else decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _iter_raw_hands(text_chunks):
+    """
+    依 "Poker Hand #" 增量切段（等同對整份文字做 re.split(r"(?=Poker Hand #)")）。
+    緩衝區只保留尚未遇到下一個分隔點的那一手，跨塊的分隔字串也能正確辨識。
     """
-    raw_hands = re.split(r"(?=Poker Hand #)", content)
-    parsed_hands = []
-    detected_hero = None
+    buf = ""
+    search_from = 0
+    for chunk in text_chunks:
+        buf += chunk
+        start = 0
+        pos = buf.find(_HAND_MARK, search_from)
+        while pos != -1:
+            yield buf[start:pos]
+            start = pos
+            pos = buf.find(_HAND_MARK, pos + 1)
+        buf = buf[start:]
+        # 下一塊接上後，分隔字串可能橫跨舊尾端；緩衝區開頭若已是分隔點則不可重複切
+        search_from = max(len(buf) - len(_HAND_MARK) + 1, 1 if buf.startswith(_HAND_MARK) else 0)
+    yield buf
+
+
+def _iter_mapped_raw_hands(path, start=0, end=None):
+    """
+    mmap 版切段：直接在位元組上找 "Poker Hand #"，只在產出前 decode 該手的切片。
+    整份檔案不會被讀進記憶體，分頁由 OS 依需要載入/釋放，可處理大於 RAM 的檔案。
+    start/end 限定掃描的位元組區段（供 parse_hands_parallel 分片使用）。
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            yield ""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = size if end is None else end
+            pos = mm.find(_HAND_MARK_BYTES, start, end)
+            while pos != -1:
+                yield mm[start:pos].decode("utf-8")
+                start = pos
+                pos = mm.find(_HAND_MARK_BYTES, pos + 1, end)
+            yield mm[start:end].decode("utf-8")
+
+
+def _iter_parsed_hands(raw_hands):
+    """過濾過短或空白的片段並逐手解析；沒有 Hero 的手牌略過。"""
     for raw_hand in raw_hands:
         if not raw_hand.strip() or len(raw_hand) < 100:
             continue
-        full_hand_text = raw_hand.strip()
-        hand_id_match = re.search(r"Poker Hand #(TM\d+|[A-Za-z0-9_]+):", full_hand_text)
-        hand_id = hand_id_match.group(1) if hand_id_match else "Unknown"
-        bb_size_match = re.search(r"Level\d+\([\d,]+/([\d,]+)\)", full_hand_text)
-        if bb_size_match:
-            bb_size = int(bb_size_match.group(1).replace(",", ""))
-        else:
-            bb_fallback = re.search(r"posts big blind ([\d,]+)", full_hand_text)
-            bb_size = int(bb_fallback.group(1).replace(",", "")) if bb_fallback else 400
-        hero_match = re.search(r"Dealt to (\S+) \[([A-Za-z0-9]{2} [A-Za-z0-9]{2})\]", full_hand_text)
-        current_hero = hero_match.group(1) if hero_match else None
-        hero_cards = hero_match.group(2) if hero_match else None
-        if current_hero and detected_hero is None:
-            detected_hero = current_hero
-        if not current_hero:
+        hand = _parse_single_hand(raw_hand.strip())
+        if hand is not None:
+            yield hand
+
+
+def _token_start(text, end):
+    """回傳 text[:end] 尾端連續非空白字元（\\S+）的起點；end 前緊鄰空白時回傳 end。"""
+    start = end
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    return start
+
+
+def _first_actor(text, marker):
+    """等同 re.search(rf"(\\S+){marker}", text)：回傳 (起點, 玩家名稱) 或 None。"""
+    pos = text.find(marker)
+    while pos != -1:
+        start = _token_start(text, pos)
+        if start < pos:
+            return start, text[start:pos]
+        pos = text.find(marker, pos + 1)
+    return None
+
+
+def _starts_line(text, needle):
+    """等同 re.search(rf"^{needle}", text, re.MULTILINE)。"""
+    return text.startswith(needle) or ("\n" + needle) in text
+
+
+def _hero_won(text, hero):
+    """等同 re.search(rf"{hero}\\s+(collected|won|wins|matches)", text, re.IGNORECASE)。"""
+    lower_text = text.lower()
+    hero_lower = hero.lower()
+    for word in _WIN_WORDS:
+        pos = lower_text.find(word)
+        while pos != -1:
+            gap = pos
+            while gap > 0 and lower_text[gap - 1].isspace():
+                gap -= 1
+            if gap < pos and lower_text.endswith(hero_lower, 0, gap):
+                return True
+            pos = lower_text.find(word, pos + 1)
+    return False
+
+
+def seat_position(hand_text, seat):
+    """單手文字中某座位號的位置（BTN、SB、UTG…，同 calculate_position）；無法判定時回傳 "Other"。"""
+    btn_match = _BUTTON_IN_SEAT_RE.search(hand_text) or _SEAT_IS_BUTTON_RE.search(hand_text)
+    seats = {int(m.group(1)) for m in _SEAT_RE.finditer(hand_text)}
+    return calculate_position(seat, btn_match.group(1) if btn_match else None, seats)
+
+
+def _parse_single_hand(full_hand_text):
+    """
+    將單手牌文字（已 strip）轉成 Hand；抓不到 hero 時回傳 None。
+    """
+    hero_match = _DEALT_RE.search(full_hand_text)
+    if not hero_match:
+        return None
+    current_hero, hero_cards = hero_match.group(1), hero_match.group(2)
+    hand_id_match = _HAND_ID_RE.search(full_hand_text)
+    hand_id = hand_id_match.group(1) if hand_id_match else "Unknown"
+    bb_size_match = _LEVEL_BB_RE.search(full_hand_text)
+    if bb_size_match:
+        bb_size = int(bb_size_match.group(1).replace(",", ""))
+    else:
+        bb_fallback = _POST_BB_RE.search(full_hand_text)
+        bb_size = int(bb_fallback.group(1).replace(",", "")) if bb_fallback else 400
+
+    # 座位表：一次 finditer 同時取得所有座位號、每個名稱第一次出現的座位、Hero 起始籌碼
+    active_seat_set = set()
+    seat_of = {}
+    hero_stack = None
+    for m in _SEAT_RE.finditer(full_hand_text):
+        seat = int(m.group(1))
+        active_seat_set.add(seat)
+        name = m.group(2)
+        if name is None:
             continue
-        stack_pattern = rf"Seat \d+: {re.escape(current_hero)} \(([\d,]+)(?: in chips)?\)"
-        stack_match = re.search(stack_pattern, full_hand_text)
-        hero_chips = int(stack_match.group(1).replace(",", "")) if stack_match else 0
-        bb_count = round(hero_chips / bb_size, 1) if bb_size > 0 else 0
-        preflop_text = full_hand_text.split("*** FLOP ***")[0] if "*** FLOP ***" in full_hand_text else full_hand_text
-        is_vpip = False
-        is_pfr = False
-        hero_escaped = re.escape(current_hero)
-        if re.search(rf"^{hero_escaped}: (raises|calls|bets)", preflop_text, re.MULTILINE):
-            is_vpip = True
-        if re.search(rf"^{hero_escaped}: raises", preflop_text, re.MULTILINE):
-            is_pfr = True
-        is_suited = False
-        hand_type = None
-        is_pair = False
-        is_ax = False
-        is_broadway = False
-        if hero_cards:
-            cards = hero_cards.split()
-            if len(cards) >= 2:
-                suit1, suit2 = cards[0][-1].lower(), cards[1][-1].lower()
-                is_suited = (suit1 == suit2)
-                rank_order = "AKQJT98765432"
-                broadway_ranks = "AKQJT"
-                r1, r2 = cards[0][:-1].upper(), cards[1][:-1].upper()
-                is_pair = (r1 == r2)
-                is_ax = (r1 == "A" or r2 == "A")
-                is_broadway = (r1 in broadway_ranks and r2 in broadway_ranks)
-                if r1 not in rank_order or r2 not in rank_order:
-                    hand_type = f"{r1}{r2}{'s' if is_suited else 'o'}"
-                else:
-                    high, low = (r1, r2) if rank_order.index(r1) < rank_order.index(r2) else (r2, r1)
-                    hand_type = f"{high}{low}{'s' if is_suited else 'o'}"
-        pot_match = re.search(r"Total pot ([\d,]+)", full_hand_text)
-        if pot_match:
-            pot_size = int(pot_match.group(1).replace(",", ""))
+        if name not in seat_of:
+            seat_of[name] = seat
+        if hero_stack is None and name == current_hero:
+            stack_match = _SEAT_STACK_RE.match(full_hand_text, m.end())
+            if stack_match:
+                hero_stack = stack_match.group(1)
+    hero_chips = int(hero_stack.replace(",", "")) if hero_stack is not None else 0
+    bb_count = round(hero_chips / bb_size, 1) if bb_size > 0 else 0
+
+    flop_at = full_hand_text.find(_FLOP_MARK)
+    preflop_text = full_hand_text[:flop_at] if flop_at != -1 else full_hand_text
+    hero_prefix = current_hero + ": "
+    is_pfr = _starts_line(preflop_text, hero_prefix + "raises")
+    is_vpip = (
+        is_pfr
+        or _starts_line(preflop_text, hero_prefix + "calls")
+        or _starts_line(preflop_text, hero_prefix + "bets")
+    )
+    pot_match = _TOTAL_POT_RE.search(full_hand_text)
+    if pot_match:
+        pot_size = int(pot_match.group(1).replace(",", ""))
+    else:
+        collected = _COLLECTED_RE.search(full_hand_text)
+        won = _WON_RE.search(full_hand_text)
+        pot_size = int((collected or won).group(1).replace(",", "")) if (collected or won) else 0
+    btn_match = _BUTTON_IN_SEAT_RE.search(full_hand_text) or _SEAT_IS_BUTTON_RE.search(full_hand_text)
+    button_seat = int(btn_match.group(1)) if btn_match else None
+    hero_seat = seat_of.get(current_hero)
+    active_seats = list(active_seat_set)
+    hero_position_str = calculate_position(hero_seat, button_seat, active_seats)
+    hero_dist = distance_to_button(hero_seat, button_seat, active_seats)
+    position_name = _DIST_TO_NAME.get(hero_dist, "Early") if hero_dist is not None else "Early"
+    villain_seat = None
+    relative_pos_str = "N/A"
+    # 翻前第一個 raise / bet 的玩家即主要對手
+    m_raise = _first_actor(preflop_text, ": raises")
+    m_bet = _first_actor(preflop_text, ": bets")
+    villain_name = None
+    if m_raise and m_bet:
+        villain_name = m_raise[1] if m_raise[0] < m_bet[0] else m_bet[1]
+    elif m_raise:
+        villain_name = m_raise[1]
+    elif m_bet:
+        villain_name = m_bet[1]
+    if villain_name:
+        if villain_name == current_hero:
+            relative_pos_str = "Hero 為翻前加注者 (無單一主要對手)"
         else:
-            collected = re.search(r"collected ([\d,]+) from pot", full_hand_text)
-            won = re.search(r"won \(([\d,]+)\)", full_hand_text)
-            pot_size = int((collected or won).group(1).replace(",", "")) if (collected or won) else 0
-        btn_match = re.search(r"The button is in seat #(\d+)", full_hand_text) or re.search(r"Seat #(\d+) is the button", full_hand_text)
-        button_seat = int(btn_match.group(1)) if btn_match else None
-        hero_seat_match = re.search(rf"Seat (\d+): {re.escape(current_hero)}\s", full_hand_text)
-        hero_seat = int(hero_seat_match.group(1)) if hero_seat_match else None
-        active_seats = list(set(int(m.group(1)) for m in re.finditer(r"Seat (\d+):", full_hand_text)))
-        hero_position_str = calculate_position(hero_seat, button_seat, active_seats)
-        hero_dist = distance_to_button(hero_seat, button_seat, active_seats)
-        dist_to_name = {0: "BTN", 1: "SB", 2: "BB", 3: "UTG", 4: "UTG+1", 5: "MP", 6: "MP+1", 7: "CO"}
-        position_name = dist_to_name.get(hero_dist, "Early") if hero_dist is not None else "Early"
-        villain_seat = None
-        relative_pos_str = "N/A"
-        m_raise = re.search(r"(\S+): raises", preflop_text)
-        m_bet = re.search(r"(\S+): bets", preflop_text)
-        villain_name = None
-        if m_raise and m_bet:
-            villain_name = m_raise.group(1) if m_raise.start() < m_bet.start() else m_bet.group(1)
-        elif m_raise:
-            villain_name = m_raise.group(1)
-        elif m_bet:
-            villain_name = m_bet.group(1)
-        if villain_name:
-            if villain_name == current_hero:
-                relative_pos_str = "Hero 為翻前加注者 (無單一主要對手)"
-            else:
-                villain_seat_m = re.search(rf"Seat (\d+): {re.escape(villain_name)}\s", full_hand_text)
-                if villain_seat_m and active_seats:
-                    villain_seat = int(villain_seat_m.group(1))
-                    if villain_seat in active_seats:
-                        hero_dist = distance_to_button(hero_seat, button_seat, active_seats)
-                        villain_dist = distance_to_button(villain_seat, button_seat, active_seats)
-                        if hero_dist is not None and villain_dist is not None:
-                            if hero_dist == 0:
-                                relative_pos_str = "In Position (IP)"
-                            elif villain_dist == 0:
-                                relative_pos_str = "Out of Position (OOP)"
-                            elif hero_dist > villain_dist:
-                                relative_pos_str = "In Position (IP)"
-                            else:
-                                relative_pos_str = "Out of Position (OOP)"
-                    else:
-                        relative_pos_str = "N/A (無法判定主要對手座位)"
+            found_seat = seat_of.get(villain_name)
+            if found_seat is not None and active_seats:
+                villain_seat = found_seat
+                if villain_seat in active_seats:
+                    hero_dist = distance_to_button(hero_seat, button_seat, active_seats)
+                    villain_dist = distance_to_button(villain_seat, button_seat, active_seats)
+                    if hero_dist is not None and villain_dist is not None:
+                        if hero_dist == 0:
+                            relative_pos_str = "In Position (IP)"
+                        elif villain_dist == 0:
+                            relative_pos_str = "Out of Position (OOP)"
+                        elif hero_dist > villain_dist:
+                            relative_pos_str = "In Position (IP)"
+                        else:
+                            relative_pos_str = "Out of Position (OOP)"
                 else:
                     relative_pos_str = "N/A (無法判定主要對手座位)"
-        else:
-            relative_pos_str = "多路底池 (無人加注)"
-        hero_cards_emoji = "Unknown"
-        if hero_cards:
-            parts = hero_cards.split()
-            emoji_parts = [f"{c[:-1]}{SUIT_EMOJI.get(c[-1].lower(), c[-1])}" for c in parts if len(c) >= 2]
-            hero_cards_emoji = " ".join(emoji_parts) if emoji_parts else "Unknown"
-        hero_win_pattern = rf"{re.escape(current_hero)}\s+(collected|won|wins|matches)"
-        if re.search(hero_win_pattern, full_hand_text, re.IGNORECASE):
-            result = "win"
-        elif is_vpip:
-            result = "loss"
-        else:
-            result = "fold"
-        is_winner = (result == "win")
-        total_pot = pot_size
-        parsed_hands.append({
-            "id": hand_id,
-            "content": full_hand_text,
-            "vpip": is_vpip,
-            "pfr": is_pfr,
-            "bb": bb_count,
-            "hero": current_hero,
-            "hero_cards": hero_cards,
-            "hero_cards_emoji": hero_cards_emoji,
-            "is_suited": is_suited,
-            "hand_type": hand_type,
-            "pot_size": pot_size,
-            "position": hero_position_str,
-            "villain_seat": villain_seat,
-            "relative_pos_str": relative_pos_str,
-            "result": result,
-            "is_winner": is_winner,
-            "total_pot": total_pot,
-            "bb_size": bb_size,
-            "is_pair": is_pair,
-            "is_ax": is_ax,
-            "is_broadway": is_broadway,
-            "position_name": position_name,
-        })
+            else:
+                relative_pos_str = "N/A (無法判定主要對手座位)"
+    else:
+        relative_pos_str = "多路底池 (無人加注)"
+    if _hero_won(full_hand_text, current_hero):
+        result = "win"
+    elif is_vpip:
+        result = "loss"
+    else:
+        result = "fold"
+    return Hand(
+        id=hand_id,
+        content=full_hand_text,
+        vpip=is_vpip,
+        pfr=is_pfr,
+        bb=bb_count,
+        hero=current_hero,
+        hero_cards=hero_cards,
+        pot_size=pot_size,
+        position=hero_position_str,
+        villain_seat=villain_seat,
+        relative_pos_str=relative_pos_str,
+        result=result,
+        bb_size=bb_size,
+        position_name=position_name,
+    )
+
+
+def iter_hands(source, chunk_size=_READ_CHUNK_SIZE):
+    """
+    串流版解析器：source 為檔案路徑或可 read() 的二進位檔案物件。
+    - 路徑：mmap 整份檔案，在位元組上找手牌邊界，逐手 decode 後解析
+    - 檔案物件：分塊讀取、增量切出每一手後解析，記憶體上限約為「一個讀取區塊 + 一手牌」
+    產出的 Hand 與 parse_hands 完全相同。
+    """
+    if isinstance(source, (str, os.PathLike)):
+        raw_hands = _iter_mapped_raw_hands(source)
+    else:
+        raw_hands = _iter_raw_hands(_iter_text_chunks(source, chunk_size))
+    yield from _iter_parsed_hands(raw_hands)
+
+
+def parse_hands(content):
+    """
+    專為 GGPoker 格式設計的手牌解析器。
+    content 可為整份文字 (str)，或交給 iter_hands 串流讀取的檔案物件。
+    每手牌只用一組預先編譯的 pattern 掃描（見 _parse_single_hand）。
+    回傳 (Hand 列表, hero 名稱)；hero 名稱取第一手解析成功的手牌。
+    Hand 支援 dict 風格讀取（h["vpip"]、h.get(...)），需要一般 dict 時用 h.to_dict()。
+    """
+    if isinstance(content, str):
+        parsed_hands = list(_iter_parsed_hands(_iter_raw_hands((content,))))
+    else:
+        parsed_hands = list(iter_hands(content))
+    detected_hero = parsed_hands[0]["hero"] if parsed_hands else None
+    return parsed_hands, detected_hero
+
+
+def _shard_ranges(path, shards):
+    """將檔案切成約 shards 等分的 [start, end) 位元組區段，每個切點都對齊手牌開頭。"""
+    file_size = os.path.getsize(path)
+    step = file_size // shards
+    bounds = [0]
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for i in range(1, shards):
+            cut = mm.find(_HAND_MARK_BYTES, max(i * step, bounds[-1] + 1))
+            if cut == -1:
+                break
+            bounds.append(cut)
+    bounds.append(file_size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _parse_shard(path, start, end):
+    """子程序入口：以 mmap 解析 [start, end) 區段內的手牌。"""
+    return list(_iter_parsed_hands(_iter_mapped_raw_hands(path, start, end)))
+
+
+def parse_hands_parallel(path, workers=None):
+    """
+    多程序版 parse_hands：依 "Poker Hand #" 邊界把檔案切成位元組區段，
+    每段交給 ProcessPoolExecutor 解析，結果依原始順序合併。
+    回傳格式與 parse_hands 相同 (手牌列表, hero 名稱)。
+    檔案太小或 workers <= 1 時退回單程序的 iter_hands。
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = min(workers, os.path.getsize(path) // _MIN_SHARD_BYTES)
+    if shards <= 1:
+        parsed_hands = list(iter_hands(path))
+    else:
+        ranges = _shard_ranges(path, shards)
+        parsed_hands = []
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [pool.submit(_parse_shard, path, start, end) for start, end in ranges]
+            for future in futures:
+                parsed_hands.extend(future.result())
+    detected_hero = parsed_hands[0]["hero"] if parsed_hands else None
     return parsed_hands, detected_hero
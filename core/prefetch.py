@@ -0,0 +1,213 @@
+"""
+[預先分析] 上傳牌譜後，在背景先替使用者最可能點開的手牌跑 analyze_specific_hand，結果寫進回應快取。
+- 候選：關鍵失誤（輸掉的大底池，不含全下領先被逆轉的手牌）> 全下手牌 > 其他大底池，同一層依底池由大到小
+- 使用者在列表選中某手時 bump()，該手插到佇列最前面；同一世代每手最多送出一次（失敗也不重試）
+- 使用者按下立即分析時 claim()：還沒送出的從佇列移除，已在背景送出的等它完成，同一手不重複計費
+- 每個 session 一個 PrefetchQueue（存在 st.session_state），各自有 token 預算；用完即停止預先分析
+- 換檔案時 reset()：佇列清空、世代號 +1，舊世代還沒送出的工作全部作廢
+背景執行緒不碰 Streamlit API，只呼叫 core.coach 並寫入 core.llm_cache。
+"""
+import heapq
+import itertools
+import threading
+
+from .compact import estimate_tokens
+from .allin_ev import bad_beat_mask
+from .coach import HAND_ANALYSIS_TEMPERATURE, call_llm_api, hand_analysis_request
+from .http_client import RateLimiter
+from .llm_cache import has_cached_response
+
+# 每個使用者（session）可花在預先分析的 token 上限（輸入 + 預估輸出）
+PREFETCH_TOKEN_BUDGET = 300_000
+# 預估每次分析的輸出 token 數
+PREFETCH_OUTPUT_TOKENS = 800
+PREFETCH_MAX_HANDS = 12
+PREFETCH_WORKERS = 2
+# claim() 等背景分析完成的上限（秒）
+PREFETCH_CLAIM_WAIT = 60
+# 佇列優先序：數字越小越先做
+PRIORITY_SELECTED = 0
+PRIORITY_LEAK = 10
+PRIORITY_ALL_IN = 20
+PRIORITY_BIG_POT = 30
+
+
+def prefetch_candidates(table, limit=PREFETCH_MAX_HANDS):
+    """
+    依優先序挑出值得預先分析的列索引，回傳 [(priority, row), ...]（不重複）。
+    只挑 Hero 有入池（VPIP）的手牌，棄牌的手牌很少被點開分析。
+    """
+    picked = {}
+    tiers = (
+        (PRIORITY_LEAK, table.vpip & ~table.is_winner & ~bad_beat_mask(table), 3),
+        (PRIORITY_ALL_IN, table.vpip & table.text_contains("all-in"), limit),
+        (PRIORITY_BIG_POT, table.vpip, limit),
+    )
+    for priority, mask, k in tiers:
+        for row in table.top_by_pot(mask, k):
+            if len(picked) >= limit:
+                break
+            picked.setdefault(int(row), priority)
+    return sorted(((p, r) for r, p in picked.items()), key=lambda item: item[0])
+
+
+class PrefetchQueue:
+    """單一 session 的背景預先分析佇列。"""
+
+    def __init__(self, budget=PREFETCH_TOKEN_BUDGET, workers=PREFETCH_WORKERS, rate_limiter=None):
+        self.budget = budget
+        self.spent = 0
+        self.workers = workers
+        self.done = 0
+        self.skipped = 0
+        self._limiter = rate_limiter or RateLimiter()
+        self._heap = []
+        self._queued = {}
+        # 本世代已取出（送出中或已結束）的列，不再排入；送出中的列另以 Event 通知完成
+        self._attempted = set()
+        self._inflight = {}
+        self._seq = itertools.count()
+        self._generation = 0
+        self._source = None
+        self._api_key = None
+        self._model = None
+        self._running = 0
+        self._lock = threading.Lock()
+
+    # --- 由 app.py（主執行緒）呼叫 ---
+    def start(self, table, api_key, model):
+        """table 換了（新上傳或切換 Demo）就取消舊工作並重新排程；同一張表重複呼叫不做事。"""
+        with self._lock:
+            if table is self._source and api_key == self._api_key and model == self._model:
+                return
+            self._reset_locked()
+            self._source = table
+            self._api_key = api_key
+            self._model = model
+            for priority, row in prefetch_candidates(table):
+                self._push_locked(priority, row)
+        self._spawn()
+
+    def reset(self):
+        """取消所有尚未送出的工作（已送出的請求仍會完成並寫入快取）。"""
+        with self._lock:
+            self._reset_locked()
+
+    def bump(self, row):
+        """使用者剛選中第 row 列：提到最高優先（已送出過的列不再排入）。"""
+        with self._lock:
+            if self._source is None:
+                return
+            self._push_locked(PRIORITY_SELECTED, int(row))
+        self._spawn()
+
+    def in_flight(self, row):
+        with self._lock:
+            return (self._generation, int(row)) in self._inflight
+
+    def claim(self, row, timeout=PREFETCH_CLAIM_WAIT):
+        """
+        使用者要立即分析第 row 列：尚未送出就從佇列移除、之後也不再預先分析；
+        已在背景送出則最多等 timeout 秒讓它完成（成功的結果已寫進回應快取，接著的請求直接命中）。
+        """
+        with self._lock:
+            row = int(row)
+            self._queued.pop(row, None)
+            self._attempted.add(row)
+            done = self._inflight.get((self._generation, row))
+        if done is not None:
+            done.wait(timeout)
+
+    @property
+    def pending(self):
+        return len(self._queued)
+
+    @property
+    def remaining_budget(self):
+        return max(0, self.budget - self.spent)
+
+    # --- 內部 ---
+    def _reset_locked(self):
+        self._generation += 1
+        self._heap.clear()
+        self._queued.clear()
+        self._attempted.clear()
+        self._source = None
+
+    def _push_locked(self, priority, row):
+        if row in self._attempted:
+            return
+        current = self._queued.get(row)
+        if current is not None and current <= priority:
+            return
+        self._queued[row] = priority
+        heapq.heappush(self._heap, (priority, next(self._seq), row, self._generation))
+
+    def _pop_locked(self):
+        """取出下一個有效工作；被 bump 取代的舊項目或舊世代的項目直接略過。"""
+        while self._heap:
+            priority, _, row, generation = heapq.heappop(self._heap)
+            if generation != self._generation or self._queued.get(row) != priority:
+                continue
+            del self._queued[row]
+            self._attempted.add(row)
+            self._inflight[(generation, row)] = threading.Event()
+            return row, generation, self._source, self._api_key, self._model
+        return None
+
+    def _spawn(self):
+        with self._lock:
+            missing = min(self.workers, len(self._queued)) - self._running
+            self._running += max(0, missing)
+        for _ in range(max(0, missing)):
+            threading.Thread(target=self._work, name="coach-prefetch", daemon=True).start()
+
+    def _work(self):
+        try:
+            while True:
+                with self._lock:
+                    job = self._pop_locked()
+                if job is None:
+                    return
+                try:
+                    self._run_job(*job)
+                except Exception:
+                    with self._lock:
+                        self.skipped += 1
+                finally:
+                    with self._lock:
+                        done = self._inflight.pop((job[1], job[0]), None)
+                    if done is not None:
+                        done.set()
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _run_job(self, row, generation, table, api_key, model):
+        hand = table.row(row)
+        prompt, static_prefix = hand_analysis_request(hand)
+        if has_cached_response(model, HAND_ANALYSIS_TEMPERATURE, prompt):
+            return
+        cost = estimate_tokens(prompt) + PREFETCH_OUTPUT_TOKENS
+        with self._lock:
+            if generation != self._generation:
+                return
+            if self.spent + cost > self.budget:
+                self.skipped += 1
+                return
+            self.spent += cost
+        self._limiter.acquire()
+        with self._lock:
+            if generation != self._generation:
+                # 等 rate limit 的期間換了檔案：退回預算，不送出
+                self.spent -= cost
+                return
+        result = call_llm_api(
+            api_key, model, prompt,
+            temperature=HAND_ANALYSIS_TEMPERATURE, use_cache=True, static_prefix=static_prefix,
+        )
+        with self._lock:
+            if result.startswith("AI 連線失敗"):
+                self.skipped += 1
+            else:
+                self.done += 1
@@ -0,0 +1,146 @@
+"""
+[翻前勝率表] 169 種起手牌類別兩兩對戰的翻前勝率矩陣（169×169），預先算好隨專案附上 data/preflop_equity_169.npy。
+- 類別排列同常見的 13×13 起手牌表：第 i 列 / 第 j 欄依序為 A…2；i == j 為對子、i < j 為同花、i > j 為不同花
+- matrix[a, b] = 類別 a 對類別 b 的勝率（平手算一半）：兩類別所有不衝突組合配對的精確勝率平均（core.allin_ev 完整列舉）
+- 第一次查詢時以 np.load(mmap_mode="r") 記憶體映射，不整份讀進記憶體，多個程序共用作業系統的頁面快取
+- 查詢為 O(1)：parse_hands 的 hand_type（"AKs"、"AKo"、對子為 "AAo"）或 "Ah Kd" 直接換成列 / 欄索引
+- 重建（只在調整計算方式時需要，單核約 17 分鐘）：python bench/build_preflop_matrix.py
+"""
+import threading
+from itertools import permutations
+from pathlib import Path
+
+import numpy as np
+
+from .allin_ev import allin_equity
+from .equity import class_combos, parse_range
+from .evaluator import RANKS, parse_cards
+
+PREFLOP_MATRIX_PATH = Path(__file__).resolve().parent.parent / "data" / "preflop_equity_169.npy"
+
+# 13×13 表的列 / 欄順序（A 在最前）
+_GRID_RANKS = RANKS[::-1]
+HAND_CLASSES = [
+    _GRID_RANKS[i] + _GRID_RANKS[j] if i == j
+    else _GRID_RANKS[min(i, j)] + _GRID_RANKS[max(i, j)] + ("s" if i < j else "o")
+    for i in range(13) for j in range(13)
+]
+_CLASS_INDEX = {name: i for i, name in enumerate(HAND_CLASSES)}
+_SUIT_PERMUTATIONS = list(permutations(range(4)))
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+
+def class_index(hand):
+    """
+    起手牌 → 0～168 的類別索引。hand 可為類別名稱（"AKs"、"AKo"、"AA"；parse_hands 的對子寫法 "AAo" 也可）、
+    兩張牌字串 "Ah Kd" 或兩張牌整數；無法辨識時拋出 ValueError。
+    """
+    if isinstance(hand, str) and " " not in hand.strip() and len(hand.strip()) in (2, 3):
+        name = hand.strip()
+        high, low = name[0].upper(), name[1].upper()
+        if high not in RANKS or low not in RANKS:
+            raise ValueError(f"無法辨識的起手牌: {hand!r}")
+        if RANKS.index(high) < RANKS.index(low):
+            high, low = low, high
+        if high == low:
+            key = high + low
+        elif len(name) == 3 and name[2].lower() in "so":
+            key = high + low + name[2].lower()
+        else:
+            raise ValueError(f"非對子的起手牌需標明 s / o: {hand!r}")
+        return _CLASS_INDEX[key]
+    cards = parse_cards(hand) if isinstance(hand, str) else list(hand)
+    if len(cards) != 2 or cards[0] == cards[1]:
+        raise ValueError(f"需要兩張不同的牌: {hand!r}")
+    i, j = 12 - (cards[0] >> 2), 12 - (cards[1] >> 2)
+    if i == j:
+        return i * 13 + j
+    # 同花放在右上（列 < 欄），不同花放在左下
+    return min(i, j) * 13 + max(i, j) if cards[0] & 3 == cards[1] & 3 else max(i, j) * 13 + min(i, j)
+
+
+def combos_of_class(index):
+    """類別索引 → 該類別所有兩張牌組合（整數 tuple）。"""
+    i, j = divmod(index, 13)
+    kind = "" if i == j else ("s" if i < j else "o")
+    return class_combos(12 - min(i, j), 12 - max(i, j), kind)
+
+
+def load_preflop_matrix(path=None):
+    """記憶體映射的 169×169 float32 唯讀矩陣；預設路徑只載入一次。"""
+    global _matrix
+    if path is not None:
+        return np.load(path, mmap_mode="r")
+    if _matrix is None:
+        with _matrix_lock:
+            if _matrix is None:
+                _matrix = np.load(PREFLOP_MATRIX_PATH, mmap_mode="r")
+    return _matrix
+
+
+def preflop_equity(hand, villain):
+    """起手牌對起手牌（類別或具體兩張牌，同 class_index）的翻前勝率；具體牌的花色交互只以類別平均計。"""
+    return float(load_preflop_matrix()[class_index(hand), class_index(villain)])
+
+
+def range_class_weights(range_text):
+    """範圍文字 → (169,) 各類別在範圍內的組合數，作為範圍對戰的權重。"""
+    weights = np.zeros(len(HAND_CLASSES), dtype=np.float64)
+    for combo in parse_range(range_text):
+        weights[class_index(combo)] += 1
+    return weights
+
+
+def preflop_equity_vs_range(hand, range_text):
+    """
+    起手牌對範圍的翻前勝率：以範圍內各類別的組合數加權平均矩陣的一列（不扣除 Hero 手牌的阻擋效果）。
+    需要考慮阻擋牌或翻後公牌時改用 core.equity.equity_vs_range。
+    """
+    weights = range_class_weights(range_text)
+    if not weights.sum():
+        raise ValueError(f"空的範圍: {range_text!r}")
+    return float(load_preflop_matrix()[class_index(hand)] @ weights / weights.sum())
+
+
+def _isomorphic_key(hand_a, hand_b):
+    """兩手牌在花色互換下的標準形（24 種花色排列中字典序最小者），同構的對戰只算一次。"""
+    return min(
+        (tuple(sorted(c & ~3 | p[c & 3] for c in hand_a)), tuple(sorted(c & ~3 | p[c & 3] for c in hand_b)))
+        for p in _SUIT_PERMUTATIONS
+    )
+
+
+def build_preflop_matrix(progress=None):
+    """
+    完整計算 169×169 勝率矩陣（float32）。每個類別配對平均所有不衝突的組合配對，
+    花色同構的配對（共約 47,000 種）各以 core.allin_ev 精確列舉一次。
+    progress(已完成列數, 169) 可用來回報進度。
+    """
+    combos = [combos_of_class(i) for i in range(len(HAND_CLASSES))]
+    exact = {}
+    matrix = np.zeros((len(HAND_CLASSES), len(HAND_CLASSES)), dtype=np.float64)
+    for a in range(len(HAND_CLASSES)):
+        for b in range(a, len(HAND_CLASSES)):
+            total = 0.0
+            count = 0
+            for hand_a in combos[a]:
+                for hand_b in combos[b]:
+                    if set(hand_a) & set(hand_b):
+                        continue
+                    key = _isomorphic_key(hand_a, hand_b)
+                    if key not in exact:
+                        exact[key] = allin_equity([("a", key[0]), ("b", key[1])], [], [(1, (0, 1))])[0]
+                    total += exact[key]
+                    count += 1
+            matrix[a, b] = total / count
+            matrix[b, a] = 1.0 - matrix[a, b]
+        if progress is not None:
+            progress(a + 1, len(HAND_CLASSES))
+    return matrix.astype(np.float32)
+
+
+def save_preflop_matrix(matrix, path=PREFLOP_MATRIX_PATH):
+    """寫成 .npy；之後的 load_preflop_matrix 直接記憶體映射。"""
+    np.save(path, np.asarray(matrix, dtype=np.float32))
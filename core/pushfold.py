@@ -0,0 +1,290 @@
+"""
+[推或棄] 短籌碼（≤ PUSHFOLD_MAX_BB）翻前全下 / 跟注的 Nash 均衡表，以及對整份牌譜的逐手比對。
+- 均衡表依（有效籌碼 BB, 身後玩家數, 前注總額 BB）預先解好，隨專案附上 data/pushfold_nash.npz；
+  重建：python bench/build_pushfold_chart.py（數十秒）
+- 解法：在 core.preflop 的 169×169 勝率矩陣上做 fictitious play（反覆取最佳回應並平均），籌碼 EV、不計 ICM
+- 模型：前面全部棄牌後推者全下；身後玩家依序決定是否跟注，第一個跟注者之後的玩家一律棄牌（不考慮多人跟注）；
+  盲注與前注為死錢，範圍以組合數加權、不計阻擋牌
+- 逐手比對只解析翻前文字，不做任何模擬：Hero 前面無人入池時比對「推 / 棄」，面對單一全下時比對「跟 / 棄」
+"""
+import re
+import threading
+import weakref
+from pathlib import Path
+
+import numpy as np
+
+from .compact import _amount
+from .parser import distance_to_button
+from .preflop import HAND_CLASSES, class_index, combos_of_class, load_preflop_matrix
+
+PUSHFOLD_CHART_PATH = Path(__file__).resolve().parent.parent / "data" / "pushfold_nash.npz"
+# 均衡表的有效籌碼（BB，整數格）與前注總額（BB）格點；查詢時取最接近的一格
+PUSHFOLD_STACKS = tuple(range(1, 21))
+PUSHFOLD_ANTES = (0.0, 0.5, 1.0, 1.25, 1.5)
+# 推者身後最多幾位玩家（9 人桌 UTG 為 8）
+PUSHFOLD_MAX_BEHIND = 8
+# 只檢查有效籌碼不超過此值的手牌
+PUSHFOLD_MAX_BB = 15
+PUSHFOLD_ITERATIONS = 400
+
+_LEVEL_RE = re.compile(r"Level\d+\(([\d,]+)/([\d,]+)\)")
+_POST_BB_RE = re.compile(r"posts big blind ([\d,]+)")
+_ANTE_RE = re.compile(r"^(\S+): posts the ante ([\d,]+)", re.MULTILINE)
+_SEAT_LINE_RE = re.compile(r"^Seat (\d+): (\S+) \(([\d,]+)(?: in chips)?\)", re.MULTILINE)
+_BUTTON_RE = re.compile(r"Seat #(\d+) is the button|The button is in seat #(\d+)")
+_DEALT_RE = re.compile(r"^Dealt to (\S+) \[([^\]]+)\]", re.MULTILINE)
+_PREFLOP_ACTION_RE = re.compile(r"^(\S+): (folds|checks|calls|bets|raises)\b(.*)$", re.MULTILINE)
+
+_COMBO_COUNTS = np.array([len(combos_of_class(i)) for i in range(len(HAND_CLASSES))], dtype=np.float64)
+
+_chart = None
+_chart_lock = threading.Lock()
+_review_cache = weakref.WeakKeyDictionary()
+_review_lock = threading.Lock()
+
+
+def _caller_blinds(behind):
+    """身後玩家依行動順序已投入的盲注：最後一位是 BB，倒數第二位是 SB（推者本身是 SB 時除外）。"""
+    blinds = np.zeros(behind)
+    blinds[-1] = 1.0
+    if behind >= 2:
+        blinds[-2] = 0.5
+    return blinds
+
+
+def solve_pushfold(stack, behind, ante, matrix=None, iterations=PUSHFOLD_ITERATIONS):
+    """
+    單一情境的均衡：stack 為有效籌碼（BB，已扣前注）、behind 為推者身後玩家數、ante 為底池中的前注總額（BB）。
+    回傳 (push (169,), call (behind, 169))，為各類別全下 / 第 k 位跟注的頻率（fictitious play 的平均策略）。
+    """
+    matrix = np.asarray(load_preflop_matrix() if matrix is None else matrix, dtype=np.float64)
+    pusher_blind = 0.5 if behind == 1 else 0.0
+    caller_blinds = _caller_blinds(behind)
+    dead = 1.5 + ante
+    # 第 k 位跟注時的底池：兩人各 stack，加上前注與其他人（已棄牌）的盲注
+    pots = ante + 2 * stack + (1.5 - pusher_blind - caller_blinds)
+    push = np.full(len(HAND_CLASSES), 0.5)
+    call = np.full((behind, len(HAND_CLASSES)), 0.5)
+    for t in range(1, iterations + 1):
+        push_weights = _COMBO_COUNTS * push
+        eq_vs_push = matrix @ push_weights / max(push_weights.sum(), 1e-12)
+        call_weights = _COMBO_COUNTS * call
+        call_prob = call_weights.sum(axis=1) / _COMBO_COUNTS.sum()
+        # reach[k] = 前 k 位都沒有跟注的機率
+        reach = np.concatenate([[1.0], np.cumprod(1 - call_prob)])
+        eq_vs_call = (matrix @ call_weights.T) / np.maximum(call_weights.sum(axis=1), 1e-12)
+        push_gain = reach[-1] * dead + (
+            (reach[:-1] * call_prob) * (eq_vs_call * pots - stack + pusher_blind)
+        ).sum(axis=1)
+        call_gain = eq_vs_push * pots[:, None] - stack + caller_blinds[:, None]
+        push += ((push_gain > 0) - push) / (t + 1)
+        call += ((call_gain > 0) - call) / (t + 1)
+    return push, call
+
+
+def build_pushfold_chart(matrix=None, progress=None):
+    """解出整張均衡表：push (stack, behind, ante, 169) 與 call (stack, behind, 跟注順位, ante, 169) 的布林陣列。"""
+    matrix = load_preflop_matrix() if matrix is None else matrix
+    shape = (len(PUSHFOLD_STACKS), PUSHFOLD_MAX_BEHIND, len(PUSHFOLD_ANTES))
+    push = np.zeros(shape + (len(HAND_CLASSES),), dtype=bool)
+    call = np.zeros(shape[:2] + (PUSHFOLD_MAX_BEHIND, len(PUSHFOLD_ANTES), len(HAND_CLASSES)), dtype=bool)
+    for s, stack in enumerate(PUSHFOLD_STACKS):
+        for b in range(PUSHFOLD_MAX_BEHIND):
+            for a, ante in enumerate(PUSHFOLD_ANTES):
+                push_freq, call_freq = solve_pushfold(stack, b + 1, ante, matrix)
+                push[s, b, a] = push_freq >= 0.5
+                call[s, b, :b + 1, a] = call_freq >= 0.5
+        if progress is not None:
+            progress(s + 1, len(PUSHFOLD_STACKS))
+    return {
+        "push": push,
+        "call": call,
+        "stacks": np.array(PUSHFOLD_STACKS, dtype=np.float64),
+        "antes": np.array(PUSHFOLD_ANTES, dtype=np.float64),
+    }
+
+
+def save_pushfold_chart(chart, path=PUSHFOLD_CHART_PATH):
+    np.savez_compressed(path, **chart)
+
+
+def load_pushfold_chart(path=None):
+    """讀入均衡表（dict of 陣列）；預設路徑只讀一次。"""
+    global _chart
+    if path is not None:
+        with np.load(path) as data:
+            return {k: data[k] for k in data.files}
+    if _chart is None:
+        with _chart_lock:
+            if _chart is None:
+                with np.load(PUSHFOLD_CHART_PATH) as data:
+                    _chart = {k: data[k] for k in data.files}
+    return _chart
+
+
+def _grid_index(chart, stack, ante):
+    s = int(np.abs(chart["stacks"] - stack).argmin())
+    a = int(np.abs(chart["antes"] - ante).argmin())
+    return s, a
+
+
+def nash_push(hand, stack, behind, ante=0.0):
+    """前面全部棄牌時，hand（同 core.preflop.class_index）在此情境是否應全下。"""
+    chart = load_pushfold_chart()
+    s, a = _grid_index(chart, stack, ante)
+    behind = min(max(int(behind), 1), PUSHFOLD_MAX_BEHIND)
+    return bool(chart["push"][s, behind - 1, a, class_index(hand)])
+
+
+def nash_call(hand, stack, behind, slot, ante=0.0):
+    """
+    面對全下時是否應跟注：behind 為推者身後玩家數、slot 為 Hero 在推者之後的順位（0 = 緊接在推者之後）。
+    """
+    chart = load_pushfold_chart()
+    s, a = _grid_index(chart, stack, ante)
+    behind = min(max(int(behind), 1), PUSHFOLD_MAX_BEHIND)
+    slot = min(max(int(slot), 0), behind - 1)
+    return bool(chart["call"][s, behind - 1, slot, a, class_index(hand)])
+
+
+def _players_behind(seat, button_seat, seats):
+    """翻前在 seat 之後還要行動的玩家數（含盲注）；BB 為 0。"""
+    d = distance_to_button(seat, button_seat, seats)
+    if d is None:
+        return None
+    n = len(seats)
+    if n == 2:
+        return 1 if d == 0 else 0
+    if d == 0:
+        return 2
+    return n - d + 2 if d >= 3 else 2 - d
+
+
+def pushfold_spot(content, hero):
+    """
+    單手的推 / 棄檢查；不是短籌碼推 / 棄局面時回傳 None。回傳 dict：
+    spot（"push" / "call"）、hand、stack_bb、behind、slot、ante_bb、action（Hero 實際動作）、nash（均衡動作）、
+    matched（是否吻合；Hero 做了模型以外的動作時為 None）。
+    """
+    hole_at = content.find("*** HOLE CARDS ***")
+    if hole_at == -1:
+        return None
+    end = len(content)
+    for marker in ("*** FLOP ***", "*** SHOWDOWN ***", "*** SUMMARY ***"):
+        at = content.find(marker, hole_at)
+        if at != -1:
+            end = min(end, at)
+    preflop = content[hole_at:end]
+    level = _LEVEL_RE.search(content)
+    if level:
+        bb_size = _amount(level.group(2))
+    else:
+        post_bb = _POST_BB_RE.search(content)
+        bb_size = _amount(post_bb.group(1)) if post_bb else 0
+    dealt = _DEALT_RE.search(preflop)
+    btn = _BUTTON_RE.search(content)
+    if not bb_size or not dealt or dealt.group(1) != hero or not btn:
+        return None
+    seats, stacks = {}, {}
+    for m in _SEAT_LINE_RE.finditer(content[:hole_at]):
+        seats[m.group(2)] = int(m.group(1))
+        stacks[m.group(2)] = _amount(m.group(3))
+    if hero not in seats:
+        return None
+    antes = {m.group(1): _amount(m.group(2)) for m in _ANTE_RE.finditer(content[:hole_at])}
+    ante_bb = sum(antes.values()) / bb_size
+    button_seat = int(btn.group(1) or btn.group(2))
+    seat_list = sorted(seats.values())
+
+    actions = [(m.group(1), m.group(2), m.group(3).endswith("and is all-in")) for m in _PREFLOP_ACTION_RE.finditer(preflop)]
+    hero_at = next((i for i, (name, _, _) in enumerate(actions) if name == hero), None)
+    if hero_at is None:
+        return None
+    before = [a for a in actions[:hero_at] if a[1] != "folds"]
+    _, verb, all_in = actions[hero_at]
+    hero_behind = _players_behind(seats[hero], button_seat, seat_list)
+    if hero_behind is None:
+        return None
+
+    if not before:
+        if hero_behind == 0:
+            return None
+        behind_stacks = [stacks[name] for name, seat in seats.items()
+                         if name != hero and (_players_behind(seat, button_seat, seat_list) or 0) < hero_behind]
+        if not behind_stacks:
+            return None
+        effective = min(stacks[hero], max(behind_stacks)) - antes.get(hero, 0)
+        spot, slot, behind = "push", None, hero_behind
+        action = "push" if verb == "raises" and all_in else "fold" if verb == "folds" else "other"
+    elif len(before) == 1 and before[0][1] == "raises" and before[0][2]:
+        pusher = before[0][0]
+        behind = _players_behind(seats.get(pusher), button_seat, seat_list)
+        if not behind:
+            return None
+        effective = min(stacks[hero], stacks[pusher]) - antes.get(hero, 0)
+        spot, slot = "call", behind - hero_behind - 1
+        action = "call" if verb == "calls" or (verb == "raises" and all_in) else "fold" if verb == "folds" else "other"
+    else:
+        return None
+
+    stack_bb = effective / bb_size
+    if not 0 < stack_bb <= PUSHFOLD_MAX_BB:
+        return None
+    hand = HAND_CLASSES[class_index(dealt.group(2))]
+    if spot == "push":
+        nash = "push" if nash_push(hand, stack_bb, behind, ante_bb) else "fold"
+    else:
+        nash = "call" if nash_call(hand, stack_bb, behind, slot, ante_bb) else "fold"
+    return {
+        "spot": spot,
+        "hand": hand,
+        "stack_bb": round(stack_bb, 1),
+        "behind": behind,
+        "slot": slot,
+        "ante_bb": round(ante_bb, 2),
+        "action": action,
+        "nash": nash,
+        "matched": None if action == "other" else action == nash,
+    }
+
+
+def pushfold_review(table):
+    """
+    整份牌譜的推 / 棄比對：回傳 [dict]，每手在 pushfold_spot 的欄位外加 row、id、display_index。
+    只解析 Hero 起始籌碼 ≤ PUSHFOLD_MAX_BB + 1 或有人全下的手牌；結果依 HandTable 物件快取。
+    """
+    with _review_lock:
+        cached = _review_cache.get(table)
+    if cached is not None:
+        return cached
+    candidates = np.flatnonzero((table.bb <= PUSHFOLD_MAX_BB + 1) | table.text_contains("and is all-in"))
+    heroes = table.labels("hero", candidates)
+    results = []
+    for row, hero in zip(candidates.tolist(), heroes):
+        try:
+            result = pushfold_spot(table.content(row), hero or "Hero")
+        except Exception:
+            result = None
+        if result is None:
+            continue
+        result["row"] = row
+        result["id"] = table.ids[row]
+        if table.display_index[row] != -1:
+            result["display_index"] = int(table.display_index[row])
+        results.append(result)
+    with _review_lock:
+        _review_cache[table] = results
+    return results
+
+
+def pushfold_summary(results):
+    """比對結果的彙總：可判定手數、吻合手數、吻合率（%，無資料時為 "N/A"），以及偏離均衡的手牌 list。"""
+    judged = [r for r in results if r["matched"] is not None]
+    matched = sum(r["matched"] for r in judged)
+    return {
+        "judged": len(judged),
+        "matched": matched,
+        "rate": round(matched / len(judged) * 100, 1) if judged else "N/A",
+        "deviations": [r for r in judged if not r["matched"]],
+    }
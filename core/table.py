@@ -0,0 +1,210 @@
+"""
+[欄式手牌表] 將整份牌譜的 Hand 轉成 NumPy 欄位陣列，統計與篩選全部用向量化遮罩完成。
+- 布林欄位（vpip/pfr/牌型旗標/勝負）為 bool 陣列
+- 位置、結果、底牌等重複字串存成 categorical code（int16）+ 類別表
+- 數值欄位（bb、底池、盲注）為 int/float 陣列
+- 原始手牌文字以 UTF-8 串成單一 bytes，另存 offsets，讀取單手時才 decode
+app.py 的每次 rerun 只需對陣列做遮罩運算，不再對整份 list 跑 comprehension。
+"""
+import json
+
+import numpy as np
+
+from .hand import Hand, _card_facts
+
+# 與 coach / app 一致的位置分組
+POS_GROUPS = {
+    "BTN": ["BTN"], "SB": ["SB"], "BB": ["BB"],
+    "EP": ["UTG", "UTG+1"], "MP": ["MP", "MP+1", "HJ"], "CO": ["CO"],
+}
+
+_BOOL_COLUMNS = ("vpip", "pfr", "is_suited", "is_pair", "is_ax", "is_broadway", "is_winner")
+_CATEGORY_COLUMNS = ("hero", "hero_cards", "position", "position_name", "relative_pos_str", "result")
+_NUMERIC_COLUMNS = ("bb", "pot_size", "bb_size", "villain_seat", "display_index")
+# 整數欄位以 -1 代表原值為 None（villain_seat）或未指定（display_index）
+_MISSING = -1
+
+
+def _encode_categories(values):
+    """字串序列 → (int16 code 陣列, 類別 list)。None 也視為一個類別。"""
+    index = {}
+    codes = np.fromiter((index.setdefault(v, len(index)) for v in values), dtype=np.int16, count=len(values))
+    return codes, list(index)
+
+
+class HandTable:
+    """整份牌譜的欄式儲存。以 HandTable(hands) 建立，hands 為 Hand 或同欄位的 dict。"""
+
+    def __init__(self, hands):
+        n = len(hands)
+        self._n = n
+        for col in _BOOL_COLUMNS:
+            setattr(self, col, np.fromiter((bool(h.get(col)) for h in hands), dtype=bool, count=n))
+        self._categories = {}
+        for col in _CATEGORY_COLUMNS:
+            codes, cats = _encode_categories([h.get(col) for h in hands])
+            setattr(self, col, codes)
+            self._categories[col] = cats
+        self.bb = np.fromiter((h.get("bb", 0) for h in hands), dtype=np.float64, count=n)
+        self.pot_size = np.fromiter((h.get("pot_size", 0) for h in hands), dtype=np.int64, count=n)
+        self.bb_size = np.fromiter((h.get("bb_size") or 0 for h in hands), dtype=np.int64, count=n)
+        self.villain_seat = np.fromiter(
+            (_MISSING if h.get("villain_seat") is None else h.get("villain_seat") for h in hands),
+            dtype=np.int16, count=n,
+        )
+        self.display_index = np.fromiter(
+            (h.get("display_index", _MISSING) for h in hands), dtype=np.int64, count=n
+        )
+        self.ids = [h.get("id") for h in hands]
+        encoded = [(h.get("content") or "").encode("utf-8") for h in hands]
+        self._offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=self._offsets[1:])
+        self._text = b"".join(encoded)
+        self._freeze()
+
+    def _freeze(self):
+        # 同一張表可能被多個 session 共用（見 core.cache），陣列一律唯讀
+        for arr in self._arrays():
+            arr.flags.writeable = False
+
+    def __len__(self):
+        return self._n
+
+    def _arrays(self):
+        yield from (getattr(self, col) for col in _BOOL_COLUMNS + _CATEGORY_COLUMNS + _NUMERIC_COLUMNS)
+        yield self._offsets
+
+    # --- 序列化（磁碟快取用）---
+    def save(self, f):
+        """寫成未壓縮的 .npz（f 為路徑或二進位檔案物件）；類別表與 ID 以 JSON 存放。"""
+        meta = {"n": self._n, "categories": self._categories, "ids": self.ids}
+        columns = {col: getattr(self, col) for col in _BOOL_COLUMNS + _CATEGORY_COLUMNS + _NUMERIC_COLUMNS}
+        np.savez(
+            f,
+            _offsets=self._offsets,
+            _text=np.frombuffer(self._text, dtype=np.uint8),
+            _meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode("utf-8"), dtype=np.uint8),
+            **columns,
+        )
+
+    @classmethod
+    def load(cls, f):
+        """讀回 save() 寫出的檔案。"""
+        table = cls.__new__(cls)
+        with np.load(f, allow_pickle=False) as data:
+            meta = json.loads(data["_meta"].tobytes().decode("utf-8"))
+            for col in _BOOL_COLUMNS + _CATEGORY_COLUMNS + _NUMERIC_COLUMNS:
+                setattr(table, col, data[col])
+            table._offsets = data["_offsets"]
+            table._text = data["_text"].tobytes()
+        table._n = meta["n"]
+        table._categories = meta["categories"]
+        table.ids = meta["ids"]
+        table._freeze()
+        return table
+
+    @property
+    def nbytes(self):
+        """估計佔用的記憶體（陣列 + 文字緩衝 + 手牌 ID），供快取做容量控管。"""
+        ids_bytes = sum(len(i) + 49 for i in self.ids if i)
+        return len(self._text) + ids_bytes + sum(arr.nbytes for arr in self._arrays())
+
+    # --- 讀取 ---
+    def categories(self, column):
+        """categorical 欄位的類別表（code → 原字串）。"""
+        return self._categories[column]
+
+    def labels(self, column, indices=None):
+        """把 categorical 欄位還原成字串陣列（dtype=object）；indices 可只取部分列。"""
+        codes = getattr(self, column)
+        if indices is not None:
+            codes = codes[indices]
+        return np.array(self._categories[column], dtype=object)[codes]
+
+    def hero_cards_emoji(self, indices=None):
+        """底牌 emoji 字串陣列：每種底牌只轉換一次。"""
+        cats = [_card_facts(c)[0] for c in self._categories["hero_cards"]]
+        codes = self.hero_cards if indices is None else self.hero_cards[indices]
+        return np.array(cats, dtype=object)[codes]
+
+    def content(self, i):
+        """第 i 手的原始文字。"""
+        return self._text[self._offsets[i]:self._offsets[i + 1]].decode("utf-8")
+
+    def row(self, i):
+        """重建第 i 手的 Hand（供單手分析、顯示時使用）。"""
+        cat = self._categories
+        villain_seat = int(self.villain_seat[i])
+        hand = Hand(
+            id=self.ids[i],
+            content=self.content(i),
+            vpip=bool(self.vpip[i]),
+            pfr=bool(self.pfr[i]),
+            bb=float(self.bb[i]),
+            hero=cat["hero"][self.hero[i]],
+            hero_cards=cat["hero_cards"][self.hero_cards[i]],
+            pot_size=int(self.pot_size[i]),
+            position=cat["position"][self.position[i]],
+            villain_seat=None if villain_seat == _MISSING else villain_seat,
+            relative_pos_str=cat["relative_pos_str"][self.relative_pos_str[i]],
+            result=cat["result"][self.result[i]],
+            bb_size=int(self.bb_size[i]),
+            position_name=cat["position_name"][self.position_name[i]],
+        )
+        if self.display_index[i] != _MISSING:
+            hand["display_index"] = int(self.display_index[i])
+        return hand
+
+    def rows(self, indices):
+        return [self.row(int(i)) for i in indices]
+
+    # --- 向量化篩選 ---
+    def isin(self, column, values):
+        """categorical 欄位是否屬於 values 的布林遮罩。"""
+        cats = self._categories[column]
+        wanted = [code for code, v in enumerate(cats) if v in values]
+        return np.isin(getattr(self, column), wanted)
+
+    def result_is(self, value):
+        return self.isin("result", (value,))
+
+    def big_pot_mask(self, bb_multiple=20):
+        """底池大於 bb_multiple 個大盲（盲注未知時以 1 計）。"""
+        bb_size = np.where(self.bb_size > 0, self.bb_size, 1)
+        return self.pot_size > bb_multiple * bb_size
+
+    def text_contains(self, needle):
+        """原始手牌文字含有 needle 的布林遮罩：直接在整塊 UTF-8 緩衝上搜尋，不逐手 decode。"""
+        mask = np.zeros(self._n, dtype=bool)
+        pattern = needle.encode("utf-8")
+        pos = self._text.find(pattern)
+        while pos != -1:
+            row = int(np.searchsorted(self._offsets, pos, side="right")) - 1
+            mask[row] = True
+            # 同一手只需命中一次，直接跳到下一手開頭
+            pos = self._text.find(pattern, int(self._offsets[row + 1]))
+        return mask
+
+    def top_by_pot(self, mask, k):
+        """mask 內依底池由大到小取前 k 手的索引（同底池維持原順序）。"""
+        idx = np.flatnonzero(mask)
+        order = np.argsort(-self.pot_size[idx], kind="stable")
+        return idx[order[:k]]
+
+    # --- 統計 ---
+    def rates(self, mask=None):
+        """回傳 (vpip%, pfr%, 手數)；mask 為空時兩個百分比為 "N/A"。"""
+        vpip = self.vpip if mask is None else self.vpip[mask]
+        pfr = self.pfr if mask is None else self.pfr[mask]
+        n = int(vpip.size)
+        if n == 0:
+            return "N/A", "N/A", 0
+        return round(int(vpip.sum()) / n * 100, 1), round(int(pfr.sum()) / n * 100, 1), n
+
+    def position_mask(self, pos_keys):
+        """position 或 position_name 落在 pos_keys 內的手牌。"""
+        return self.isin("position", pos_keys) | self.isin("position_name", pos_keys)
+
+    def positional_stats(self, groups=POS_GROUPS):
+        """各位置分組的 (vpip%, pfr%, 手數)。"""
+        return {name: self.rates(self.position_mask(keys)) for name, keys in groups.items()}